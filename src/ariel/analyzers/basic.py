@@ -1,9 +1,10 @@
 """Basic character analyzer that provides simple narrator/character distinction."""
 
-from collections import defaultdict
+from collections.abc import Iterable
 
 from ..core.interfaces import Character, CharacterAnalyzer
-from ..models import SpeakerType, TextSegment
+from ..models import AnalysisStats, SegmentView, SpeakerType
+from .gazetteer import default_gazetteer
 
 
 class BasicCharacterAnalyzer(CharacterAnalyzer):
@@ -18,51 +19,52 @@ class BasicCharacterAnalyzer(CharacterAnalyzer):
             "female": "en-US-JennyNeural",
         }
 
-    async def analyze(self, segments: list[TextSegment]) -> list[Character]:
-        """Analyze segments to create basic character profiles."""
-        character_data: dict[str, dict] = defaultdict(
-            lambda: {
-                "dialogue_count": 0,
-                "sample_dialogue": [],
-                "total_confidence": 0.0,
-                "speaker_type": SpeakerType.CHARACTER,
-            }
-        )
-
-        # Collect character data from segments
+        # First names with how often they are female
+        self.gazetteer = default_gazetteer()
+
+    # Sample dialogue kept per character
+    sample_limit = 3
+
+    def update(self, stats: AnalysisStats, segments: Iterable[SegmentView]) -> None:
+        """Collect character data from segments."""
         for segment in segments:
-            name = segment.speaker_name
-            char_data = character_data[name]
+            char_stats = stats.character(segment.speaker_name)
 
-            char_data["speaker_type"] = segment.speaker_type
-            char_data["dialogue_count"] += 1
-            char_data["total_confidence"] += segment.confidence
+            char_stats.speaker_type = segment.speaker_type
+            char_stats.dialogue_count += 1
+            char_stats.total_confidence += segment.confidence
 
             # Store sample dialogue (up to 3 examples)
             if (
                 segment.speaker_type == SpeakerType.CHARACTER
-                and len(char_data["sample_dialogue"]) < 3
+                and len(char_stats.sample_dialogue) < self.sample_limit
             ):
-                char_data["sample_dialogue"].append(
+                char_stats.sample_dialogue.append(
                     segment.text[:100] + "..."
                     if len(segment.text) > 100
                     else segment.text
                 )
 
-        # Create Character objects
+    def merge(self, stats: AnalysisStats, other: AnalysisStats) -> None:
+        """Add the character data of the input following ``stats``."""
+        for name, other_stats in other.characters.items():
+            stats.character(name).merge(other_stats, self.sample_limit)
+
+    def finalize(self, stats: AnalysisStats) -> list[Character]:
+        """Create basic character profiles."""
         characters = []
-        for name, data in character_data.items():
+        for name, char_stats in stats.characters.items():
             # Assign voice based on character type and name
-            voice_id = self._assign_voice(name, data["speaker_type"])
+            voice_id = self._assign_voice(name, char_stats.speaker_type)
 
             character = Character(
                 name=name,
-                character_type=data["speaker_type"].value,
+                character_type=char_stats.speaker_type.value,
                 voice_id=voice_id,
                 voice_characteristics={},
             )
-            character.dialogue_count = data["dialogue_count"]
-            character.sample_dialogue = data["sample_dialogue"]
+            character.dialogue_count = char_stats.dialogue_count
+            character.sample_dialogue = list(char_stats.sample_dialogue)
 
             characters.append(character)
 
@@ -73,37 +75,10 @@ class BasicCharacterAnalyzer(CharacterAnalyzer):
         if speaker_type == SpeakerType.NARRATOR:
             return self.default_voices["narrator"]
 
-        # Simple heuristics for character voices
-        name_lower = name.lower()
-
-        # Common female names (basic list)
-        female_names = {
-            "alice",
-            "anna",
-            "emma",
-            "mary",
-            "elizabeth",
-            "sarah",
-            "jane",
-            "helen",
-            "margaret",
-            "catherine",
-            "susan",
-            "lisa",
-            "donna",
-            "karen",
-            "nancy",
-            "betty",
-            "helen",
-            "sandra",
-            "ruth",
-            "sharon",
-        }
-
-        # Check if it's a common female name
-        for female_name in female_names:
-            if female_name in name_lower:
-                return self.default_voices["female"]
+        # Guess gender from the first name
+        female_probability = self.gazetteer.female_probability(name)
+        if female_probability is not None and female_probability > 0.5:
+            return self.default_voices["female"]
 
         # Default to male voice for other characters
         return self.default_voices["male"]
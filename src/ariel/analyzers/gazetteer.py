@@ -0,0 +1,264 @@
+"""First-name gazetteer for guessing a speaker's gender and age from their name.
+
+Names are compiled from frequency data into a binary hash table that is
+memory-mapped when loaded, so loading reads nothing up front and a lookup
+costs a hash and a probe or two.
+
+The shipped table is built from the US Social Security Administration's
+national baby name files, one ``yobYYYY.txt`` of ``name,sex,count`` rows
+per birth year, read straight from their ``names.zip``. Each name records
+the share of babies given it who were girls, and the median birth year of
+everyone given it; names given fewer than ``MIN_NAME_COUNT`` times are left
+out. Honorifics and titles such as Mr, Mrs and Queen, and period names the
+SSA files lack, come from ``first_names.csv`` and take precedence. A name's
+first known word decides, so "Mr. Darcy" is male although Darcy is mostly
+a female first name.
+
+Sources are SSA zips or year files, or CSV files of either
+``name,female_probability`` rows or ``name,sex,count`` rows without a year.
+Counts for the same name are summed over all rows and files. Compile with::
+
+    python -m ariel.analyzers.gazetteer names.zip first_names.csv -o first_names.bin
+"""
+
+import argparse
+import csv
+import functools
+import io
+import mmap
+import re
+import struct
+import zipfile
+import zlib
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+DATA_DIR = Path(__file__).parent / "data"
+DEFAULT_GAZETTEER = DATA_DIR / "first_names.bin"
+
+# Names counted fewer times than this over all sources are left out. They
+# are mostly rare spellings and words that are seldom names, such as "The"
+MIN_NAME_COUNT = 50
+
+# SSA file of the names given in one birth year
+_YEAR_FILE = re.compile(r"yob(\d{4})\.txt$")
+
+# Magic, format version, unused, hash slots, names
+_HEADER = struct.Struct("<4sHHII")
+_MAGIC = b"ARNG"
+_VERSION = 2
+# Each slot holds 1 + the offset of its record, or 0 when empty
+_SLOT = struct.Struct("<I")
+# Records are a length byte and the lower-cased UTF-8 name, followed by the
+# probability that the name is female in 255ths and the median birth year,
+# 0 when unknown
+_FIELDS = struct.Struct("<BH")
+
+_WORD = re.compile(r"[^\W\d_]+")
+
+
+class NameInfo(NamedTuple):
+    """What the gazetteer knows about a first name."""
+
+    female_probability: float
+    birth_year: int | None  # Median birth year of people given the name
+
+
+class NameGazetteer:
+    """Memory-mapped table of first names, their gender and median birth year."""
+
+    def __init__(self, path: str | Path) -> None:
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, slots, names = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC or version != _VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a name gazetteer")
+        self._slots: int = slots
+        self._names: int = names
+        self._records = _HEADER.size + _SLOT.size * self._slots
+
+    def __len__(self) -> int:
+        return self._names
+
+    def lookup(self, first_name: str) -> NameInfo | None:
+        """What is known about ``first_name``, or None if unknown."""
+        key = first_name.lower().encode("utf-8")
+        if not 0 < len(key) < 256:
+            return None
+
+        data = self._map
+        mask = self._slots - 1
+        slot = zlib.crc32(key) & mask
+        while True:
+            (offset,) = _SLOT.unpack_from(data, _HEADER.size + _SLOT.size * slot)
+            if not offset:
+                return None
+            start = self._records + offset - 1
+            end = start + 1 + len(key)
+            if data[start] == len(key) and data[start + 1 : end] == key:
+                female, birth_year = _FIELDS.unpack_from(data, end)
+                return NameInfo(female / 255, birth_year or None)
+            slot = (slot + 1) & mask
+
+    def female_probability(self, name: str) -> float | None:
+        """Look up the first word of a full name that the gazetteer knows."""
+        for word in _WORD.findall(name):
+            info = self.lookup(word)
+            if info is not None:
+                return info.female_probability
+        return None
+
+    def birth_year(self, name: str) -> int | None:
+        """Median birth year for the first word of a full name that has one.
+
+        Honorifics carry no year, so "Mrs. Jemima Smith" is dated by Jemima.
+        """
+        for word in _WORD.findall(name):
+            info = self.lookup(word)
+            if info is not None and info.birth_year is not None:
+                return info.birth_year
+        return None
+
+
+@functools.cache
+def default_gazetteer() -> NameGazetteer:
+    """The gazetteer shipped with Ariel, loaded once per process."""
+    return NameGazetteer(DEFAULT_GAZETTEER)
+
+
+def _year_files(path: Path) -> Iterator[tuple[int, io.TextIOBase]]:
+    """Open the SSA year files in a zip, with the year each one covers."""
+    with zipfile.ZipFile(path) as archive:
+        for member in sorted(archive.namelist()):
+            year = _YEAR_FILE.search(member)
+            if year:
+                with archive.open(member) as raw:
+                    text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+                    yield int(year.group(1)), text
+
+
+def read_name_sources(
+    paths: Iterable[str | Path], min_count: int = MIN_NAME_COUNT
+) -> dict[str, NameInfo]:
+    """Read female probabilities and birth years per lower-cased name.
+
+    Zips are read as SSA name archives, ``yobYYYY.txt`` files as one SSA
+    birth year, and anything else as CSV. Explicit ``name,probability``
+    rows replace whatever the counts say, and carry no birth year.
+    """
+    overrides: dict[str, float] = {}
+    # (male, female) counts per name
+    counts: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+    # Births per year per name, for the median birth year
+    years: dict[str, Counter[int]] = defaultdict(Counter)
+
+    def read_rows(rows: Iterable[list[str]], year: int | None) -> None:
+        for row in rows:
+            try:
+                if len(row) == 2:
+                    overrides[row[0].strip().lower()] = float(row[1])
+                elif len(row) == 3:
+                    name = row[0].strip().lower()
+                    count = int(row[2])
+                    column = 1 if row[1].strip().upper() == "F" else 0
+                    counts[name][column] += count
+                    if year is not None:
+                        years[name][year] += count
+            except ValueError:
+                continue  # Header line
+
+    for path in map(Path, paths):
+        if path.suffix == ".zip":
+            for year, f in _year_files(path):
+                read_rows(csv.reader(f), year)
+            continue
+
+        year_file = _YEAR_FILE.search(path.name)
+        with open(path, newline="", encoding="utf-8") as f:
+            read_rows(csv.reader(f), int(year_file.group(1)) if year_file else None)
+
+    names: dict[str, NameInfo] = {}
+    for name, (male, female) in counts.items():
+        if male + female >= max(1, min_count):
+            names[name] = NameInfo(
+                female / (male + female), _median_year(years.get(name))
+            )
+    for name, probability in overrides.items():
+        names[name] = NameInfo(probability, None)
+    return names
+
+
+def _median_year(births: Counter[int] | None) -> int | None:
+    """The year by which half of the counted births had happened."""
+    if not births:
+        return None
+    half = sum(births.values()) / 2
+    seen = 0
+    for year in sorted(births):
+        seen += births[year]
+        if seen >= half:
+            return year
+    return None
+
+
+def build_gazetteer(names: dict[str, NameInfo], path: str | Path) -> int:
+    """Compile names, female probabilities and birth years into a gazetteer.
+
+    Returns:
+        Number of names written
+    """
+    entries = []
+    for name, info in sorted(names.items()):
+        key = name.lower().encode("utf-8")
+        if 0 < len(key) < 256:
+            female = min(255, max(0, round(info.female_probability * 255)))
+            entries.append((key, _FIELDS.pack(female, info.birth_year or 0)))
+
+    # At most half full, so probes stay short
+    slots = 1
+    while slots < 2 * len(entries):
+        slots *= 2
+
+    table = [0] * slots
+    records = bytearray()
+    for key, fields in entries:
+        slot = zlib.crc32(key) & (slots - 1)
+        while table[slot]:
+            slot = (slot + 1) & (slots - 1)
+        table[slot] = len(records) + 1
+        records += bytes([len(key)]) + key + fields
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, 0, slots, len(entries)))
+        f.write(struct.pack(f"<{slots}I", *table))
+        f.write(records)
+    return len(entries)
+
+
+def main() -> None:
+    arguments = argparse.ArgumentParser(description="Compile a name gazetteer")
+    arguments.add_argument(
+        "sources",
+        nargs="+",
+        type=Path,
+        help="SSA names.zip or year files, and CSV files; add first_names.csv "
+        "for honorifics and period names",
+    )
+    arguments.add_argument("-o", "--output", type=Path, default=DEFAULT_GAZETTEER)
+    arguments.add_argument(
+        "--min-count",
+        type=int,
+        default=MIN_NAME_COUNT,
+        help="leave out names counted fewer times than this",
+    )
+    options = arguments.parse_args()
+    names = read_name_sources(options.sources, options.min_count)
+    count = build_gazetteer(names, options.output)
+    print(f"Wrote {count} names to {options.output}")
+
+
+if __name__ == "__main__":
+    main()
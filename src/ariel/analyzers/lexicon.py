@@ -0,0 +1,68 @@
+"""Multi-phrase matching for the character analyzers' lexicons."""
+
+from collections import deque
+from collections.abc import Iterable
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton that finds a fixed set of phrases in one pass.
+
+    Text can be fed in pieces: the state returned by :meth:`feed` carries
+    partial matches over to the next piece, so a phrase split across two
+    pieces is still found.
+    """
+
+    def __init__(self, phrases: Iterable[str]) -> None:
+        self.phrases = frozenset(phrase for phrase in phrases if phrase)
+        self.longest = max(map(len, self.phrases), default=0)
+
+        # Trie of the phrases; state 0 is the root
+        goto: list[dict[str, int]] = [{}]
+        outputs: list[frozenset[str]] = [frozenset()]
+        for phrase in self.phrases:
+            state = 0
+            for char in phrase:
+                if char not in goto[state]:
+                    goto[state][char] = len(goto)
+                    goto.append({})
+                    outputs.append(frozenset())
+                state = goto[state][char]
+            outputs[state] |= {phrase}
+
+        # Turn the trie into a DFA: fill in failure transitions breadth first,
+        # keeping only edges that don't lead back to the root
+        self._transitions: list[dict[str, int]] = [dict(goto[0])]
+        self._transitions.extend({} for _ in goto[1:])
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            transitions = dict(self._transitions[fail[state]])
+            for char, child in goto[state].items():
+                fail[child] = transitions.get(char, 0)
+                transitions[char] = child
+                queue.append(child)
+            self._transitions[state] = transitions
+            outputs[state] |= outputs[fail[state]]
+        self._outputs = [output or None for output in outputs]
+
+    def feed(self, text: str, state: int, found: set[str]) -> int:
+        """Scan ``text`` from ``state``, adding the phrases seen to ``found``.
+
+        Returns:
+            State to continue from with the next piece of text
+        """
+        transitions = self._transitions
+        outputs = self._outputs
+        for char in text:
+            state = transitions[state].get(char, 0)
+            output = outputs[state]
+            if output is not None:
+                found.update(output)
+        return state
+
+    def find(self, text: str) -> set[str]:
+        """Return the phrases that occur in ``text``."""
+        found: set[str] = set()
+        self.feed(text, 0, found)
+        return found
@@ -1,15 +1,28 @@
 """Statistical character analyzer with enhanced speaker pattern detection."""
 
-from collections import defaultdict
+import random
+from collections.abc import Iterable
 
 from ..core.interfaces import Character, CharacterAnalyzer
-from ..models import SpeakerType, TextSegment
+from ..models import AnalysisStats, CharacterStats, SegmentView, SpeakerType
+from .gazetteer import default_gazetteer
+from .lexicon import PhraseMatcher
+from .sketch import HyperLogLog, merge_samples
 
 
 class StatisticalCharacterAnalyzer(CharacterAnalyzer):
-    """Statistical analyzer that uses frequency and patterns for character profiling."""
+    """Statistical analyzer that uses frequency and patterns for character profiling.
+
+    In sketch mode each character's statistics take constant memory: the
+    vocabulary is a HyperLogLog estimate, within the error documented in
+    ``analyzers.sketch``, and sample dialogue is a uniform reservoir sample
+    of all the character's quotes rather than the first few.
+    """
+
+    def __init__(self, sketch: bool = False) -> None:
+        self.sketch = sketch
+        self._random = random.Random()
 
-    def __init__(self) -> None:
         # Extended voice mappings
         self.voice_mappings = {
             "narrator": "en-US-AriaNeural",
@@ -21,50 +34,11 @@ class StatisticalCharacterAnalyzer(CharacterAnalyzer):
             "default_female": "en-US-AvaNeural",
         }
 
-        # Gender indicators in names and speech patterns
+        # First names with how often they are female
+        self.gazetteer = default_gazetteer()
+
+        # Gender indicators in speech patterns
         self.female_indicators = {
-            "names": {
-                "alice",
-                "anna",
-                "emma",
-                "mary",
-                "elizabeth",
-                "sarah",
-                "jane",
-                "helen",
-                "margaret",
-                "catherine",
-                "susan",
-                "lisa",
-                "donna",
-                "karen",
-                "nancy",
-                "betty",
-                "sandra",
-                "ruth",
-                "sharon",
-                "linda",
-                "patricia",
-                "jennifer",
-                "maria",
-                "susan",
-                "margaret",
-                "dorothy",
-                "lisa",
-                "nancy",
-                "karen",
-                "betty",
-                "helen",
-                "sandra",
-                "donna",
-                "carol",
-                "ruth",
-                "sharon",
-                "michelle",
-                "laura",
-                "sarah",
-                "kimberly",
-            },
             "speech_patterns": {
                 "oh my",
                 "goodness",
@@ -107,73 +81,137 @@ class StatisticalCharacterAnalyzer(CharacterAnalyzer):
             "for real",
         }
 
-    async def analyze(self, segments: list[TextSegment]) -> list[Character]:
-        """Analyze segments using statistical patterns for character profiling."""
-        character_data: dict[str, dict] = defaultdict(
-            lambda: {
-                "dialogue_count": 0,
-                "sample_dialogue": [],
-                "total_confidence": 0.0,
-                "speaker_type": SpeakerType.CHARACTER,
-                "speech_text": [],
-                "word_count": 0,
-                "avg_sentence_length": 0.0,
-                "vocabulary": set(),
-            }
+        # Every speech lexicon is matched in one pass over each segment
+        self.speech_matcher = PhraseMatcher(
+            self.female_indicators["speech_patterns"]
+            | self.older_speech_patterns
+            | self.younger_speech_patterns
         )
 
-        # Collect detailed character data
+    # Sample dialogue kept per character
+    sample_limit = 5
+
+    def update(self, stats: AnalysisStats, segments: Iterable[SegmentView]) -> None:
+        """Collect detailed character data from segments."""
         for segment in segments:
-            name = segment.speaker_name
-            char_data = character_data[name]
+            char_stats = stats.character(segment.speaker_name)
 
-            char_data["speaker_type"] = segment.speaker_type
-            char_data["dialogue_count"] += 1
-            char_data["total_confidence"] += segment.confidence
+            char_stats.speaker_type = segment.speaker_type
+            char_stats.dialogue_count += 1
+            char_stats.total_confidence += segment.confidence
 
             if segment.speaker_type == SpeakerType.CHARACTER:
-                char_data["speech_text"].append(segment.text)
+                char_stats.speech_count += 1
+                speech = segment.text.lower()
+                self._append_speech(char_stats, speech, speech, speech)
 
                 # Track sample dialogue
-                if len(char_data["sample_dialogue"]) < 5:
+                slot = len(char_stats.sample_dialogue)
+                if self.sketch and slot >= self.sample_limit:
+                    # Keep each quote with equal probability
+                    slot = self._random.randrange(char_stats.speech_count)
+                if slot < self.sample_limit:
                     sample = (
                         segment.text[:150] + "..."
                         if len(segment.text) > 150
                         else segment.text
                     )
-                    char_data["sample_dialogue"].append(sample)
+                    if slot < len(char_stats.sample_dialogue):
+                        char_stats.sample_dialogue[slot] = sample
+                    else:
+                        char_stats.sample_dialogue.append(sample)
 
                 # Linguistic analysis
-                words = segment.text.lower().split()
-                char_data["word_count"] += len(words)
-                char_data["vocabulary"].update(words)
-
-        # Create enhanced Character objects
+                words = speech.split()
+                char_stats.word_count += len(words)
+                if self.sketch:
+                    if char_stats.vocabulary_sketch is None:
+                        char_stats.vocabulary_sketch = HyperLogLog().registers
+                    HyperLogLog(char_stats.vocabulary_sketch).update(set(words))
+                else:
+                    char_stats.vocabulary.update(words)
+
+    def merge(self, stats: AnalysisStats, other: AnalysisStats) -> None:
+        """Add the character data of the input following ``stats``."""
+        for name, other_stats in other.characters.items():
+            char_stats = stats.character(name)
+            if self.sketch:
+                samples = merge_samples(
+                    char_stats.sample_dialogue,
+                    char_stats.speech_count,
+                    other_stats.sample_dialogue,
+                    other_stats.speech_count,
+                    self.sample_limit,
+                    self._random,
+                )
+                if other_stats.vocabulary_sketch is not None:
+                    if char_stats.vocabulary_sketch is None:
+                        char_stats.vocabulary_sketch = HyperLogLog().registers
+                    HyperLogLog(char_stats.vocabulary_sketch).merge(
+                        HyperLogLog(other_stats.vocabulary_sketch)
+                    )
+            char_stats.merge(other_stats, self.sample_limit)
+            if self.sketch:
+                char_stats.sample_dialogue = samples
+            head, tail = other_stats.speech_head, other_stats.speech_tail
+            if head is not None and tail is not None:
+                char_stats.speech_phrases |= other_stats.speech_phrases
+                # Only phrases across the seam can be new
+                self._append_speech(char_stats, head, head, tail)
+
+    def finalize(self, stats: AnalysisStats) -> list[Character]:
+        """Create enhanced Character objects."""
         characters = []
-        for name, data in character_data.items():
-            if data["dialogue_count"] == 0:
+        for name, char_stats in stats.characters.items():
+            if char_stats.dialogue_count == 0:
                 continue
 
             # Analyze speech patterns for character profiling
-            profile = self._analyze_speech_patterns(name, data)
+            profile = self._analyze_speech_patterns(name, char_stats)
 
             # Assign voice based on analysis
             voice_id = self._assign_voice_by_profile(profile)
 
             character = Character(
                 name=name,
-                character_type=data["speaker_type"].value,
+                character_type=char_stats.speaker_type.value,
                 voice_id=voice_id,
                 voice_characteristics=profile,
             )
-            character.dialogue_count = data["dialogue_count"]
-            character.sample_dialogue = data["sample_dialogue"]
+            character.dialogue_count = char_stats.dialogue_count
+            character.sample_dialogue = list(char_stats.sample_dialogue)
 
             characters.append(character)
 
         return characters
 
-    def _analyze_speech_patterns(self, name: str, data: dict) -> dict:
+    def _append_speech(
+        self, char_stats: CharacterStats, text: str, head: str, tail: str
+    ) -> None:
+        """Append lower-cased speech as if joined to the earlier speech by a space.
+
+        ``text`` is scanned for lexicon phrases after the end of the earlier
+        speech; ``head`` and ``tail`` are the start and end of what is
+        appended, and all of it when it is short.
+        """
+        keep = self.speech_matcher.longest
+        head = head[:keep]
+        tail = tail[max(0, len(tail) - keep) :]
+        if char_stats.speech_head is None or char_stats.speech_tail is None:
+            self.speech_matcher.feed(text, 0, char_stats.speech_phrases)
+            char_stats.speech_head = head
+            char_stats.speech_tail = tail
+            return
+
+        self.speech_matcher.feed(
+            f"{char_stats.speech_tail} {text}", 0, char_stats.speech_phrases
+        )
+        if len(char_stats.speech_head) < keep:
+            char_stats.speech_head = f"{char_stats.speech_head} {head}"[:keep]
+        tail = f"{char_stats.speech_tail} {tail}"
+        char_stats.speech_tail = tail[max(0, len(tail) - keep) :]
+
+    def _analyze_speech_patterns(self, name: str, char_stats: CharacterStats) -> dict:
         """Analyze speech patterns to determine character profile."""
         profile = {
             "gender": "unknown",
@@ -182,37 +220,30 @@ class StatisticalCharacterAnalyzer(CharacterAnalyzer):
             "confidence_score": 0.0,
         }
 
-        if data["speaker_type"] == SpeakerType.NARRATOR:
+        if char_stats.speaker_type == SpeakerType.NARRATOR:
             profile["gender"] = "neutral"
             profile["age_category"] = "adult"
             return profile
 
-        all_speech = " ".join(data["speech_text"]).lower()
-        name_lower = name.lower()
+        phrases = char_stats.speech_phrases
 
         # Gender detection
         gender_score = 0
 
-        # Check name against known female names
-        for female_name in self.female_indicators["names"]:
-            if female_name in name_lower:
-                gender_score += 2
-                break
+        # Check name against the gazetteer: known female names count for,
+        # known male names against
+        female_probability = self.gazetteer.female_probability(name)
+        if female_probability is not None:
+            gender_score += round(4 * female_probability - 2)
 
         # Check speech patterns
-        for pattern in self.female_indicators["speech_patterns"]:
-            if pattern in all_speech:
-                gender_score += 1
+        gender_score += len(phrases & self.female_indicators["speech_patterns"])
 
         profile["gender"] = "female" if gender_score > 0 else "male"
 
         # Age detection
-        age_score_older = sum(
-            1 for pattern in self.older_speech_patterns if pattern in all_speech
-        )
-        age_score_younger = sum(
-            1 for pattern in self.younger_speech_patterns if pattern in all_speech
-        )
+        age_score_older = len(phrases & self.older_speech_patterns)
+        age_score_younger = len(phrases & self.younger_speech_patterns)
 
         if age_score_older > age_score_younger:
             profile["age_category"] = "older"
@@ -222,8 +253,8 @@ class StatisticalCharacterAnalyzer(CharacterAnalyzer):
             profile["age_category"] = "adult"
 
         # Personality analysis (basic)
-        if data["word_count"] > 0:
-            avg_words_per_dialogue = data["word_count"] / data["dialogue_count"]
+        if char_stats.word_count > 0:
+            avg_words_per_dialogue = char_stats.word_count / char_stats.dialogue_count
 
             if avg_words_per_dialogue > 20:
                 profile["personality_traits"].append("talkative")
@@ -232,21 +263,29 @@ class StatisticalCharacterAnalyzer(CharacterAnalyzer):
 
             # Vocabulary diversity
             vocab_diversity = (
-                len(data["vocabulary"]) / data["word_count"]
-                if data["word_count"] > 0
+                self._vocabulary_size(char_stats) / char_stats.word_count
+                if char_stats.word_count > 0
                 else 0
             )
             if vocab_diversity > 0.7:
                 profile["personality_traits"].append("articulate")
 
         # Calculate confidence based on amount of data
-        if data["dialogue_count"] >= 5:
-            profile["confidence_score"] = min(0.9, 0.5 + (data["dialogue_count"] * 0.1))
+        if char_stats.dialogue_count >= 5:
+            profile["confidence_score"] = min(
+                0.9, 0.5 + (char_stats.dialogue_count * 0.1)
+            )
         else:
-            profile["confidence_score"] = 0.3 + (data["dialogue_count"] * 0.1)
+            profile["confidence_score"] = 0.3 + (char_stats.dialogue_count * 0.1)
 
         return profile
 
+    def _vocabulary_size(self, char_stats: CharacterStats) -> int:
+        """Distinct words spoken, estimated in sketch mode."""
+        if char_stats.vocabulary_sketch is not None:
+            return HyperLogLog(char_stats.vocabulary_sketch).count()
+        return len(char_stats.vocabulary)
+
     def _assign_voice_by_profile(self, profile: dict) -> str:
         """Assign voice based on character profile."""
         if profile.get("gender") == "neutral":
@@ -0,0 +1 @@
+"""Audio format helpers that work on encoded bytes without decoding."""
@@ -0,0 +1,122 @@
+"""Encoded formats that voice generators return, measured without decoding.
+
+MP3 is the default everywhere. Generators that can return other encodings
+(OpenAI's ``response_format``) tag their clips with one of
+``AUDIO_FORMATS``; durations are read from the container, and raw PCM needs
+no decoder at all.
+"""
+
+import io
+import struct
+
+from .mp3 import mp3_duration_ms
+from .mp4 import AAC_FRAME_SAMPLES, MP4FormatError, parse_adts_header
+
+AUDIO_FORMATS = ("mp3", "opus", "aac", "pcm")
+
+# Raw PCM as OpenAI sends it: 24 kHz, 16-bit signed little-endian, mono
+PCM_SAMPLE_RATE = 24000
+PCM_SAMPLE_WIDTH = 2
+PCM_CHANNELS = 1
+
+# ffmpeg demuxer for each encoded format; Opus arrives in an Ogg container
+FFMPEG_DEMUXERS = {"mp3": "mp3", "opus": "ogg", "aac": "aac"}
+
+# Opus granule positions always count 48 kHz samples
+_OPUS_RATE = 48000
+# Ogg page header: capture pattern, version, flags, granule position,
+# serial number, page sequence, checksum, segment count
+_OGG_PAGE = struct.Struct("<4sBBqIIIB")
+
+
+class AudioFormatError(ValueError):
+    """Raised when audio can't be measured from its container headers."""
+
+
+def check_audio_format(audio_format: str) -> str:
+    """Return ``audio_format`` if Ariel can handle it, else raise ValueError."""
+    if audio_format not in AUDIO_FORMATS:
+        raise ValueError(
+            f"Unsupported audio format '{audio_format}'. "
+            f"Available: {', '.join(AUDIO_FORMATS)}"
+        )
+    return audio_format
+
+
+def adts_duration_ms(audio_data: bytes) -> int:
+    """Duration of an ADTS (raw AAC) stream, from its frame headers."""
+    samples = 0
+    sample_rate = 0
+    offset = 0
+    while offset < len(audio_data):
+        try:
+            header = parse_adts_header(audio_data, offset)
+        except MP4FormatError as e:
+            raise AudioFormatError(str(e)) from e
+        sample_rate = header.sample_rate
+        samples += AAC_FRAME_SAMPLES
+        offset += header.frame_length
+    if not sample_rate:
+        raise AudioFormatError("No ADTS frames")
+    return samples * 1000 // sample_rate
+
+
+def opus_duration_ms(audio_data: bytes) -> int:
+    """Duration of an Ogg Opus stream, from its page granule positions.
+
+    The last granule position counts every sample decoded; the pre-skip
+    from the ``OpusHead`` packet is discarded by players.
+    """
+    pre_skip: int | None = None
+    granule = -1
+    offset = 0
+    while offset < len(audio_data):
+        if len(audio_data) - offset < _OGG_PAGE.size:
+            raise AudioFormatError("Truncated Ogg page header")
+        magic, _, _, position, _, _, _, segments = _OGG_PAGE.unpack_from(
+            audio_data, offset
+        )
+        if magic != b"OggS":
+            raise AudioFormatError(f"No Ogg page at byte {offset}")
+        body = offset + _OGG_PAGE.size + segments
+        end = body + sum(audio_data[offset + _OGG_PAGE.size : body])
+        if end > len(audio_data):
+            raise AudioFormatError("Truncated Ogg page")
+
+        if pre_skip is None and audio_data.startswith(b"OpusHead", body):
+            (pre_skip,) = struct.unpack_from("<H", audio_data, body + 10)
+        # -1 marks a page on which no packet ends
+        if position >= 0:
+            granule = position
+        offset = end
+
+    if pre_skip is None or granule < 0:
+        raise AudioFormatError("No Opus stream")
+    return max(0, granule - pre_skip) * 1000 // _OPUS_RATE
+
+
+def decode_duration_ms(audio_data: bytes, audio_format: str) -> int:
+    """Decode audio with ffmpeg and return its duration in milliseconds."""
+    from pydub import AudioSegment as PydubAudioSegment
+
+    demuxer = FFMPEG_DEMUXERS[audio_format]
+    return len(PydubAudioSegment.from_file(io.BytesIO(audio_data), format=demuxer))
+
+
+def audio_duration_ms(audio_data: bytes, audio_format: str = "mp3") -> int:
+    """Return the duration of encoded audio in milliseconds.
+
+    Reads container or frame headers only; a clip is decoded just when they
+    can't be parsed.
+    """
+    if audio_format == "mp3":
+        return mp3_duration_ms(audio_data)
+    if audio_format == "pcm":
+        frames = len(audio_data) // (PCM_SAMPLE_WIDTH * PCM_CHANNELS)
+        return frames * 1000 // PCM_SAMPLE_RATE
+
+    measure = adts_duration_ms if audio_format == "aac" else opus_duration_ms
+    try:
+        return measure(audio_data)
+    except AudioFormatError:
+        return decode_duration_ms(audio_data, audio_format)
@@ -0,0 +1,482 @@
+"""MP3 frame and Xing/LAME header parsing.
+
+Reads durations and stream parameters straight from frame headers, so callers
+don't need to spawn ffmpeg and decode a clip just to measure it.
+"""
+
+import bisect
+import functools
+import io
+from collections.abc import Iterator
+from typing import NamedTuple
+
+# Bitrates in kbit/s indexed by [version is MPEG-1][layer][bitrate index]
+_BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+# Sample rates indexed by the header's version bits
+_SAMPLE_RATES = {
+    0b11: (44100, 48000, 32000),  # MPEG-1
+    0b10: (22050, 24000, 16000),  # MPEG-2
+    0b00: (11025, 12000, 8000),  # MPEG-2.5
+}
+
+# Bits that determine a frame's layout; the rest (mode extension, copyright,
+# original, emphasis) may differ between otherwise identical frames
+_LAYOUT_MASK = 0xFFFFFFC0
+
+_ID3V2_HEADER_SIZE = 10
+_LAME_TAG_SIZE = 36
+# Encoder strings whose tag carries gapless delay/padding that decoders honour
+_LAME_ENCODERS = (b"LAME", b"Lavf", b"Lavc", b"L3.9")
+_ID3V1_SIZE = 128
+
+
+class MP3FormatError(ValueError):
+    """Raised when data cannot be parsed as an MP3 stream."""
+
+
+class FrameHeader(NamedTuple):
+    """Decoded MPEG audio frame header."""
+
+    mpeg1: bool
+    layer: int
+    bitrate: int  # bits per second
+    sample_rate: int
+    channels: int
+    padding: int
+    frame_length: int  # bytes, including the header
+    samples: int  # PCM samples per channel
+    side_info_size: int  # Layer III side information, 0 for other layers
+
+
+class XingHeader(NamedTuple):
+    """Contents of a Xing/Info (or VBRI) tag frame."""
+
+    tag: str
+    frames: int | None
+    byte_count: int | None
+    toc: bytes | None
+    encoder_delay: int
+    encoder_padding: int
+    lame: bytes | None = None  # raw LAME tag, if the encoder wrote one
+
+
+class MP3Info(NamedTuple):
+    """Summary of an MP3 stream."""
+
+    duration_ms: int
+    sample_rate: int
+    channels: int
+    frames: int
+    samples: int  # playable PCM samples per channel
+    audio_start: int  # offset of the first audio frame
+    audio_end: int  # offset just past the last audio frame
+    xing: XingHeader | None
+
+
+def _side_info_size(mpeg1: bool, channels: int) -> int:
+    """Size of Layer III side information following the frame header."""
+    if mpeg1:
+        return 17 if channels == 1 else 32
+    return 9 if channels == 1 else 17
+
+
+@functools.lru_cache(maxsize=512)
+def _decode_header(raw: int) -> FrameHeader | None:
+    if raw >> 21 != 0x7FF:
+        return None
+
+    version_bits = (raw >> 19) & 0b11
+    layer_bits = (raw >> 17) & 0b11
+    bitrate_index = (raw >> 12) & 0b1111
+    sample_rate_index = (raw >> 10) & 0b11
+    if version_bits == 0b01 or layer_bits == 0b00:
+        return None
+    # Free-format (0) and "bad" (15) bitrates can't be walked frame by frame
+    if bitrate_index in (0, 15) or sample_rate_index == 0b11:
+        return None
+
+    mpeg1 = version_bits == 0b11
+    layer = 4 - layer_bits
+    bitrate = _BITRATES[mpeg1, layer][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version_bits][sample_rate_index]
+    padding = (raw >> 9) & 1
+    channels = 1 if (raw >> 6) & 0b11 == 0b11 else 2
+
+    if layer == 1:
+        samples = 384
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    elif layer == 2 or mpeg1:
+        samples = 1152
+        frame_length = 144 * bitrate // sample_rate + padding
+    else:
+        samples = 576
+        frame_length = 72 * bitrate // sample_rate + padding
+
+    side_info_size = _side_info_size(mpeg1, channels) if layer == 3 else 0
+
+    return FrameHeader(
+        mpeg1,
+        layer,
+        bitrate,
+        sample_rate,
+        channels,
+        padding,
+        frame_length,
+        samples,
+        side_info_size,
+    )
+
+
+def parse_frame_header(data: bytes, offset: int = 0) -> FrameHeader | None:
+    """Decode the frame header at ``offset``, or None if there isn't one."""
+    if offset + 4 > len(data):
+        return None
+    raw = int.from_bytes(data[offset : offset + 4], "big")
+    return _decode_header(raw & _LAYOUT_MASK)
+
+
+def id3v2_size(data: bytes) -> int:
+    """Return the size of a leading ID3v2 tag, or 0 if there is none."""
+    if len(data) < _ID3V2_HEADER_SIZE or data[:3] != b"ID3":
+        return 0
+    # Synchsafe integer: 7 bits per byte
+    size = 0
+    for byte in data[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = _ID3V2_HEADER_SIZE if data[5] & 0x10 else 0
+    return _ID3V2_HEADER_SIZE + size + footer
+
+
+def _synced(data: bytes, offset: int) -> FrameHeader | None:
+    """Header at ``offset`` if it is followed by another frame or the end."""
+    header = parse_frame_header(data, offset)
+    if header is None:
+        return None
+    next_offset = offset + header.frame_length
+    if next_offset + 4 > len(data) or parse_frame_header(data, next_offset):
+        return header
+    return None
+
+
+def iter_frames(
+    data: bytes, start: int = 0, end: int | None = None
+) -> Iterator[tuple[int, FrameHeader]]:
+    """Yield (offset, header) for every MPEG audio frame in ``data``.
+
+    Garbage between frames (a stray tag or a truncated write) is skipped by
+    searching for the next position where two consecutive headers line up.
+    A final frame that runs past ``end`` is dropped.
+    """
+    end = len(data) if end is None else end
+    offset = start
+    synced = False
+    while offset + 4 <= end:
+        header = parse_frame_header(data, offset) if synced else _synced(data, offset)
+        if header is None:
+            synced = False
+            offset = data.find(b"\xff", offset + 1, end)
+            if offset < 0:
+                return
+            continue
+        if offset + header.frame_length > end:
+            return
+        yield offset, header
+        synced = True
+        offset += header.frame_length
+
+
+def parse_xing(data: bytes, offset: int, header: FrameHeader) -> XingHeader | None:
+    """Parse a Xing/Info or VBRI tag in the frame at ``offset``, if present."""
+    frame = data[offset : offset + header.frame_length]
+
+    xing_at = 4 + header.side_info_size
+    tag = frame[xing_at : xing_at + 4]
+    if header.layer == 3 and tag in (b"Xing", b"Info"):
+        flags = int.from_bytes(frame[xing_at + 4 : xing_at + 8], "big")
+        position = xing_at + 8
+        frames = byte_count = toc = None
+        if flags & 0x1:
+            frames = int.from_bytes(frame[position : position + 4], "big")
+            position += 4
+        if flags & 0x2:
+            byte_count = int.from_bytes(frame[position : position + 4], "big")
+            position += 4
+        if flags & 0x4:
+            toc = bytes(frame[position : position + 100])
+            position += 100
+        if flags & 0x8:
+            position += 4
+
+        # A LAME tag stores the encoder delay and padding for gapless playback
+        delay = padding = 0
+        lame: bytes | None = None
+        lame_tag = bytes(frame[position : position + _LAME_TAG_SIZE])
+        if len(lame_tag) == _LAME_TAG_SIZE and lame_tag[:4] in _LAME_ENCODERS:
+            packed = int.from_bytes(lame_tag[21:24], "big")
+            delay, padding = packed >> 12, packed & 0xFFF
+            lame = lame_tag
+
+        return XingHeader(
+            tag.decode("ascii"), frames, byte_count, toc, delay, padding, lame
+        )
+
+    if frame[36:40] == b"VBRI":
+        delay = int.from_bytes(frame[42:44], "big")
+        byte_count = int.from_bytes(frame[46:50], "big")
+        frames = int.from_bytes(frame[50:54], "big")
+        return XingHeader("VBRI", frames, byte_count, None, delay, 0)
+
+    return None
+
+
+def _audio_end(data: bytes) -> int:
+    """Offset where trailing tags (ID3v1) begin."""
+    end = len(data)
+    if end >= _ID3V1_SIZE and data[end - _ID3V1_SIZE : end - _ID3V1_SIZE + 3] == b"TAG":
+        end -= _ID3V1_SIZE
+    return end
+
+
+def scan_mp3(data: bytes) -> MP3Info:
+    """Measure an MP3 stream from its frame headers without decoding it.
+
+    Uses the frame count in a Xing/Info tag when there is one, honouring the
+    LAME encoder delay and padding like decoders do. Otherwise every frame
+    header is walked and its samples summed.
+
+    Raises:
+        MP3FormatError: If no MPEG audio frames are found
+    """
+    end = _audio_end(data)
+    frames = iter_frames(data, id3v2_size(data), end)
+
+    first = next(frames, None)
+    if first is None:
+        raise MP3FormatError("No MPEG audio frames found")
+    first_offset, first_header = first
+
+    xing = parse_xing(data, first_offset, first_header)
+    if xing is None:
+        audio_start = first_offset
+        frame_count = 1
+        samples = first_header.samples
+        audio_end = first_offset + first_header.frame_length
+    else:
+        # The tag frame is silent and not part of the stream
+        audio_start = first_offset + first_header.frame_length
+        frame_count = samples = 0
+        audio_end = audio_start
+
+    if xing is not None and xing.frames is not None:
+        frame_count = xing.frames
+        samples = frame_count * first_header.samples
+        audio_end = end
+    else:
+        for offset, header in frames:
+            frame_count += 1
+            samples += header.samples
+            audio_end = offset + header.frame_length
+
+    if xing is not None:
+        samples = max(0, samples - xing.encoder_delay - xing.encoder_padding)
+
+    sample_rate = first_header.sample_rate
+    return MP3Info(
+        duration_ms=round(1000 * samples / sample_rate),
+        sample_rate=sample_rate,
+        channels=first_header.channels,
+        frames=frame_count,
+        samples=samples,
+        audio_start=audio_start,
+        audio_end=audio_end,
+        xing=xing,
+    )
+
+
+def decode_duration_ms(audio_data: bytes) -> int:
+    """Decode MP3 audio data with ffmpeg and return its duration in milliseconds."""
+    from pydub import AudioSegment as PydubAudioSegment
+
+    return len(PydubAudioSegment.from_mp3(io.BytesIO(audio_data)))
+
+
+def mp3_duration_ms(audio_data: bytes) -> int:
+    """Return the duration of MP3 audio data in milliseconds.
+
+    Reads frame headers only; the clip is decoded just when they can't be
+    parsed (free-format or otherwise malformed data).
+    """
+    try:
+        return scan_mp3(audio_data).duration_ms
+    except MP3FormatError:
+        return decode_duration_ms(audio_data)
+
+
+def _version_bits(sample_rate: int) -> tuple[int, int]:
+    """Return (version bits, sample rate index) for a sample rate."""
+    for version_bits, rates in _SAMPLE_RATES.items():
+        if sample_rate in rates:
+            return version_bits, rates.index(sample_rate)
+    raise MP3FormatError(f"Unsupported MP3 sample rate: {sample_rate}")
+
+
+def samples_per_frame(sample_rate: int) -> int:
+    """PCM samples per channel in a Layer III frame at ``sample_rate``."""
+    version_bits, _ = _version_bits(sample_rate)
+    return 1152 if version_bits == 0b11 else 576
+
+
+def encode_header(
+    sample_rate: int, channels: int, bitrate: int, padding: int = 0
+) -> bytes:
+    """Build a Layer III frame header without CRC protection."""
+    version_bits, sample_rate_index = _version_bits(sample_rate)
+    try:
+        bitrate_index = _BITRATES[version_bits == 0b11, 3].index(bitrate // 1000)
+    except ValueError:
+        raise MP3FormatError(f"Unsupported MP3 bitrate: {bitrate}") from None
+
+    channel_mode = 0b11 if channels == 1 else 0b00
+    raw = (
+        (0x7FF << 21)
+        | (version_bits << 19)
+        | (0b01 << 17)  # Layer III
+        | (1 << 16)  # no CRC
+        | (bitrate_index << 12)
+        | (sample_rate_index << 10)
+        | (padding << 9)
+        | (channel_mode << 6)
+    )
+    return raw.to_bytes(4, "big")
+
+
+def _smallest_frame(
+    sample_rate: int, channels: int, min_length: int
+) -> tuple[bytes, FrameHeader]:
+    """Header for the lowest bitrate frame of at least ``min_length`` bytes."""
+    mpeg1 = _version_bits(sample_rate)[0] == 0b11
+    for kbps in _BITRATES[mpeg1, 3][1:]:
+        header_bytes = encode_header(sample_rate, channels, kbps * 1000)
+        header = parse_frame_header(header_bytes)
+        if header is not None and header.frame_length >= min_length:
+            return header_bytes, header
+    raise MP3FormatError(f"No frame size can hold {min_length} bytes")
+
+
+def silence_frame(sample_rate: int, channels: int) -> bytes:
+    """Encode one Layer III frame that decodes to silence.
+
+    All-zero side information declares no main data for any granule, so
+    every sample decodes to zero; no encoder is involved.
+    """
+    mpeg1 = _version_bits(sample_rate)[0] == 0b11
+    min_length = 4 + _side_info_size(mpeg1, channels)
+    header_bytes, header = _smallest_frame(sample_rate, channels, min_length)
+    return header_bytes + bytes(header.frame_length - 4)
+
+
+def build_toc(
+    points: list[tuple[int, int]], total_samples: int, total_bytes: int
+) -> bytes:
+    """Build the 100-entry Xing seek table.
+
+    Args:
+        points: Increasing (sample position, byte offset) pairs; positions in
+            between are interpolated linearly
+        total_samples: Playback length of the stream in samples
+        total_bytes: Size of the stream in bytes
+
+    Returns:
+        Byte offsets at every percent of playback, in 1/256ths of the file
+    """
+    if not points or total_samples <= 0 or total_bytes <= 0:
+        return bytes(range(0, 256, 3))[:100]
+
+    positions = [sample for sample, _ in points]
+    toc = bytearray(100)
+    for percent in range(100):
+        target = total_samples * percent / 100
+        index = max(0, bisect.bisect_right(positions, target) - 1)
+        sample, offset = points[index]
+        if index + 1 < len(points):
+            next_sample, next_offset = points[index + 1]
+        else:
+            next_sample, next_offset = total_samples, total_bytes
+        position: float = offset
+        if next_sample > sample:
+            position += (
+                (target - sample) / (next_sample - sample) * (next_offset - offset)
+            )
+        toc[percent] = min(255, int(position * 256 / total_bytes))
+    return bytes(toc)
+
+
+def _crc16(data: bytes | bytearray) -> int:
+    """CRC-16 (polynomial 0x8005, reflected) as used by the LAME tag."""
+    crc = 0
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc
+
+
+def xing_frame(
+    sample_rate: int,
+    channels: int,
+    frames: int = 0,
+    total_bytes: int = 0,
+    toc: bytes | None = None,
+    lame: bytes | None = None,
+    encoder_delay: int = 0,
+    encoder_padding: int = 0,
+) -> bytes:
+    """Encode a silent frame carrying a Xing tag for the stream that follows.
+
+    The frame size only depends on the stream layout and on whether a LAME
+    tag is included, so a placeholder can be written first and overwritten
+    in place once the totals are known.
+
+    Args:
+        sample_rate: Stream sample rate
+        channels: Stream channel count
+        frames: Number of audio frames after this one
+        total_bytes: Size of the stream including this frame
+        toc: 100-entry seek table from ``build_toc``
+        lame: LAME tag to carry over from a source clip; its gapless fields
+            are replaced with ``encoder_delay``/``encoder_padding``
+        encoder_delay: Samples of encoder delay at the start of the stream
+        encoder_padding: Samples of padding at the end of the stream
+    """
+    mpeg1 = _version_bits(sample_rate)[0] == 0b11
+    xing_at = 4 + _side_info_size(mpeg1, channels)
+    lame_at = xing_at + 120
+    size = lame_at + (_LAME_TAG_SIZE if lame else 0)
+    header_bytes, header = _smallest_frame(sample_rate, channels, size)
+
+    frame = bytearray(header.frame_length)
+    frame[:4] = header_bytes
+    frame[xing_at : xing_at + 4] = b"Xing"
+    # Frames, bytes, TOC and quality present; the LAME tag follows at +120
+    frame[xing_at + 4 : xing_at + 8] = (0x1 | 0x2 | 0x4 | 0x8).to_bytes(4, "big")
+    frame[xing_at + 8 : xing_at + 12] = frames.to_bytes(4, "big")
+    frame[xing_at + 12 : xing_at + 16] = total_bytes.to_bytes(4, "big")
+    frame[xing_at + 16 : xing_at + 116] = (toc or bytes(100))[:100]
+
+    if lame:
+        tag = bytearray(lame[:_LAME_TAG_SIZE])
+        tag[21:24] = ((encoder_delay << 12) | encoder_padding).to_bytes(3, "big")
+        tag[28:32] = total_bytes.to_bytes(4, "big")
+        tag[32:36] = bytes(4)  # music CRC is unknown; tag CRC follows
+        frame[lame_at : lame_at + _LAME_TAG_SIZE] = tag
+        frame[lame_at + 34 : lame_at + 36] = _crc16(frame[:190]).to_bytes(2, "big")
+
+    return bytes(frame)
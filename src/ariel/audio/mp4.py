@@ -0,0 +1,474 @@
+"""ADTS parsing and MP4 box writing for chaptered AAC audiobooks.
+
+Just enough of ISO/IEC 14496-12 to wrap a single AAC track, a QuickTime
+chapter track and Nero chapter/iTunes metadata atoms into an M4B file whose
+``moov`` atom precedes the media data.
+"""
+
+import struct
+from typing import NamedTuple
+
+import numpy as np
+
+# Sample rates indexed by the ADTS sampling_frequency_index
+_AAC_SAMPLE_RATES = (
+    96000, 88200, 64000, 48000, 44100, 32000, 24000, 22050, 16000, 12000, 11025, 8000, 7350,
+)  # fmt: skip
+
+# PCM samples per channel in one AAC-LC access unit
+AAC_FRAME_SAMPLES = 1024
+
+_MATRIX = struct.pack(">9I", 0x10000, 0, 0, 0, 0x10000, 0, 0, 0, 0x40000000)
+_LANGUAGE_UND = 0x55C4  # ISO 639-2 "und" packed as three 5-bit letters
+
+# Audio samples grouped into each chunk of the sample table
+_SAMPLES_PER_CHUNK = 64
+
+# Nero chapter lists store the chapter count in a single byte
+_MAX_NERO_CHAPTERS = 255
+
+# Marks chapter text samples as UTF-8
+_TEXT_ENCODING = b"\x00\x00\x00\x0cencd\x00\x00\x01\x00"
+
+# 3GPP text sample description used by QuickTime chapter tracks
+_TEXT_SAMPLE_ENTRY = bytes.fromhex(
+    "00000001"  # display flags
+    "0000"  # justification
+    "00000000"  # background colour
+    "0000000000000000"  # default text box
+    "00000000" "0001" "0000" "00000000"  # style record
+    "0000000d" "66746162" "0001" "0001" "00"  # font table with one empty name
+)  # fmt: skip
+
+
+class MP4FormatError(ValueError):
+    """Raised when data cannot be parsed as an ADTS stream."""
+
+
+class AdtsHeader(NamedTuple):
+    """Decoded ADTS frame header."""
+
+    object_type: int  # MPEG-4 audio object type, 2 for AAC-LC
+    sample_rate_index: int
+    sample_rate: int
+    channels: int
+    header_size: int  # 7 bytes, or 9 with a CRC
+    frame_length: int  # bytes, including the header
+
+
+class Chapter(NamedTuple):
+    """Chapter marker in an M4B file."""
+
+    start_ms: int
+    title: str
+
+
+def parse_adts_header(data: bytes | bytearray, offset: int = 0) -> AdtsHeader:
+    """Decode the ADTS header at ``offset``."""
+    if len(data) - offset < 7:
+        raise MP4FormatError("Truncated ADTS header")
+    b0, b1, b2, b3, b4, b5, b6 = data[offset : offset + 7]
+    if b0 != 0xFF or b1 & 0xF6 != 0xF0:
+        raise MP4FormatError(f"No ADTS sync word at byte {offset}")
+    if b6 & 0x03:
+        raise MP4FormatError("ADTS frames with several raw data blocks are unsupported")
+
+    sample_rate_index = (b2 >> 2) & 0x0F
+    if sample_rate_index >= len(_AAC_SAMPLE_RATES):
+        raise MP4FormatError(f"Invalid ADTS sample rate index {sample_rate_index}")
+    header_size = 7 if b1 & 0x01 else 9
+    frame_length = ((b3 & 0x03) << 11) | (b4 << 3) | (b5 >> 5)
+    if frame_length < header_size:
+        raise MP4FormatError(f"Invalid ADTS frame length {frame_length}")
+
+    return AdtsHeader(
+        object_type=(b2 >> 6) + 1,
+        sample_rate_index=sample_rate_index,
+        sample_rate=_AAC_SAMPLE_RATES[sample_rate_index],
+        channels=((b2 & 0x01) << 2) | (b3 >> 6),
+        header_size=header_size,
+        frame_length=frame_length,
+    )
+
+
+class AdtsParser:
+    """Incremental splitter of an ADTS byte stream into raw AAC frames.
+
+    Data can be fed in arbitrary chunks; incomplete frames are kept until the
+    rest arrives. The first header fixes the stream parameters in ``header``.
+    """
+
+    def __init__(self) -> None:
+        self.header: AdtsHeader | None = None
+        self._pending = bytearray()
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """Add stream data and return the payloads of all completed frames."""
+        self._pending += data
+        frames = []
+        offset = 0
+        while len(self._pending) - offset >= 7:
+            header = parse_adts_header(self._pending, offset)
+            end = offset + header.frame_length
+            if end > len(self._pending):
+                break
+            if self.header is None:
+                self.header = header
+            frames.append(bytes(self._pending[offset + header.header_size : end]))
+            offset = end
+        del self._pending[:offset]
+        return frames
+
+    def finish(self) -> None:
+        """Check that the stream ended on a frame boundary."""
+        if self._pending:
+            raise MP4FormatError(f"{len(self._pending)} trailing bytes in ADTS stream")
+
+
+def audio_specific_config(header: AdtsHeader) -> bytes:
+    """Build the two-byte AudioSpecificConfig describing an ADTS stream."""
+    value = (
+        header.object_type << 11 | header.sample_rate_index << 7 | header.channels << 3
+    )
+    return value.to_bytes(2, "big")
+
+
+def box(kind: bytes, *payload: bytes) -> bytes:
+    """Encode a box, switching to a 64-bit size when it doesn't fit 32 bits."""
+    body = b"".join(payload)
+    if len(body) + 8 > 0xFFFFFFFF:
+        return struct.pack(">I4sQ", 1, kind, len(body) + 16) + body
+    return struct.pack(">I4s", len(body) + 8, kind) + body
+
+
+def full_box(kind: bytes, version: int, flags: int, *payload: bytes) -> bytes:
+    """Encode a box that starts with a version byte and 24 bits of flags."""
+    return box(kind, struct.pack(">I", version << 24 | flags), *payload)
+
+
+def mdat_header(data_size: int) -> bytes:
+    """Header of an ``mdat`` box holding ``data_size`` bytes."""
+    if data_size + 8 > 0xFFFFFFFF:
+        return struct.pack(">I4sQ", 1, b"mdat", data_size + 16)
+    return struct.pack(">I4s", data_size + 8, b"mdat")
+
+
+def _descriptor(tag: int, *payload: bytes) -> bytes:
+    """Encode an MPEG-4 elementary stream descriptor."""
+    body = b"".join(payload)
+    size = len(body)
+    length = bytes([0x80 | (size >> 21) & 0x7F, 0x80 | (size >> 14) & 0x7F])
+    length += bytes([0x80 | (size >> 7) & 0x7F, size & 0x7F])
+    return bytes([tag]) + length + body
+
+
+def _mvhd(duration_ms: int, next_track_id: int) -> bytes:
+    version = 1 if duration_ms > 0xFFFFFFFF else 0
+    times = struct.pack(">QQIQ" if version else ">IIII", 0, 0, 1000, duration_ms)
+    return full_box(
+        b"mvhd",
+        version,
+        0,
+        times,
+        struct.pack(">IH10x", 0x10000, 0x0100),
+        _MATRIX,
+        bytes(24),
+        struct.pack(">I", next_track_id),
+    )
+
+
+def _tkhd(track_id: int, duration_ms: int, flags: int, volume: int) -> bytes:
+    version = 1 if duration_ms > 0xFFFFFFFF else 0
+    if version:
+        times = struct.pack(">QQI4xQ", 0, 0, track_id, duration_ms)
+    else:
+        times = struct.pack(">III4xI", 0, 0, track_id, duration_ms)
+    return full_box(
+        b"tkhd",
+        version,
+        flags,
+        times,
+        struct.pack(">8xhhH2x", 0, 0, volume),
+        _MATRIX,
+        struct.pack(">II", 0, 0),
+    )
+
+
+def _mdhd(timescale: int, duration: int) -> bytes:
+    version = 1 if duration > 0xFFFFFFFF else 0
+    times = struct.pack(">QQIQ" if version else ">IIII", 0, 0, timescale, duration)
+    return full_box(b"mdhd", version, 0, times, struct.pack(">HH", _LANGUAGE_UND, 0))
+
+
+def _hdlr(handler: bytes, name: str) -> bytes:
+    return full_box(
+        b"hdlr", 0, 0, struct.pack(">I4s12x", 0, handler), name.encode() + b"\x00"
+    )
+
+
+def _dinf() -> bytes:
+    # One data reference: the media lives in this file
+    return box(
+        b"dinf",
+        full_box(b"dref", 0, 0, struct.pack(">I", 1), full_box(b"url ", 0, 1)),
+    )
+
+
+def _chunk_offsets(offsets: np.ndarray, large: bool) -> bytes:
+    if large:
+        return full_box(
+            b"co64",
+            0,
+            0,
+            struct.pack(">I", len(offsets)),
+            offsets.astype(">u8").tobytes(),
+        )
+    return full_box(
+        b"stco", 0, 0, struct.pack(">I", len(offsets)), offsets.astype(">u4").tobytes()
+    )
+
+
+def _audio_trak(
+    header: AdtsHeader,
+    sample_sizes: np.ndarray,
+    data_offset: int,
+    duration_ms: int,
+    priming: int,
+    chapter_track_id: int | None,
+    large: bool,
+) -> bytes:
+    frames = len(sample_sizes)
+    media_duration = frames * AAC_FRAME_SAMPLES
+    total_bytes = int(sample_sizes.sum())
+    avg_bitrate = total_bytes * 8 * header.sample_rate // max(1, media_duration)
+    max_frame = int(sample_sizes.max()) if frames else 0
+
+    esds = full_box(
+        b"esds",
+        0,
+        0,
+        _descriptor(
+            0x03,
+            struct.pack(">HB", 1, 0),
+            _descriptor(
+                0x04,
+                # AAC audio stream, buffer size, max and average bitrate
+                struct.pack(">BB", 0x40, 0x15),
+                max_frame.to_bytes(3, "big"),
+                struct.pack(
+                    ">II",
+                    max_frame * 8 * header.sample_rate // AAC_FRAME_SAMPLES,
+                    avg_bitrate,
+                ),
+                _descriptor(0x05, audio_specific_config(header)),
+            ),
+            _descriptor(0x06, b"\x02"),
+        ),
+    )
+    mp4a = box(
+        b"mp4a",
+        struct.pack(">6xH8x", 1),
+        struct.pack(">HHHHI", header.channels, 16, 0, 0, header.sample_rate << 16),
+        esds,
+    )
+
+    # Chunks of _SAMPLES_PER_CHUNK frames laid out back to back in the mdat
+    starts = np.zeros(frames, dtype=np.uint64)
+    np.cumsum(sample_sizes[:-1], out=starts[1:])
+    offsets = starts[::_SAMPLES_PER_CHUNK] + data_offset
+    full_chunks, remainder = divmod(frames, _SAMPLES_PER_CHUNK)
+    chunk_runs = [struct.pack(">III", 1, _SAMPLES_PER_CHUNK, 1)] if full_chunks else []
+    if remainder:
+        chunk_runs.append(struct.pack(">III", full_chunks + 1, remainder, 1))
+
+    stbl = box(
+        b"stbl",
+        full_box(b"stsd", 0, 0, struct.pack(">I", 1), mp4a),
+        full_box(b"stts", 0, 0, struct.pack(">III", 1, frames, AAC_FRAME_SAMPLES)),
+        full_box(b"stsc", 0, 0, struct.pack(">I", len(chunk_runs)), *chunk_runs),
+        full_box(
+            b"stsz",
+            0,
+            0,
+            struct.pack(">II", 0, frames),
+            sample_sizes.astype(">u4").tobytes(),
+        ),
+        _chunk_offsets(offsets, large),
+    )
+
+    return box(
+        b"trak",
+        _tkhd(1, duration_ms, flags=0x3, volume=0x0100),
+        # Skip the encoder's priming samples so playback starts on the first word
+        box(
+            b"edts",
+            full_box(
+                b"elst", 0, 0, struct.pack(">IIiI", 1, duration_ms, priming, 0x10000)
+            ),
+        ),
+        box(b"tref", box(b"chap", struct.pack(">I", chapter_track_id)))
+        if chapter_track_id
+        else b"",
+        box(
+            b"mdia",
+            _mdhd(header.sample_rate, media_duration),
+            _hdlr(b"soun", "SoundHandler"),
+            box(b"minf", full_box(b"smhd", 0, 0, bytes(4)), _dinf(), stbl),
+        ),
+    )
+
+
+def chapter_samples(chapters: list[Chapter]) -> list[bytes]:
+    """Encode chapter titles as samples for the QuickTime chapter track."""
+    samples = []
+    for chapter in chapters:
+        title = chapter.title.encode("utf-8")[:0xFFFF]
+        samples.append(struct.pack(">H", len(title)) + title + _TEXT_ENCODING)
+    return samples
+
+
+def _chapter_trak(
+    track_id: int,
+    chapters: list[Chapter],
+    sample_sizes: list[int],
+    data_offset: int,
+    duration_ms: int,
+    large: bool,
+) -> bytes:
+    ends = [chapter.start_ms for chapter in chapters[1:]] + [duration_ms]
+    durations = [end - chapter.start_ms for chapter, end in zip(chapters, ends)]
+    offsets = np.cumsum([0] + sample_sizes[:-1], dtype=np.uint64) + data_offset
+
+    text_entry = box(b"text", struct.pack(">6xH", 1), _TEXT_SAMPLE_ENTRY)
+    gmhd = box(
+        b"gmhd",
+        full_box(
+            b"gmin", 0, 0, struct.pack(">H3HHH", 0x40, 0x8000, 0x8000, 0x8000, 0, 0)
+        ),
+        box(b"text", struct.pack(">H8I", 1, 0, 0, 0, 1, 0, 0, 0, 0x4000), bytes(2)),
+    )
+    stbl = box(
+        b"stbl",
+        full_box(b"stsd", 0, 0, struct.pack(">I", 1), text_entry),
+        full_box(
+            b"stts",
+            0,
+            0,
+            struct.pack(">I", len(durations)),
+            *(struct.pack(">II", 1, duration) for duration in durations),
+        ),
+        full_box(b"stsc", 0, 0, struct.pack(">IIII", 1, 1, 1, 1)),
+        full_box(
+            b"stsz",
+            0,
+            0,
+            struct.pack(">II", 0, len(sample_sizes)),
+            struct.pack(f">{len(sample_sizes)}I", *sample_sizes),
+        ),
+        _chunk_offsets(offsets, large),
+    )
+
+    return box(
+        b"trak",
+        # Referenced by the audio track, not played on its own
+        _tkhd(track_id, duration_ms, flags=0x2, volume=0),
+        box(
+            b"mdia",
+            _mdhd(1000, duration_ms),
+            _hdlr(b"text", "ChapterHandler"),
+            box(b"minf", gmhd, _dinf(), stbl),
+        ),
+    )
+
+
+def _nero_chapters(chapters: list[Chapter]) -> bytes:
+    entries = []
+    for chapter in chapters:
+        title = chapter.title.encode("utf-8")[:255]
+        # Start times in 100 ns units
+        entries.append(
+            struct.pack(">QB", chapter.start_ms * 10_000, len(title)) + title
+        )
+    return full_box(b"chpl", 1, 0, struct.pack(">IB", 0, len(chapters)), *entries)
+
+
+def _ilst(title: str | None) -> bytes:
+    def item(kind: bytes, data_type: int, value: bytes) -> bytes:
+        return box(kind, box(b"data", struct.pack(">II", data_type, 0), value))
+
+    items = [item(b"stik", 21, b"\x02")]  # media kind: audiobook
+    if title:
+        items.insert(0, item(b"\xa9nam", 1, title.encode("utf-8")))
+    items.append(item(b"\xa9too", 1, b"ariel"))
+    return full_box(b"meta", 0, 0, _hdlr(b"mdir", ""), box(b"ilst", *items))
+
+
+def ftyp() -> bytes:
+    """File type box marking the file as an iTunes audiobook."""
+    return box(b"ftyp", b"M4B ", struct.pack(">I", 0x200), b"M4B M4A mp42isom")
+
+
+def moov(
+    header: AdtsHeader,
+    sample_sizes: np.ndarray,
+    duration_ms: int,
+    chapters: list[Chapter],
+    data_offset: int,
+    priming: int = AAC_FRAME_SAMPLES,
+    title: str | None = None,
+) -> bytes:
+    """Build the movie box for an AAC stream followed by its chapter samples.
+
+    The media data is expected to hold the AAC frames back to back starting
+    at ``data_offset``, immediately followed by ``chapter_samples(chapters)``.
+    The box size doesn't depend on ``data_offset`` unless the offsets move
+    past 4 GiB, so it can be built once to measure it and again to place it.
+
+    Args:
+        header: First ADTS header of the stream
+        sample_sizes: Size in bytes of every raw AAC frame
+        duration_ms: Playback length, excluding encoder priming
+        chapters: Chapters in order, the first starting at 0
+        data_offset: File offset of the first AAC frame
+        priming: Encoder delay in samples to skip at the start
+        title: Album title stored in the iTunes metadata
+    """
+    samples = chapter_samples(chapters)
+    text_sizes = [len(sample) for sample in samples]
+    audio_bytes = int(sample_sizes.sum())
+    large = data_offset + audio_bytes + sum(text_sizes) > 0xFFFFFFFF
+
+    chapter_track_id = 2 if chapters else None
+    traks = [
+        _audio_trak(
+            header,
+            sample_sizes,
+            data_offset,
+            duration_ms,
+            priming,
+            chapter_track_id,
+            large,
+        )
+    ]
+    udta = []
+    if chapter_track_id is not None:
+        traks.append(
+            _chapter_trak(
+                chapter_track_id,
+                chapters,
+                text_sizes,
+                data_offset + audio_bytes,
+                duration_ms,
+                large,
+            )
+        )
+        if len(chapters) <= _MAX_NERO_CHAPTERS:
+            udta.append(_nero_chapters(chapters))
+    udta.append(_ilst(title))
+
+    return box(
+        b"moov",
+        _mvhd(duration_ms, next_track_id=len(traks) + 1),
+        *traks,
+        box(b"udta", *udta),
+    )
@@ -0,0 +1,100 @@
+"""Append-only store that keeps synthesized segment audio on disk."""
+
+import mmap
+import os
+import threading
+from pathlib import Path
+from typing import NamedTuple
+
+# Read-only mappings of store files in this process, by path
+_mappings: dict[str, mmap.mmap] = {}
+_mappings_lock = threading.Lock()
+
+
+def _read_mapped(path: str, offset: int, end: int) -> bytes:
+    """Copy bytes out of a mapping of ``path``, remapping if the file grew."""
+    # Held while copying so no other thread can close the mapping under us
+    with _mappings_lock:
+        mapped = _mappings.get(path)
+        if mapped is None or len(mapped) < end:
+            with open(path, "rb") as f:
+                new = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(new) < end:
+                new.close()
+                raise ValueError(f"Audio store {path} is shorter than {end} bytes")
+            if mapped is not None:
+                mapped.close()
+            _mappings[path] = mapped = new
+        return mapped[offset:end]
+
+
+def _unmap(path: str) -> None:
+    with _mappings_lock:
+        mapped = _mappings.pop(path, None)
+        if mapped is not None:
+            mapped.close()
+
+
+class AudioRef(NamedTuple):
+    """Location of one clip inside a segment store file."""
+
+    path: str
+    offset: int
+    length: int
+
+    def read(self) -> bytes:
+        """Read the clip through a memory map of the store file.
+
+        Works in any process that can see the file, so references can be
+        handed to worker processes instead of the audio itself.
+        """
+        if not self.length:
+            return b""
+        return _read_mapped(self.path, self.offset, self.offset + self.length)
+
+
+class SegmentStore:
+    """Single blob file that segment audio is appended to.
+
+    Only ``AudioRef`` handles are kept by callers, so a whole book's audio
+    never has to sit in memory. Appends are thread-safe; a crash mid-write
+    leaves at most an unreferenced tail that later appends write past.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "ab")
+        self._size = self._file.seek(0, os.SEEK_END)
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """Bytes written to the store file."""
+        return self._size
+
+    def append(self, audio_data: bytes) -> AudioRef:
+        """Write a clip to the end of the store and return its handle."""
+        with self._lock:
+            offset = self._size
+            self._file.write(audio_data)
+            # Readers map the file, so the data must reach the OS first
+            self._file.flush()
+            self._size += len(audio_data)
+        return AudioRef(str(self.path), offset, len(audio_data))
+
+    def contains(self, ref: AudioRef) -> bool:
+        """Whether ``ref`` points at data inside this store."""
+        return ref.path == str(self.path) and ref.offset + ref.length <= self._size
+
+    def truncate(self) -> None:
+        """Drop all stored audio."""
+        with self._lock:
+            _unmap(str(self.path))
+            self._file.truncate(0)
+            self._size = 0
+
+    def close(self) -> None:
+        """Close the store file, keeping its contents."""
+        _unmap(str(self.path))
+        self._file.close()
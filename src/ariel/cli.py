@@ -1,7 +1,9 @@
 """CLI interface for Ariel audiobook converter."""
 
 import asyncio
+from collections.abc import Awaitable
 from pathlib import Path
+from typing import Any, TypeVar
 
 import typer
 from rich.console import Console
@@ -18,6 +20,18 @@ app = typer.Typer(
 )
 console = Console()
 
+T = TypeVar("T")
+
+
+def _run(pipeline: ProcessingPipeline, work: Awaitable[T]) -> T:
+    """Run ``work``, then close the pipeline's connections on the same loop."""
+
+    async def main() -> T:
+        async with pipeline:
+            return await work
+
+    return asyncio.run(main())
+
 
 @app.command()
 def convert(
@@ -40,6 +54,19 @@ def convert(
     dry_run: bool = typer.Option(
         False, "--dry-run", help="Analyze text without generating audio"
     ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Synthesize every segment, bypassing the audio cache"
+    ),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        help="Continue an interrupted conversion, skipping finished segments",
+    ),
+    stream: bool = typer.Option(
+        False,
+        "--stream",
+        help="Write audio to the output as segments finish instead of at the end",
+    ),
 ) -> None:
     """Convert a text file to an audiobook."""
     if not input_file.exists():
@@ -63,6 +90,8 @@ def convert(
         processing_config.analyzer_type = analyzer
     if voice_gen:
         processing_config.voice_generator_type = voice_gen
+    if no_cache:
+        processing_config.cache_enabled = False
 
     # Set output file
     if output is None:
@@ -83,14 +112,29 @@ def convert(
     pipeline = ProcessingPipeline(processing_config)
 
     try:
-        results = asyncio.run(pipeline.process_text_file(input_file, output, dry_run))
+        if stream and not dry_run:
+            results = _run(
+                pipeline,
+                _run_streaming_conversion(pipeline, input_file, output, resume),
+            )
+        else:
+            results = _run(
+                pipeline,
+                pipeline.process_text_file(input_file, output, dry_run, resume=resume),
+            )
 
         # Display results
         console.print("\n[green]✓ Processing complete![/green]")
         console.print(f"  Input length: {results['input_length']:,} characters")
-        console.print(f"  Text segments: {len(results['segments'])}")
+        console.print(f"  Text segments: {results['segment_count']}")
         console.print(f"  Characters identified: {len(results['characters'])}")
 
+        if results["failed_segments"]:
+            console.print(
+                f"[yellow]  Failed segments (skipped): "
+                f"{len(results['failed_segments'])}[/yellow]"
+            )
+
         if not dry_run and results["output_file"]:
             console.print(f"  Audiobook saved to: {results['output_file']}")
 
@@ -98,6 +142,38 @@ def convert(
         console.print(f"[red]Error during conversion: {e}[/red]")
         raise typer.Exit(1)
 
+    # The audiobook is missing the failed segments; tell scripts about it
+    if results["failed_segments"]:
+        console.print("[yellow]  Re-run with --resume to retry them[/yellow]")
+        raise typer.Exit(1)
+
+
+async def _run_streaming_conversion(
+    pipeline: ProcessingPipeline, input_file: Path, output: Path, resume: bool
+) -> dict[str, Any]:
+    """Run a streaming conversion and collect its results."""
+    results: dict[str, Any] = {}
+    async for event in pipeline.process_file_stream(input_file, output, resume=resume):
+        if event["event"] == "analyzed":
+            results.update(event)
+            console.print(
+                f"[blue]Streaming {event['segment_count']} segments to {output}[/blue]"
+            )
+        elif event["event"] == "segment":
+            console.print(
+                f"   Wrote {event['index'] + 1}/{event['total']}: "
+                f"{event['speaker_name']}"
+            )
+        elif event["event"] == "segment_failed":
+            console.print(
+                f"[yellow]   Segment {event['index'] + 1} failed: "
+                f"{event['error']}[/yellow]"
+            )
+        elif event["event"] == "complete":
+            results.update(event)
+
+    return results
+
 
 @app.command()
 def preview(
@@ -132,7 +208,7 @@ def preview(
     console.print(f"[blue]Preview segments: {segments}[/blue]")
 
     try:
-        audio_list = asyncio.run(pipeline.preview_audio(text, segments))
+        audio_list = _run(pipeline, pipeline.preview_audio(text, segments))
 
         # Save preview files
         for i, audio_data in enumerate(audio_list, 1):
@@ -164,7 +240,7 @@ def list_voices(
 
         console.print(f"[green]Available voices for {voice_gen}:[/green]")
 
-        voices = asyncio.run(pipeline.list_available_voices())
+        voices = _run(pipeline, pipeline.list_available_voices())
 
         # Filter by language if specified
         if filter_lang:
@@ -1,38 +1,195 @@
 """Basic audio compiler that concatenates segments."""
 
+import asyncio
 import io
 from pathlib import Path
+from typing import Any
 
 from pydub import AudioSegment as PydubAudioSegment
-
-from ..core.interfaces import AudioCompiler
+from pydub.utils import get_encoder_name
+
+from ..audio.formats import (
+    FFMPEG_DEMUXERS,
+    PCM_CHANNELS,
+    PCM_SAMPLE_RATE,
+    PCM_SAMPLE_WIDTH,
+)
+from ..core.interfaces import AudioCompiler, AudioStreamWriter
 from ..models import AudioSegment
 
+# ffmpeg muxer names for formats whose file extension is not a muxer
+FFMPEG_FORMATS = {"m4a": "ipod", "m4b": "ipod"}
+
+
+def _decode(audio_data: bytes, audio_format: str = "mp3") -> PydubAudioSegment:
+    """Decode a segment's audio; raw PCM is wrapped without running ffmpeg."""
+    if audio_format == "pcm":
+        return PydubAudioSegment(
+            data=audio_data,
+            sample_width=PCM_SAMPLE_WIDTH,
+            frame_rate=PCM_SAMPLE_RATE,
+            channels=PCM_CHANNELS,
+        )
+    return PydubAudioSegment.from_file(
+        io.BytesIO(audio_data), format=FFMPEG_DEMUXERS[audio_format]
+    )
+
+
+def _decode_pcm(
+    audio_data: bytes,
+    frame_rate: int | None = None,
+    channels: int | None = None,
+    audio_format: str = "mp3",
+) -> PydubAudioSegment:
+    """Decode audio to 16-bit PCM, optionally resampling to a layout."""
+    audio = _decode(audio_data, audio_format).set_sample_width(2)
+    if frame_rate:
+        audio = audio.set_frame_rate(frame_rate)
+    if channels:
+        audio = audio.set_channels(channels)
+    return audio
+
+
+class FfmpegStreamWriter(AudioStreamWriter):
+    """Stream writer that pipes decoded PCM into a single ffmpeg encoder.
+
+    Only one segment is decoded at a time, so memory stays flat regardless of
+    book length, and ffmpeg writes the output file progressively.
+    """
+
+    def __init__(
+        self, output_path: str, format_type: str = "mp3", silence_duration_ms: int = 500
+    ) -> None:
+        self.output_path = Path(output_path)
+        self.format_type = format_type
+        self.silence_duration_ms = silence_duration_ms
+
+        self._process: asyncio.subprocess.Process | None = None
+        self._frame_rate: int | None = None
+        self._channels: int | None = None
+
+    async def write(self, segment: AudioSegment) -> None:
+        """Decode a segment and feed it to the encoder."""
+        audio = await asyncio.to_thread(
+            _decode_pcm,
+            segment.audio,
+            self._frame_rate,
+            self._channels,
+            segment.audio_format,
+        )
+
+        if self._process is None:
+            # The first segment decides the PCM layout for the whole output
+            self._frame_rate = audio.frame_rate
+            self._channels = audio.channels
+            await self._start_encoder()
+            pcm = audio.raw_data
+        elif segment.continues_previous:
+            pcm = audio.raw_data
+        else:
+            silence_frames = audio.frame_rate * self.silence_duration_ms // 1000
+            pcm = b"\x00" * (silence_frames * audio.channels * 2) + audio.raw_data
+
+        process = self._encoder()
+        assert process.stdin is not None
+        process.stdin.write(pcm)
+        # Back-pressure: wait for ffmpeg to consume the data
+        await process.stdin.drain()
+
+    async def close(self) -> str:
+        """Flush the encoder and finish the output file."""
+        if self._process is None:
+            raise ValueError("No audio segments to compile")
+
+        process = self._process
+        assert process.stdin is not None and process.stderr is not None
+        process.stdin.close()
+        stderr = await process.stderr.read()
+        if await process.wait() != 0:
+            raise RuntimeError(f"Encoding failed: {stderr.decode(errors='replace')}")
+
+        return str(self.output_path)
+
+    async def abort(self) -> None:
+        """Stop the encoder and remove the partial output."""
+        if self._process is not None and self._process.returncode is None:
+            self._process.kill()
+            await self._process.wait()
+        self.output_path.unlink(missing_ok=True)
+
+    def _encoder(self) -> asyncio.subprocess.Process:
+        if self._process is None:
+            raise RuntimeError("Encoder is not running")
+        return self._process
+
+    async def _start_encoder(self) -> None:
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._process = await asyncio.create_subprocess_exec(
+            get_encoder_name(),
+            "-y",
+            "-loglevel",
+            "error",
+            "-f",
+            "s16le",
+            "-ar",
+            str(self._frame_rate),
+            "-ac",
+            str(self._channels),
+            "-i",
+            "pipe:0",
+            "-f",
+            FFMPEG_FORMATS.get(self.format_type, self.format_type),
+            str(self.output_path),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+
 
 class BasicAudioCompiler(AudioCompiler):
     """Compiler that concatenates audio segments sequentially."""
 
-    def __init__(self, silence_duration_ms: int = 500) -> None:
-        """Initialize compiler with optional silence between segments."""
+    def __init__(self, silence_duration_ms: int = 500, bitrate: str = "64k") -> None:
+        """Initialize compiler with optional silence between segments.
+
+        Args:
+            silence_duration_ms: Pause inserted between segments
+            bitrate: AAC bitrate for M4B audiobooks
+        """
         self.silence_duration_ms = silence_duration_ms
+        self.bitrate = bitrate
 
     async def compile_audio(
-        self, segments: list[AudioSegment], output_path: str, **kwargs
+        self, segments: list[AudioSegment], output_path: str, **kwargs: Any
     ) -> str:
         """Compile audio segments into a single output file."""
         if not segments:
             raise ValueError("No audio segments to compile")
 
+        # Chaptered audiobooks are always written as a stream
+        if kwargs.get("format") == "m4b":
+            writer = self.open_stream(output_path, **kwargs)
+            try:
+                for segment in segments:
+                    await writer.write(segment)
+                return await writer.close()
+            except BaseException:
+                await writer.abort()
+                raise
+
         # Create silence segment for transitions
         silence = PydubAudioSegment.silent(duration=self.silence_duration_ms)
 
         # Start with the first segment
-        combined_audio = PydubAudioSegment.from_mp3(io.BytesIO(segments[0].audio_data))
+        combined_audio = _decode(segments[0].audio, segments[0].audio_format)
 
         # Add remaining segments with silence between them
         for segment in segments[1:]:
-            audio_segment = PydubAudioSegment.from_mp3(io.BytesIO(segment.audio_data))
-            combined_audio += silence + audio_segment
+            audio_segment = _decode(segment.audio, segment.audio_format)
+            if segment.continues_previous:
+                combined_audio += audio_segment
+            else:
+                combined_audio += silence + audio_segment
 
         # Ensure output directory exists
         output_file = Path(output_path)
@@ -44,6 +201,23 @@ class BasicAudioCompiler(AudioCompiler):
 
         return str(output_file)
 
+    def open_stream(self, output_path: str, **kwargs: Any) -> AudioStreamWriter:
+        """Open a writer that encodes segments into the output as they arrive."""
+        if kwargs.get("format") == "m4b":
+            # Imported here because the M4B writer builds on this module
+            from .m4b import M4BStreamWriter
+
+            return M4BStreamWriter(
+                output_path,
+                silence_duration_ms=self.silence_duration_ms,
+                bitrate=self.bitrate,
+            )
+        return FfmpegStreamWriter(
+            output_path,
+            format_type=kwargs.get("format", "mp3"),
+            silence_duration_ms=self.silence_duration_ms,
+        )
+
     def compile(self, segments: list[AudioSegment], output_path: Path) -> None:
         """Compile audio segments into a single output file (backward compatibility)."""
         if not segments:
@@ -53,12 +227,15 @@ class BasicAudioCompiler(AudioCompiler):
         silence = PydubAudioSegment.silent(duration=self.silence_duration_ms)
 
         # Start with the first segment
-        combined_audio = PydubAudioSegment.from_mp3(io.BytesIO(segments[0].audio_data))
+        combined_audio = _decode(segments[0].audio, segments[0].audio_format)
 
         # Add remaining segments with silence between them
         for segment in segments[1:]:
-            audio_segment = PydubAudioSegment.from_mp3(io.BytesIO(segment.audio_data))
-            combined_audio += silence + audio_segment
+            audio_segment = _decode(segment.audio, segment.audio_format)
+            if segment.continues_previous:
+                combined_audio += audio_segment
+            else:
+                combined_audio += silence + audio_segment
 
         # Export the final audio
         combined_audio.export(str(output_path), format="mp3")
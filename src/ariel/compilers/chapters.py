@@ -0,0 +1,245 @@
+"""Chapter-aware compiler that writes one audio file per chapter."""
+
+import asyncio
+import multiprocessing
+import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from ..core.interfaces import AudioCompiler, AudioStreamWriter
+from ..models import AudioSegment
+from ..parsers.headings import chapter_heading
+
+# Characters that are not allowed in file names on common filesystems
+_UNSAFE_FILENAME = re.compile(r'[\\/:*?"<>|\x00-\x1f]+')
+
+
+def _compile_part(
+    compiler_type: str,
+    compiler_options: dict[str, Any],
+    segments: list[AudioSegment],
+    output_path: str,
+    format_type: str,
+) -> str:
+    """Compile one chapter file; runs in a worker process."""
+    from ..core.factory import factory
+
+    compiler = factory.create_compiler(compiler_type, **compiler_options)
+    return asyncio.run(
+        compiler.compile_audio(segments, output_path, format=format_type)
+    )
+
+
+def segment_chapter_title(segment: AudioSegment) -> str | None:
+    """Title of the chapter that starts with ``segment``, if one does."""
+    if segment.chapter_title is None and not segment.continues_previous:
+        return chapter_heading(segment.text)
+    return segment.chapter_title
+
+
+def _file_stem(number: int, title: str) -> str:
+    safe_title = _UNSAFE_FILENAME.sub("", title).strip(" .")[:60].rstrip()
+    return f"{number:03d} - {safe_title}" if safe_title else f"{number:03d}"
+
+
+class ChapterStreamWriter(AudioStreamWriter):
+    """Stream writer that hands each finished chapter to a process pool.
+
+    Segments are collected until the next chapter starts (or the current part
+    reaches its size or duration limit), then the part is encoded in a worker
+    process while later chapters keep arriving. Only chapters that are still
+    being collected or encoded are held in memory.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        format_type: str,
+        max_workers: int | None = None,
+        part_compiler: str = "pcm",
+        part_options: dict[str, Any] | None = None,
+        silence_duration_ms: int = 500,
+        max_part_ms: int | None = None,
+        max_part_bytes: int | None = None,
+    ) -> None:
+        self.output_dir = output_dir
+        self.format_type = format_type
+        # Spawned workers avoid forking a process with a running event loop
+        self.executor = ProcessPoolExecutor(
+            max_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self.part_compiler = part_compiler
+        self.part_options = part_options or {}
+        self.silence_duration_ms = silence_duration_ms
+        self.max_part_ms = max_part_ms
+        self.max_part_bytes = max_part_bytes
+
+        self._title = output_dir.name
+        self._part = 1
+        self._segments: list[AudioSegment] = []
+        self._duration_ms = 0
+        self._bytes = 0
+
+        # (file name, title, duration_ms) per written part, in order
+        self._entries: list[tuple[str, str, int]] = []
+        self._futures: list[asyncio.Future] = []
+
+    async def write(self, segment: AudioSegment) -> None:
+        """Add a segment, starting a new chapter or part file when needed."""
+        title = segment_chapter_title(segment)
+        if title and self._segments:
+            self._submit()
+            self._title, self._part = title, 1
+        elif title:
+            self._title = title
+        elif self._segments and not segment.continues_previous and self._full():
+            self._submit()
+            self._part += 1
+
+        if self._segments and not segment.continues_previous:
+            self._duration_ms += self.silence_duration_ms
+        self._segments.append(segment)
+        self._duration_ms += segment.duration_ms
+        self._bytes += segment.audio_size
+
+    async def close(self) -> str:
+        """Wait for every chapter file and write a playlist next to them."""
+        if self._segments:
+            self._submit()
+        try:
+            if not self._futures:
+                raise ValueError("No audio segments to compile")
+            await asyncio.gather(*self._futures)
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+        playlist = ["#EXTM3U"]
+        for file_name, title, duration_ms in self._entries:
+            playlist.append(f"#EXTINF:{round(duration_ms / 1000)},{title}")
+            playlist.append(file_name)
+        playlist_path = self.output_dir / f"{self.output_dir.name}.m3u"
+        playlist_path.write_text("\n".join(playlist) + "\n", encoding="utf-8")
+
+        return str(self.output_dir)
+
+    async def abort(self) -> None:
+        """Cancel pending chapters and remove the output directory."""
+        for future in self._futures:
+            future.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        await asyncio.gather(*self._futures, return_exceptions=True)
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+
+    def _prepare_output_dir(self) -> None:
+        """Create the output directory, dropping parts from an earlier run."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        for path in self.output_dir.glob(f"[0-9][0-9][0-9]*.{self.format_type}"):
+            path.unlink(missing_ok=True)
+
+    def _full(self) -> bool:
+        return bool(
+            (self.max_part_ms and self._duration_ms >= self.max_part_ms)
+            or (self.max_part_bytes and self._bytes >= self.max_part_bytes)
+        )
+
+    def _submit(self) -> None:
+        """Start encoding the collected segments as the next file."""
+        title = self._title if self._part == 1 else f"{self._title} (part {self._part})"
+        file_name = f"{_file_stem(len(self._entries) + 1, title)}.{self.format_type}"
+        self._entries.append((file_name, title, self._duration_ms))
+
+        if len(self._entries) == 1:
+            self._prepare_output_dir()
+        loop = asyncio.get_running_loop()
+        self._futures.append(
+            loop.run_in_executor(
+                self.executor,
+                _compile_part,
+                self.part_compiler,
+                self.part_options,
+                self._segments,
+                str(self.output_dir / file_name),
+                self.format_type,
+            )
+        )
+
+        self._segments = []
+        self._duration_ms = 0
+        self._bytes = 0
+
+
+class ChapterAwareAudioCompiler(AudioCompiler):
+    """Compiler that writes a directory with one audio file per chapter.
+
+    Chapters start at segments carrying a ``chapter_title`` from the parser,
+    or at segments whose text opens with a chapter heading. Long chapters
+    roll over into numbered parts by duration or estimated size. Each file is
+    compiled by ``part_compiler`` in a separate process, so assembly scales
+    with the number of cores, and an M3U playlist lists the files in order.
+    """
+
+    def __init__(
+        self,
+        silence_duration_ms: int = 500,
+        part_compiler: str = "pcm",
+        max_part_minutes: float | None = None,
+        max_part_mb: float | None = None,
+        max_workers: int | None = None,
+    ) -> None:
+        """Initialize compiler.
+
+        Args:
+            silence_duration_ms: Pause inserted between segments
+            part_compiler: Registered compiler used for each chapter file
+            max_part_minutes: Split chapters longer than this into parts
+            max_part_mb: Split chapters whose segment audio exceeds this size
+            max_workers: Encoder processes; defaults to the number of CPUs
+        """
+        self.silence_duration_ms = silence_duration_ms
+        self.part_compiler = part_compiler
+        self.max_part_ms = int(max_part_minutes * 60_000) if max_part_minutes else None
+        self.max_part_bytes = int(max_part_mb * 1024 * 1024) if max_part_mb else None
+        self.max_workers = max_workers
+
+    def _part_options(self) -> dict[str, Any]:
+        options: dict[str, Any] = {"silence_duration_ms": self.silence_duration_ms}
+        if self.part_compiler == "pcm":
+            # Chapters already run in parallel; don't nest encoder pools
+            options["encode_workers"] = 1
+        return options
+
+    async def compile_audio(
+        self, segments: list[AudioSegment], output_path: str, **kwargs: Any
+    ) -> str:
+        """Compile audio segments into per-chapter files.
+
+        Returns:
+            Directory holding the chapter files and playlist
+        """
+        if not segments:
+            raise ValueError("No audio segments to compile")
+
+        writer = self.open_stream(output_path, **kwargs)
+        try:
+            for segment in segments:
+                await writer.write(segment)
+            return await writer.close()
+        except BaseException:
+            await writer.abort()
+            raise
+
+    def open_stream(self, output_path: str, **kwargs: Any) -> AudioStreamWriter:
+        """Open a writer that encodes each chapter as soon as it is complete."""
+        path = Path(output_path)
+        return ChapterStreamWriter(
+            path.with_suffix(""),
+            kwargs.get("format", path.suffix.lstrip(".") or "mp3"),
+            self.max_workers,
+            part_compiler=self.part_compiler,
+            part_options=self._part_options(),
+            silence_duration_ms=self.silence_duration_ms,
+            max_part_ms=self.max_part_ms,
+            max_part_bytes=self.max_part_bytes,
+        )
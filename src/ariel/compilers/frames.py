@@ -0,0 +1,235 @@
+"""MP3 compiler that joins segments frame by frame without re-encoding."""
+
+import asyncio
+import io
+from pathlib import Path
+from typing import Any
+
+from ..audio.mp3 import (
+    MP3FormatError,
+    MP3Info,
+    build_toc,
+    parse_frame_header,
+    samples_per_frame,
+    scan_mp3,
+    silence_frame,
+    xing_frame,
+)
+from ..core.interfaces import AudioStreamWriter
+from ..models import AudioSegment
+from .basic import BasicAudioCompiler, _decode
+
+
+def _transcode(
+    audio_data: bytes,
+    sample_rate: int | None = None,
+    channels: int | None = None,
+    bitrate: int | None = None,
+    audio_format: str = "mp3",
+) -> bytes:
+    """Re-encode a clip as Layer III, optionally to the stream's parameters."""
+    audio = _decode(audio_data, audio_format)
+    if sample_rate:
+        audio = audio.set_frame_rate(sample_rate)
+    if channels:
+        audio = audio.set_channels(channels)
+    output = io.BytesIO()
+    audio.export(
+        output, format="mp3", bitrate=f"{bitrate // 1000}k" if bitrate else None
+    )
+    return output.getvalue()
+
+
+class FrameConcatStreamWriter(AudioStreamWriter):
+    """Stream writer that appends each segment's MP3 frames to the output.
+
+    Tags and Xing/Info frames are stripped from the segments, pauses are made
+    of pre-built silent frames, and a single Xing header with a seek table is
+    written over a placeholder at the start once the totals are known. The
+    first segment fixes the sample rate and channel layout; a segment that
+    doesn't match it (or can't be parsed, or isn't MP3) is re-encoded on its
+    own.
+    """
+
+    def __init__(self, output_path: str, silence_duration_ms: int = 500) -> None:
+        self.output_path = Path(output_path)
+        self.silence_duration_ms = silence_duration_ms
+
+        self._file: io.BufferedWriter | None = None
+        self._sample_rate = 0
+        self._channels = 0
+        self._bitrate = 0
+        self._silence = b""
+        self._lame: bytes | None = None
+        self._header_size = 0
+
+        self._frames = 0
+        self._samples = 0
+        self._bytes = 0
+        self._encoder_delay = 0
+        self._encoder_padding = 0
+        # (sample, byte) positions at segment starts for the seek table
+        self._seek_points: list[tuple[int, int]] = []
+
+        self.transcoded = 0
+
+    async def write(self, segment: AudioSegment) -> None:
+        """Append a segment's frames, preceded by a pause if it needs one."""
+        audio_data = segment.audio
+        info = None
+        if segment.audio_format == "mp3":
+            try:
+                info = scan_mp3(audio_data)
+            except MP3FormatError:
+                pass
+
+        if info is None or not self._compatible(audio_data, info):
+            audio_data = await asyncio.to_thread(
+                _transcode,
+                audio_data,
+                self._sample_rate or None,
+                self._channels or None,
+                self._bitrate or None,
+                segment.audio_format,
+            )
+            info = scan_mp3(audio_data)
+            self.transcoded += 1
+
+        if self._file is None:
+            await asyncio.to_thread(self._open, audio_data, info)
+
+        delay = info.xing.encoder_delay if info.xing else 0
+        padding = info.xing.encoder_padding if info.xing else 0
+
+        chunks = []
+        if self._frames and not segment.continues_previous:
+            # Encoder delay and padding around the clips already sound as silence
+            pause = (
+                self._sample_rate * self.silence_duration_ms // 1000
+                - self._encoder_padding
+                - delay
+            )
+            silent_frames = max(0, round(pause / samples_per_frame(self._sample_rate)))
+            chunks.append(self._silence * silent_frames)
+            self._add(silent_frames, len(chunks[-1]))
+        elif not self._frames:
+            self._encoder_delay = delay
+
+        self._seek_points.append((self._samples, self._bytes))
+        chunks.append(audio_data[info.audio_start : info.audio_end])
+        self._add(info.frames, len(chunks[-1]))
+        self._encoder_padding = padding
+
+        await asyncio.to_thread(self._output().writelines, chunks)
+
+    async def close(self) -> str:
+        """Write the final Xing header and close the output file."""
+        if self._file is None:
+            raise ValueError("No audio segments to compile")
+
+        total_bytes = self._header_size + self._bytes
+        toc = build_toc(
+            [
+                (sample, self._header_size + offset)
+                for sample, offset in self._seek_points
+            ],
+            self._samples,
+            total_bytes,
+        )
+        header = xing_frame(
+            self._sample_rate,
+            self._channels,
+            frames=self._frames,
+            total_bytes=total_bytes,
+            toc=toc,
+            lame=self._lame,
+            encoder_delay=self._encoder_delay,
+            encoder_padding=self._encoder_padding,
+        )
+        await asyncio.to_thread(self._finish, header)
+
+        return str(self.output_path)
+
+    async def abort(self) -> None:
+        """Close and remove the partial output."""
+        if self._file is not None and not self._file.closed:
+            self._file.close()
+        self.output_path.unlink(missing_ok=True)
+
+    def _compatible(self, audio_data: bytes, info: MP3Info) -> bool:
+        """Whether a clip's frames can be copied into the stream as they are."""
+        first_frame = parse_frame_header(audio_data, info.audio_start)
+        if first_frame is None or first_frame.layer != 3:
+            return False
+        if self._file is None:
+            return True
+        return (info.sample_rate, info.channels) == (self._sample_rate, self._channels)
+
+    def _open(self, audio_data: bytes, info: MP3Info) -> None:
+        """Take the stream layout from the first segment and reserve the header."""
+        first_frame = parse_frame_header(audio_data, info.audio_start)
+        if first_frame is None:
+            raise MP3FormatError(f"No frame header at byte {info.audio_start}")
+        self._sample_rate = info.sample_rate
+        self._channels = info.channels
+        self._bitrate = first_frame.bitrate
+        self._silence = silence_frame(self._sample_rate, self._channels)
+        self._lame = info.xing.lame if info.xing else None
+
+        placeholder = xing_frame(self._sample_rate, self._channels, lame=self._lame)
+        self._header_size = len(placeholder)
+
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.output_path, "wb")
+        self._file.write(placeholder)
+
+    def _add(self, frames: int, size: int) -> None:
+        self._frames += frames
+        self._samples += frames * samples_per_frame(self._sample_rate)
+        self._bytes += size
+
+    def _output(self) -> io.BufferedWriter:
+        if self._file is None:
+            raise RuntimeError("Output file is not open")
+        return self._file
+
+    def _finish(self, header: bytes) -> None:
+        output = self._output()
+        output.seek(0)
+        output.write(header)
+        output.close()
+
+
+class FrameConcatAudioCompiler(BasicAudioCompiler):
+    """Compiler that joins MP3 segments at the frame level.
+
+    Nothing is decoded or re-encoded, so compiling a long book costs little
+    more than copying its audio to disk. Formats other than MP3 fall back
+    to the basic compiler.
+    """
+
+    async def compile_audio(
+        self, segments: list[AudioSegment], output_path: str, **kwargs: Any
+    ) -> str:
+        """Concatenate MP3 segments into a single output file."""
+        if kwargs.get("format", "mp3") != "mp3":
+            return await super().compile_audio(segments, output_path, **kwargs)
+        if not segments:
+            raise ValueError("No audio segments to compile")
+
+        writer = self.open_stream(output_path, **kwargs)
+        try:
+            for segment in segments:
+                await writer.write(segment)
+            return await writer.close()
+        except BaseException:
+            await writer.abort()
+            raise
+
+    def open_stream(self, output_path: str, **kwargs: Any) -> AudioStreamWriter:
+        """Open a writer that appends MP3 frames as segments arrive."""
+        if kwargs.get("format", "mp3") != "mp3":
+            return super().open_stream(output_path, **kwargs)
+        return FrameConcatStreamWriter(
+            output_path, silence_duration_ms=self.silence_duration_ms
+        )
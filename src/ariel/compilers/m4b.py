@@ -0,0 +1,260 @@
+"""M4B audiobook writer that streams AAC frames to disk."""
+
+import asyncio
+import os
+import shutil
+import tempfile
+from array import array
+from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+from pydub.utils import get_encoder_name
+
+from ..audio.mp4 import (
+    AdtsParser,
+    Chapter,
+    chapter_samples,
+    ftyp,
+    mdat_header,
+    moov,
+)
+from ..core.interfaces import AudioStreamWriter
+from ..models import AudioSegment
+from .basic import _decode_pcm
+from .chapters import segment_chapter_title
+from .pcm import _layout
+
+# Bytes read from the encoder per call
+_READ_CHUNK_BYTES = 1 << 16
+
+
+class M4BStreamWriter(AudioStreamWriter):
+    """Stream writer that produces a chaptered M4B audiobook.
+
+    Decoded PCM is piped into ffmpeg's AAC encoder, whose ADTS output is split
+    into raw frames and appended to a temporary media file as it arrives, so
+    only frame sizes are kept in memory. Chapters start at segments carrying
+    a ``chapter_title`` or opening with a chapter heading; their start times
+    come from the PCM written so far. On close the ``moov`` atom is built
+    and written ahead of the media data, so players can seek right away.
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        silence_duration_ms: int = 500,
+        bitrate: str = "64k",
+        sample_rate: int | None = None,
+        channels: int | None = None,
+    ) -> None:
+        self.output_path = Path(output_path)
+        self.silence_duration_ms = silence_duration_ms
+        self.bitrate = bitrate
+        self.sample_rate = sample_rate
+        self.channels = channels
+
+        self._process: asyncio.subprocess.Process | None = None
+        self._reader: asyncio.Task[None] | None = None
+        self._parser = AdtsParser()
+        self._media: BinaryIO | None = None
+        self._media_path: Path | None = None
+        self._sample_sizes = array("I")
+
+        self._frames = 0  # PCM samples per channel written so far
+        self._chapters: list[tuple[int, str]] = []  # (start sample, title)
+
+    async def write(self, segment: AudioSegment) -> None:
+        """Decode a segment, feed it to the encoder and note chapter starts."""
+        audio_data = segment.audio
+        if self._process is None:
+            if not (self.sample_rate and self.channels):
+                sample_rate, channels = await asyncio.to_thread(
+                    _layout, audio_data, segment.audio_format
+                )
+                self.sample_rate = self.sample_rate or sample_rate
+                self.channels = self.channels or channels
+            await self._start_encoder()
+        process = self._encoder()
+        assert process.stdin is not None
+        sample_rate, channels = self._output_layout()
+
+        audio = await asyncio.to_thread(
+            _decode_pcm,
+            audio_data,
+            sample_rate,
+            channels,
+            segment.audio_format,
+        )
+
+        pcm = audio.raw_data
+        if self._frames and not segment.continues_previous:
+            silence_frames = sample_rate * self.silence_duration_ms // 1000
+            pcm = b"\x00" * (silence_frames * channels * 2) + pcm
+            self._frames += silence_frames
+
+        title = segment_chapter_title(segment)
+        if title:
+            if self._chapters and self._chapters[-1][0] == self._frames:
+                self._chapters.pop()
+            self._chapters.append((self._frames, title))
+        self._frames += len(audio.raw_data) // (channels * 2)
+
+        process.stdin.write(pcm)
+        # Back-pressure: wait for ffmpeg to consume the data
+        await process.stdin.drain()
+
+    async def close(self) -> str:
+        """Flush the encoder and assemble the M4B file."""
+        if self._process is None or self._reader is None:
+            raise ValueError("No audio segments to compile")
+
+        process = self._process
+        assert process.stdin is not None and process.stderr is not None
+        process.stdin.close()
+        await self._reader
+        stderr = await process.stderr.read()
+        if await process.wait() != 0:
+            raise RuntimeError(f"Encoding failed: {stderr.decode(errors='replace')}")
+        self._parser.finish()
+
+        try:
+            await asyncio.to_thread(self._assemble)
+        except BaseException:
+            self.output_path.unlink(missing_ok=True)
+            raise
+        finally:
+            self._discard_media()
+
+        return str(self.output_path)
+
+    async def abort(self) -> None:
+        """Stop the encoder and remove partial output."""
+        if self._process is not None and self._process.returncode is None:
+            self._process.kill()
+            await self._process.wait()
+        if self._reader is not None:
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
+        self._discard_media()
+        self.output_path.unlink(missing_ok=True)
+
+    def _encoder(self) -> asyncio.subprocess.Process:
+        if self._process is None:
+            raise RuntimeError("Encoder is not running")
+        return self._process
+
+    def _output_layout(self) -> tuple[int, int]:
+        """(sample rate, channels), known once the first segment is written."""
+        if not (self.sample_rate and self.channels):
+            raise RuntimeError("Output layout is not known yet")
+        return self.sample_rate, self.channels
+
+    async def _start_encoder(self) -> None:
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        # Next to the output, so the final copy stays on one filesystem
+        fd, media_path = tempfile.mkstemp(
+            prefix=f".{self.output_path.stem}-",
+            suffix=".aac",
+            dir=self.output_path.parent,
+        )
+        self._media_path = Path(media_path)
+        self._media = os.fdopen(fd, "wb")
+        sample_rate, channels = self._output_layout()
+
+        self._process = await asyncio.create_subprocess_exec(
+            get_encoder_name(),
+            "-loglevel",
+            "error",
+            "-f",
+            "s16le",
+            "-ar",
+            str(sample_rate),
+            "-ac",
+            str(channels),
+            "-i",
+            "pipe:0",
+            "-c:a",
+            "aac",
+            "-b:a",
+            self.bitrate,
+            "-f",
+            "adts",
+            "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        self._reader = asyncio.create_task(
+            self._collect_frames(self._process, self._media)
+        )
+
+    async def _collect_frames(
+        self, process: asyncio.subprocess.Process, media: BinaryIO
+    ) -> None:
+        """Move raw AAC frames from the encoder into the media file."""
+        assert process.stdout is not None
+        while chunk := await process.stdout.read(_READ_CHUNK_BYTES):
+            frames = self._parser.feed(chunk)
+            self._sample_sizes.extend(len(frame) for frame in frames)
+            media.writelines(frames)
+        media.close()
+
+    def _chapter_list(self) -> list[Chapter]:
+        sample_rate, _ = self._output_layout()
+        chapters = [
+            Chapter(start * 1000 // sample_rate, title)
+            for start, title in self._chapters
+        ]
+        if not chapters or chapters[0].start_ms > 0:
+            # Front matter before the first heading is named after the book
+            chapters.insert(0, Chapter(0, self.output_path.stem))
+        return chapters
+
+    def _assemble(self) -> None:
+        """Write ftyp and moov, then copy the media data in after them."""
+        adts_header = self._parser.header
+        if adts_header is None or self._media_path is None:
+            raise RuntimeError("Encoder produced no audio")
+        media_path = self._media_path
+        sample_rate, _ = self._output_layout()
+
+        sample_sizes = np.frombuffer(self._sample_sizes, dtype=np.uint32)
+        chapters = self._chapter_list()
+        text_samples = chapter_samples(chapters)
+        data_size = int(sample_sizes.sum()) + sum(map(len, text_samples))
+        header = ftyp()
+
+        def movie(data_offset: int) -> bytes:
+            return moov(
+                adts_header,
+                sample_sizes,
+                duration_ms=self._frames * 1000 // sample_rate,
+                chapters=chapters,
+                data_offset=data_offset,
+                title=self.output_path.stem,
+            )
+
+        # The moov size only changes if the offsets cross into 64 bits
+        data_offset = 0
+        while True:
+            movie_box = movie(data_offset)
+            offset = len(header) + len(movie_box) + len(mdat_header(data_size))
+            if offset == data_offset:
+                break
+            data_offset = offset
+
+        with open(self.output_path, "wb") as output:
+            output.write(header)
+            output.write(movie_box)
+            output.write(mdat_header(data_size))
+            with open(media_path, "rb") as media:
+                shutil.copyfileobj(media, output, 1 << 20)
+            output.writelines(text_samples)
+
+    def _discard_media(self) -> None:
+        if self._media is not None:
+            self._media.close()
+        if self._media_path is not None:
+            self._media_path.unlink(missing_ok=True)
+            self._media_path = None
@@ -0,0 +1,515 @@
+"""Audio compiler that accumulates decoded PCM in one preallocated buffer."""
+
+import asyncio
+import multiprocessing
+import os
+import subprocess
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import numpy as np
+from pydub.utils import get_encoder_name
+
+from ..audio.mp3 import (
+    MP3FormatError,
+    XingHeader,
+    build_toc,
+    iter_frames,
+    samples_per_frame,
+    scan_mp3,
+    xing_frame,
+)
+from ..core.interfaces import AudioStreamWriter
+from ..models import AudioSegment
+from .basic import FFMPEG_FORMATS, BasicAudioCompiler, _decode_pcm
+
+# Bytes handed to the encoder per write
+_ENCODE_CHUNK_BYTES = 1 << 20
+
+# Frames encoded on either side of a parallel chunk to warm the encoder up,
+# then dropped
+_CONTEXT_FRAMES = 8
+# Bounds on the length of audio encoded by one worker call
+_MIN_CHUNK_SECONDS = 30
+_MAX_CHUNK_SECONDS = 300
+
+
+class PCMBuffer:
+    """Growable int16 sample buffer that moves to a memory-mapped file when large.
+
+    Appends copy each sample exactly once. The buffer grows geometrically when
+    its capacity runs out, so total copying stays linear in the book length.
+    Past ``memmap_threshold`` bytes the samples live in a temporary file
+    instead of RAM.
+    """
+
+    def __init__(self, channels: int, memmap_threshold: int = 512 * 1024**2):
+        self.channels = channels
+        self.memmap_threshold = memmap_threshold
+        self.frames = 0  # samples per channel written so far
+
+        self._data = np.zeros((0, channels), dtype=np.int16)
+        self._temp_path: str | None = None
+
+    @property
+    def capacity(self) -> int:
+        """Samples per channel the buffer can hold without growing."""
+        return len(self._data)
+
+    def reserve(self, frames: int) -> None:
+        """Ensure room for at least ``frames`` samples per channel in total."""
+        if frames <= self.capacity:
+            return
+
+        previous_path = self._temp_path
+        nbytes = frames * self.channels * 2
+        if nbytes <= self.memmap_threshold and previous_path is None:
+            data = np.empty((frames, self.channels), dtype=np.int16)
+        else:
+            fd, self._temp_path = tempfile.mkstemp(prefix="ariel-pcm-", suffix=".raw")
+            os.close(fd)
+            data = np.memmap(
+                self._temp_path,
+                dtype=np.int16,
+                mode="w+",
+                shape=(frames, self.channels),
+            )
+
+        data[: self.frames] = self._data[: self.frames]
+        self._data = data
+        if previous_path is not None:
+            Path(previous_path).unlink(missing_ok=True)
+
+    def append(self, samples: np.ndarray) -> None:
+        """Append interleaved samples shaped (frames, channels)."""
+        self._grow_for(len(samples))
+        self._data[self.frames : self.frames + len(samples)] = samples
+        self.frames += len(samples)
+
+    def append_silence(self, frames: int) -> None:
+        """Append ``frames`` samples of silence per channel."""
+        self._grow_for(frames)
+        self._data[self.frames : self.frames + frames] = 0
+        self.frames += frames
+
+    def view(self) -> memoryview:
+        """Raw little-endian bytes of the samples written so far."""
+        return self._data[: self.frames].data.cast("B")
+
+    def close(self) -> None:
+        """Release the buffer and any backing file."""
+        self._data = np.zeros((0, self.channels), dtype=np.int16)
+        self._release_file()
+
+    def _grow_for(self, frames: int) -> None:
+        needed = self.frames + frames
+        if needed > self.capacity:
+            self.reserve(max(needed, self.capacity * 3 // 2))
+
+    def _release_file(self) -> None:
+        if self._temp_path is not None:
+            Path(self._temp_path).unlink(missing_ok=True)
+            self._temp_path = None
+
+
+def _layout(audio_data: bytes, audio_format: str = "mp3") -> tuple[int, int]:
+    """Read (sample rate, channels) from MP3 headers, decoding if necessary."""
+    if audio_format == "mp3":
+        try:
+            info = scan_mp3(audio_data)
+            return info.sample_rate, info.channels
+        except MP3FormatError:
+            pass
+    audio = _decode_pcm(audio_data, audio_format=audio_format)
+    return audio.frame_rate, audio.channels
+
+
+def _encode_mp3_chunk(
+    pcm: bytes,
+    sample_rate: int,
+    channels: int,
+    skip_frames: int,
+    keep_frames: int | None,
+) -> tuple[bytes, int, XingHeader | None]:
+    """Encode a PCM chunk to MP3 and cut out its frames; runs in a worker process.
+
+    The bit reservoir is disabled so that no frame refers to bytes of the
+    frame before it, which lets frames from separate encoder runs be joined.
+
+    Returns:
+        The kept frames, their count and the encoder's Xing/LAME tag
+    """
+    # A seekable output lets the encoder write its Xing/LAME tag
+    fd, path = tempfile.mkstemp(prefix="ariel-chunk-", suffix=".mp3")
+    os.close(fd)
+    try:
+        result = subprocess.run(
+            [
+                get_encoder_name(),
+                "-y",
+                "-loglevel",
+                "error",
+                "-f",
+                "s16le",
+                "-ar",
+                str(sample_rate),
+                "-ac",
+                str(channels),
+                "-i",
+                "pipe:0",
+                "-c:a",
+                "libmp3lame",
+                "-reservoir",
+                "0",
+                "-f",
+                "mp3",
+                path,
+            ],
+            input=pcm,
+            capture_output=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"Encoding failed: {result.stderr.decode(errors='replace')}"
+            )
+        data = Path(path).read_bytes()
+    finally:
+        Path(path).unlink(missing_ok=True)
+
+    info = scan_mp3(data)
+    frames = list(iter_frames(data, info.audio_start, info.audio_end))
+    stop = None if keep_frames is None else skip_frames + keep_frames
+    kept = frames[skip_frames:stop]
+    if not kept:
+        return b"", 0, info.xing
+    start = kept[0][0]
+    end = kept[-1][0] + kept[-1][1].frame_length
+    return data[start:end], len(kept), info.xing
+
+
+class PCMBufferStreamWriter(AudioStreamWriter):
+    """Stream writer that decodes segments into a PCMBuffer and encodes once.
+
+    Every segment is decoded straight to the canonical sample rate and channel
+    layout, so mixed engines and sample rates combine freely. The first
+    segment sets the layout unless one is given.
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        format_type: str = "mp3",
+        silence_duration_ms: int = 500,
+        sample_rate: int | None = None,
+        channels: int | None = None,
+        expected_ms: int = 0,
+        memmap_threshold: int = 512 * 1024**2,
+        encode_workers: int = 1,
+    ) -> None:
+        self.output_path = Path(output_path)
+        self.format_type = format_type
+        self.silence_duration_ms = silence_duration_ms
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.expected_ms = expected_ms
+        self.memmap_threshold = memmap_threshold
+        self.encode_workers = encode_workers
+
+        self._buffer: PCMBuffer | None = None
+
+    async def write(self, segment: AudioSegment) -> None:
+        """Decode a segment and append it to the buffer."""
+        audio_data = segment.audio
+        if self._buffer is None:
+            if not (self.sample_rate and self.channels):
+                sample_rate, channels = await asyncio.to_thread(
+                    _layout, audio_data, segment.audio_format
+                )
+                self.sample_rate = self.sample_rate or sample_rate
+                self.channels = self.channels or channels
+        sample_rate, channels = self._output_layout()
+        if self._buffer is None:
+            self._buffer = PCMBuffer(channels, self.memmap_threshold)
+            # Small margin for resampling rounding so the estimate rarely grows
+            self._buffer.reserve(self.expected_ms * sample_rate * 101 // 100_000)
+        elif not segment.continues_previous:
+            self._buffer.append_silence(sample_rate * self.silence_duration_ms // 1000)
+
+        audio = await asyncio.to_thread(
+            _decode_pcm,
+            audio_data,
+            sample_rate,
+            channels,
+            segment.audio_format,
+        )
+        samples = np.frombuffer(audio.raw_data, dtype="<i2")
+        self._buffer.append(samples.reshape(-1, channels))
+
+    async def close(self) -> str:
+        """Encode the whole buffer into the output file in one pass."""
+        if self._buffer is None:
+            raise ValueError("No audio segments to compile")
+
+        sample_rate, channels = self._output_layout()
+        pcm = self._buffer.view()
+        min_chunk_bytes = _MIN_CHUNK_SECONDS * sample_rate * channels * 2
+        try:
+            if (
+                self.format_type == "mp3"
+                and self.encode_workers > 1
+                and len(pcm) >= 2 * min_chunk_bytes
+            ):
+                await self._encode_parallel(pcm)
+            else:
+                await self._encode(pcm)
+        finally:
+            self._buffer.close()
+
+        return str(self.output_path)
+
+    async def abort(self) -> None:
+        """Drop the buffered audio."""
+        if self._buffer is not None:
+            self._buffer.close()
+
+    def _output_layout(self) -> tuple[int, int]:
+        """(sample rate, channels), known once the first segment is written."""
+        if not (self.sample_rate and self.channels):
+            raise RuntimeError("Output layout is not known yet")
+        return self.sample_rate, self.channels
+
+    async def _encode(self, pcm: memoryview) -> None:
+        sample_rate, channels = self._output_layout()
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        process = await asyncio.create_subprocess_exec(
+            get_encoder_name(),
+            "-y",
+            "-loglevel",
+            "error",
+            "-f",
+            "s16le",
+            "-ar",
+            str(sample_rate),
+            "-ac",
+            str(channels),
+            "-i",
+            "pipe:0",
+            "-f",
+            FFMPEG_FORMATS.get(self.format_type, self.format_type),
+            str(self.output_path),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        assert process.stdin is not None and process.stderr is not None
+        try:
+            for start in range(0, len(pcm), _ENCODE_CHUNK_BYTES):
+                process.stdin.write(pcm[start : start + _ENCODE_CHUNK_BYTES])
+                await process.stdin.drain()
+            process.stdin.close()
+            stderr = await process.stderr.read()
+            if await process.wait() != 0:
+                raise RuntimeError(
+                    f"Encoding failed: {stderr.decode(errors='replace')}"
+                )
+        except BaseException:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            self.output_path.unlink(missing_ok=True)
+            raise
+
+    def _chunks(self, total: int) -> list[tuple[int, int, int | None]]:
+        """Split ``total`` samples into (start, end, frames to keep) work items.
+
+        Chunk boundaries fall on MP3 frame boundaries. Each chunk is encoded
+        with a few frames of context on both sides, so the frames kept from
+        it line up with the ones a single encoder would have produced.
+        """
+        sample_rate, _ = self._output_layout()
+        frame_samples = samples_per_frame(sample_rate)
+        chunk = total // self.encode_workers + 1
+        chunk = max(chunk, _MIN_CHUNK_SECONDS * sample_rate)
+        chunk = min(chunk, _MAX_CHUNK_SECONDS * sample_rate)
+        chunk = -(-chunk // frame_samples) * frame_samples
+        context = _CONTEXT_FRAMES * frame_samples
+
+        items: list[tuple[int, int, int | None]] = []
+        for start in range(0, total, chunk):
+            end = start + chunk
+            if end >= total:
+                # The last chunk keeps everything, including the encoder flush
+                items.append((max(0, start - context), total, None))
+            else:
+                items.append(
+                    (max(0, start - context), end + context, chunk // frame_samples)
+                )
+        return items
+
+    async def _encode_parallel(self, pcm: memoryview) -> None:
+        """Encode MP3 chunks in worker processes and join their frames.
+
+        Frames are written out in order as chunks finish, behind a Xing
+        header placeholder that is filled in once the totals are known.
+        """
+        sample_rate, channels = self._output_layout()
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        frame_samples = samples_per_frame(sample_rate)
+        sample_bytes = channels * 2
+        total = len(pcm) // sample_bytes
+
+        executor = ProcessPoolExecutor(
+            self.encode_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        loop = asyncio.get_running_loop()
+        pending: deque[asyncio.Future] = deque()
+        output: BinaryIO | None = None
+        header_size = frames = size = 0
+        lame: bytes | None = None
+        delay = 0
+        seek_points: list[tuple[int, int]] = []
+
+        async def collect(future: asyncio.Future) -> None:
+            nonlocal output, header_size, frames, size, lame, delay
+            data, count, xing = await future
+            if output is None:
+                # The first chunk's encoder tag describes the joined stream
+                lame = xing.lame if xing else None
+                delay = xing.encoder_delay if xing else 0
+                placeholder = xing_frame(sample_rate, channels, lame=lame)
+                header_size = len(placeholder)
+                output = open(self.output_path, "wb")
+                await asyncio.to_thread(output.write, placeholder)
+            seek_points.append((frames * frame_samples, header_size + size))
+            await asyncio.to_thread(output.write, data)
+            frames += count
+            size += len(data)
+
+        try:
+            # Only a window of chunks is copied out of the buffer at a time
+            for start, end, keep in self._chunks(total):
+                if len(pending) > self.encode_workers:
+                    await collect(pending.popleft())
+                pending.append(
+                    loop.run_in_executor(
+                        executor,
+                        _encode_mp3_chunk,
+                        bytes(pcm[start * sample_bytes : end * sample_bytes]),
+                        sample_rate,
+                        channels,
+                        _CONTEXT_FRAMES if start else 0,
+                        keep,
+                    )
+                )
+            while pending:
+                await collect(pending.popleft())
+            if output is None:
+                raise RuntimeError("Encoder produced no audio")
+
+            total_bytes = header_size + size
+            header = xing_frame(
+                sample_rate,
+                channels,
+                frames=frames,
+                total_bytes=total_bytes,
+                toc=build_toc(seek_points, frames * frame_samples, total_bytes),
+                lame=lame,
+                encoder_delay=delay,
+                encoder_padding=max(0, frames * frame_samples - delay - total),
+            )
+            output.seek(0)
+            await asyncio.to_thread(output.write, header)
+            output.close()
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            if output is not None:
+                output.close()
+            self.output_path.unlink(missing_ok=True)
+            raise
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class PCMBufferAudioCompiler(BasicAudioCompiler):
+    """Compiler that decodes into one preallocated PCM buffer and encodes once.
+
+    Unlike the basic compiler, appending a segment never copies what is
+    already there, so time and memory grow linearly with book length. Very
+    long books are buffered in a memory-mapped temporary file. MP3 output
+    of more than a minute is encoded in frame-aligned chunks across
+    ``encode_workers`` processes and joined into one stream.
+    """
+
+    def __init__(
+        self,
+        silence_duration_ms: int = 500,
+        sample_rate: int | None = None,
+        channels: int | None = None,
+        memmap_threshold_mb: int = 512,
+        encode_workers: int | None = None,
+    ) -> None:
+        """Initialize compiler.
+
+        Args:
+            silence_duration_ms: Pause inserted between segments
+            sample_rate: Output sample rate; defaults to the first segment's
+            channels: Output channel count; defaults to the first segment's
+            memmap_threshold_mb: Buffer size above which PCM is kept on disk
+            encode_workers: Processes encoding MP3 chunks in parallel; defaults
+                to the number of CPUs, 1 encodes in a single pass
+        """
+        super().__init__(silence_duration_ms)
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.memmap_threshold = memmap_threshold_mb * 1024 * 1024
+        self.encode_workers = encode_workers or os.cpu_count() or 1
+
+    async def compile_audio(
+        self, segments: list[AudioSegment], output_path: str, **kwargs: Any
+    ) -> str:
+        """Compile audio segments into a single output file."""
+        if not segments:
+            raise ValueError("No audio segments to compile")
+
+        # Size the buffer up front from the known segment durations
+        expected_ms = sum(segment.duration_ms for segment in segments)
+        expected_ms += self.silence_duration_ms * sum(
+            not segment.continues_previous for segment in segments[1:]
+        )
+
+        writer = self.open_stream(output_path, expected_ms=expected_ms, **kwargs)
+        try:
+            for segment in segments:
+                await writer.write(segment)
+            return await writer.close()
+        except BaseException:
+            await writer.abort()
+            raise
+
+    def open_stream(self, output_path: str, **kwargs: Any) -> AudioStreamWriter:
+        """Open a writer that buffers decoded segments and encodes on close."""
+        if kwargs.get("format") == "m4b":
+            # Only the M4B writer adds chapter atoms; ffmpeg alone would not
+            from .m4b import M4BStreamWriter
+
+            return M4BStreamWriter(
+                output_path,
+                silence_duration_ms=self.silence_duration_ms,
+                bitrate=self.bitrate,
+                sample_rate=self.sample_rate,
+                channels=self.channels,
+            )
+        return PCMBufferStreamWriter(
+            output_path,
+            format_type=kwargs.get("format", "mp3"),
+            silence_duration_ms=self.silence_duration_ms,
+            sample_rate=self.sample_rate,
+            channels=self.channels,
+            expected_ms=kwargs.get("expected_ms", 0),
+            memmap_threshold=self.memmap_threshold,
+            encode_workers=self.encode_workers,
+        )
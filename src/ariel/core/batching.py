@@ -0,0 +1,253 @@
+"""Grouping of text segments into engine-sized synthesis requests."""
+
+import asyncio
+import hashlib
+import re
+import unicodedata
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from typing import TypeVar
+
+from ..models import SegmentView, SynthesisBatch
+
+T = TypeVar("T")
+
+# Separator used when joining consecutive segments of the same speaker
+BATCH_SEPARATOR = " "
+
+# Preferred places to cut oversized text, from best to worst. The captured
+# group is the whitespace that is dropped at the cut.
+_CLOSERS = "\"'\u201d\u2019)\\]"
+_SPLIT_BOUNDARIES = [
+    re.compile(rf"[.!?\u2026]+[{_CLOSERS}]*(\s+)"),  # sentences
+    re.compile(rf"[,;:\u2014\u2013]+[{_CLOSERS}]*(\s+)"),  # clauses
+    re.compile(r"(\s+)"),  # words
+]
+
+
+def plan_batches(
+    segments: Iterable[SegmentView],
+    voice_ids: list[str],
+    max_chars: int,
+    coalesce: bool = True,
+) -> list[SynthesisBatch]:
+    """Group segments into synthesis requests of at most ``max_chars``.
+
+    With ``coalesce`` set, consecutive segments with the same speaker and voice
+    are merged while the joined text stays within the budget. Segments longer
+    than the budget are cut at sentence or clause boundaries into several
+    batches; every piece after the first is marked as continuing the previous
+    one so the compiler rejoins them without a pause. A segment that starts a
+    chapter always starts a new batch.
+
+    Args:
+        segments: Parsed text segments or table rows, in reading order
+        voice_ids: Voice assigned to each segment
+        max_chars: Character budget per synthesis request
+        coalesce: Whether to merge adjacent same-speaker segments
+
+    Returns:
+        Synthesis batches in reading order
+    """
+    batches: list[SynthesisBatch] = []
+    current: SynthesisBatch | None = None
+    current_texts: list[str] = []
+    current_length = 0
+
+    for index, (segment, voice_id) in enumerate(zip(segments, voice_ids)):
+        length = len(segment.text)
+
+        if length > max_chars:
+            pieces = split_text(segment.text, max_chars)
+            for number, piece in enumerate(pieces):
+                batches.append(
+                    SynthesisBatch(
+                        text=piece,
+                        voice_id=voice_id,
+                        speaker_type=segment.speaker_type,
+                        speaker_name=segment.speaker_name,
+                        source_segments=[index] if number == 0 else [],
+                        source_lengths=[length] if number == 0 else [],
+                        continues_previous=number > 0,
+                        chapter_title=segment.chapter_title if number == 0 else None,
+                    )
+                )
+            current = None
+            continue
+
+        if (
+            coalesce
+            and current is not None
+            and segment.chapter_title is None
+            and current.voice_id == voice_id
+            and current.speaker_name == segment.speaker_name
+            and current.speaker_type == segment.speaker_type
+            and current_length + len(BATCH_SEPARATOR) + length <= max_chars
+        ):
+            current.source_segments.append(index)
+            current.source_lengths.append(length)
+            current_texts.append(segment.text)
+            current.text = BATCH_SEPARATOR.join(current_texts)
+            current_length += len(BATCH_SEPARATOR) + length
+            continue
+
+        current = SynthesisBatch(
+            text=segment.text,
+            voice_id=voice_id,
+            speaker_type=segment.speaker_type,
+            speaker_name=segment.speaker_name,
+            source_segments=[index],
+            source_lengths=[length],
+            chapter_title=segment.chapter_title,
+        )
+        current_texts = [segment.text]
+        current_length = length
+        batches.append(current)
+
+    return batches
+
+
+def split_text(text: str, max_chars: int) -> list[str]:
+    """Cut text into pieces of at most ``max_chars`` at natural boundaries.
+
+    Sentences are packed greedily into pieces. A sentence that is too long on
+    its own is cut at clause boundaries, then between words, and only as a
+    last resort in the middle of a word.
+    """
+    if len(text) <= max_chars:
+        return [text]
+
+    pieces: list[str] = []
+    current = ""
+    for unit in _split_units(text, max_chars, 0):
+        if current and len(current) + len(BATCH_SEPARATOR) + len(unit) > max_chars:
+            pieces.append(current)
+            current = unit
+        else:
+            current = f"{current}{BATCH_SEPARATOR}{unit}" if current else unit
+    if current:
+        pieces.append(current)
+
+    return pieces
+
+
+def _split_units(text: str, max_chars: int, level: int) -> Iterator[str]:
+    """Yield parts of ``text`` no longer than ``max_chars``."""
+    if len(text) <= max_chars:
+        yield text
+        return
+
+    if level == len(_SPLIT_BOUNDARIES):
+        for start in range(0, len(text), max_chars):
+            yield text[start : start + max_chars]
+        return
+
+    start = 0
+    for match in _SPLIT_BOUNDARIES[level].finditer(text):
+        part = text[start : match.start(1)]
+        if part:
+            yield from _split_units(part, max_chars, level + 1)
+        start = match.end(1)
+    if text[start:]:
+        yield from _split_units(text[start:], max_chars, level + 1)
+
+
+def source_offsets_ms(batch: SynthesisBatch, duration_ms: int) -> list[int]:
+    """Estimate where each source segment starts within the batch audio.
+
+    Speech duration is roughly proportional to text length, so offsets are
+    interpolated from the character position of each segment.
+    """
+    total_chars = sum(batch.source_lengths) + len(BATCH_SEPARATOR) * (
+        len(batch.source_lengths) - 1
+    )
+    if total_chars <= 0:
+        return [0] * len(batch.source_lengths)
+
+    offsets = []
+    position = 0
+    for length in batch.source_lengths:
+        offsets.append(duration_ms * position // total_chars)
+        position += length + len(BATCH_SEPARATOR)
+    return offsets
+
+
+def normalize_utterance(text: str) -> str:
+    """Normalize text for detecting repeated utterances.
+
+    Unicode compatibility forms and whitespace are folded; case and
+    punctuation are kept because they change how a line is spoken.
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def utterance_key(batch: SynthesisBatch) -> tuple[str, bytes]:
+    """Key that identical utterances of a batch share: (voice, text digest)."""
+    text = normalize_utterance(batch.text).encode("utf-8")
+    return batch.voice_id, hashlib.blake2b(text, digest_size=16).digest()
+
+
+class UtteranceIndex:
+    """Shares synthesized audio between identical utterances of a book.
+
+    Every batch is keyed on its voice and a digest of its normalized text.
+    The first batch with a given key synthesizes it; later ones await the
+    same result. Audio is kept only until the last occurrence of its key has
+    been served.
+    """
+
+    def __init__(self, keys: list[tuple[str, bytes]]):
+        self.keys = keys
+        self._remaining = Counter(self.keys)
+        self._results: dict[tuple[str, bytes], asyncio.Future] = {}
+
+        self.total = len(self.keys)
+        self.unique = len(self._remaining)
+
+    @classmethod
+    def from_batches(cls, batches: Iterable[SynthesisBatch]) -> "UtteranceIndex":
+        """Index the utterances of planned synthesis batches."""
+        return cls([utterance_key(batch) for batch in batches])
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Number of requests before and after deduplication."""
+        return {
+            "requests": self.total,
+            "unique": self.unique,
+            "duplicates": self.total - self.unique,
+        }
+
+    async def share(self, index: int, generate: Callable[[], Awaitable[T]]) -> T:
+        """Return the audio for batch ``index``, generating it at most once."""
+        key = self.keys[index]
+        future = self._results.get(key)
+
+        try:
+            if future is not None:
+                return await asyncio.shield(future)
+
+            future = asyncio.get_running_loop().create_future()
+            self._results[key] = future
+            try:
+                result = await generate()
+            except BaseException as e:
+                # Let later occurrences try again instead of inheriting the error
+                del self._results[key]
+                if isinstance(e, Exception):
+                    future.set_exception(e)
+                    future.exception()  # Mark as retrieved if nobody is waiting
+                else:
+                    future.cancel()
+                raise
+            future.set_result(result)
+            return result
+        finally:
+            self.release(index)
+
+    def release(self, index: int) -> None:
+        """Mark batch ``index`` as served without going through ``share``."""
+        key = self.keys[index]
+        self._remaining[key] -= 1
+        if self._remaining[key] <= 0:
+            self._results.pop(key, None)
@@ -18,6 +18,9 @@ class ArielConfig(BaseSettings):
     analyzer_type: str = "basic"
     voice_generator_type: str = "edge-tts"
     compiler_type: str = "basic"
+    compiler_options: dict[str, Any] = {}
+    analyzer_options: dict[str, Any] = {}
+    generator_options: dict[str, Any] = {}
 
     # Output settings
     output_format: str = "mp3"
@@ -29,8 +32,24 @@ class ArielConfig(BaseSettings):
 
     # Processing settings
     max_concurrent_generations: int = 5
+    coalesce_segments: bool = True
+    deduplicate_utterances: bool = True
+    max_batch_chars: int | None = None  # defaults to the engine's input limit
+    # (also the size long segments are split to for parallel synthesis)
+    parse_workers: int | None = 1  # processes for parsing large texts; None = CPUs
     audio_quality: str = "standard"  # low, standard, high
 
+    # Remote engine throttling; unset values use the engine's defaults
+    rate_limit_enabled: bool = True
+    requests_per_second: float | None = None
+    max_retries: int | None = None
+
+    # Synthesized audio cache settings
+    cache_enabled: bool = True
+    cache_dir: str | None = None
+    cache_max_size_mb: int = 2048
+    cache_memory_items: int = 256
+
     # API settings for TTS engines
     openai_api_key: str | None = None
     elevenlabs_api_key: str | None = None
@@ -65,13 +84,31 @@ class ConfigManager:
             file_config = self._load_config_file(self.config_file)
             config_data.update(file_config)
 
+        # Processing settings may be nested as in the config template
+        config_data.update(config_data.get("processing_settings") or {})
+
         # Create ProcessingConfig
         processing_config = ProcessingConfig(
             parser_type=config_data.get("parser_type", "basic"),
             analyzer_type=config_data.get("analyzer_type", "basic"),
             voice_generator_type=config_data.get("voice_generator_type", "edge-tts"),
             compiler_type=config_data.get("compiler_type", "basic"),
+            compiler_options=config_data.get("compiler_options") or {},
+            analyzer_options=config_data.get("analyzer_options") or {},
+            generator_options=config_data.get("generator_options") or {},
             output_format=config_data.get("output_format", "mp3"),
+            max_concurrent_generations=config_data.get("max_concurrent_generations", 5),
+            coalesce_segments=config_data.get("coalesce_segments", True),
+            deduplicate_utterances=config_data.get("deduplicate_utterances", True),
+            max_batch_chars=config_data.get("max_batch_chars"),
+            parse_workers=config_data.get("parse_workers", 1),
+            rate_limit_enabled=config_data.get("rate_limit_enabled", True),
+            requests_per_second=config_data.get("requests_per_second"),
+            max_retries=config_data.get("max_retries"),
+            cache_enabled=config_data.get("cache_enabled", True),
+            cache_dir=config_data.get("cache_dir"),
+            cache_max_size_mb=config_data.get("cache_max_size_mb", 2048),
+            cache_memory_items=config_data.get("cache_memory_items", 256),
             voice_mappings=self._parse_voice_mappings(
                 config_data.get("voice_mappings", {})
             ),
@@ -156,8 +193,17 @@ class ConfigManager:
             "parser_type": "basic",  # basic, advanced, llm
             "analyzer_type": "basic",  # basic, statistical, llm
             "voice_generator_type": "edge-tts",  # edge-tts, openai, coqui
-            "compiler_type": "basic",  # basic, chapter-aware
-            "output_format": "mp3",  # mp3, wav, m4a
+            "compiler_type": "basic",  # basic, mp3-concat, pcm, chapter-aware
+            # e.g. for chapter-aware: {"max_part_minutes": 60, "part_compiler": "pcm"}
+            # or for pcm: {"encode_workers": 8}
+            "compiler_options": {},
+            # e.g. for statistical: {"sketch": True} to profile characters in
+            # constant memory, with estimated vocabulary sizes
+            "analyzer_options": {},
+            # e.g. for openai: {"response_format": "pcm"} to skip decoding MP3
+            # when compiling (also "opus" or "aac")
+            "generator_options": {},
+            "output_format": "mp3",  # mp3, wav, m4a, m4b (chaptered audiobook)
             "voice_mappings": {
                 "narrator": {
                     "voice_id": "en-US-AriaNeural",
@@ -172,7 +218,13 @@ class ConfigManager:
             },
             "processing_settings": {
                 "max_concurrent_generations": 5,
+                "coalesce_segments": True,
+                "deduplicate_utterances": True,
+                "parse_workers": 1,  # >1 parses large texts in a process pool
+                "rate_limit_enabled": True,
                 "audio_quality": "standard",
+                "cache_enabled": True,
+                "cache_max_size_mb": 2048,
             },
         }
 
@@ -48,8 +48,14 @@ class ComponentFactory:
 
         # Audio Compilers
         from ..compilers.basic import BasicAudioCompiler
+        from ..compilers.chapters import ChapterAwareAudioCompiler
+        from ..compilers.frames import FrameConcatAudioCompiler
+        from ..compilers.pcm import PCMBufferAudioCompiler
 
         self.register_compiler("basic", BasicAudioCompiler)
+        self.register_compiler("mp3-concat", FrameConcatAudioCompiler)
+        self.register_compiler("pcm", PCMBufferAudioCompiler)
+        self.register_compiler("chapter-aware", ChapterAwareAudioCompiler)
 
     def register_parser(self, name: str, parser_class: type[TextParser]):
         """Register a text parser implementation."""
@@ -103,7 +109,8 @@ class ComponentFactory:
         if generator_type == "openai":
             # Pass OpenAI API key from environment or kwargs
             api_key = kwargs.get("api_key") or os.getenv("ARIEL_OPENAI_API_KEY") or os.getenv("OPENAI_API_KEY")
-            return generator_class(api_key=api_key)
+            options = {key: value for key, value in kwargs.items() if key != "api_key"}
+            return generator_class(api_key=api_key, **options)
         elif generator_type == "coqui":
             # Pass Coqui model configuration
             model_name = kwargs.get("model_name") or os.getenv("ARIEL_COQUI_MODEL_NAME")
@@ -1,9 +1,14 @@
 """Abstract base classes for Ariel components."""
 
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Iterable
 from typing import Any
 
-from ..models import AudioSegment, TextSegment
+from ..models import AnalysisStats, AudioSegment, SegmentView, TextSegment
+from .table import SegmentTable
+
+# Characters gathered before a stream parser looks for a place to cut
+STREAM_BLOCK_CHARS = 1 << 20
 
 
 class TextParser(ABC):
@@ -21,6 +26,40 @@ class TextParser(ABC):
         """
         pass
 
+    async def parse_table(self, text: str) -> SegmentTable:
+        """Parse text into a compact segment table.
+
+        Parsers that can record segments as offsets into ``text`` override
+        this; the default builds the table from ``parse``.
+
+        Args:
+            text: Raw input text
+
+        Returns:
+            Segment table with speaker attribution
+        """
+        return SegmentTable.from_segments(await self.parse(text))
+
+    async def parse_stream(
+        self, chunks: Iterable[str], block_chars: int = STREAM_BLOCK_CHARS
+    ) -> AsyncIterator[SegmentTable]:
+        """Parse text arriving in chunks, yielding tables as blocks complete.
+
+        Each table holds the segments of a block of roughly ``block_chars``
+        characters, cut where the parser's state starts over, so the rows of
+        all tables match a ``parse_table`` of the whole text. Parsers that
+        can cut their input override this; the default joins the chunks and
+        parses them at once.
+
+        Args:
+            chunks: Consecutive pieces of the input text
+            block_chars: Characters to gather before cutting a block
+
+        Yields:
+            Segment tables in reading order
+        """
+        yield await self.parse_table("".join(chunks))
+
 
 class Character:
     """Represents a character with voice characteristics."""
@@ -41,14 +80,52 @@ class Character:
 
 
 class CharacterAnalyzer(ABC):
-    """Abstract base class for character analyzers."""
+    """Abstract base class for character analyzers.
 
-    @abstractmethod
-    async def analyze(self, segments: list[TextSegment]) -> list[Character]:
+    Analysis is incremental: segments are folded into ``AnalysisStats`` as
+    they arrive, statistics of separately analyzed parts can be merged, and
+    characters are built from the statistics at the end.
+    """
+
+    async def analyze(self, segments: Iterable[SegmentView]) -> list[Character]:
         """Analyze segments to identify unique characters.
 
         Args:
-            segments: Parsed text segments
+            segments: Parsed text segments, or the rows of a segment table
+
+        Returns:
+            List of identified characters with their characteristics
+        """
+        stats = AnalysisStats()
+        self.update(stats, segments)
+        return self.finalize(stats)
+
+    @abstractmethod
+    def update(self, stats: AnalysisStats, segments: Iterable[SegmentView]) -> None:
+        """Fold segments into running statistics.
+
+        Args:
+            stats: Statistics of the input so far, updated in place
+            segments: The next segments, or rows of a segment table
+        """
+        pass
+
+    @abstractmethod
+    def merge(self, stats: AnalysisStats, other: AnalysisStats) -> None:
+        """Combine the statistics of two consecutive parts of the input.
+
+        Args:
+            stats: Statistics of the earlier part, updated in place
+            other: Statistics of the part that follows it
+        """
+        pass
+
+    @abstractmethod
+    def finalize(self, stats: AnalysisStats) -> list[Character]:
+        """Build characters from statistics of the whole input.
+
+        Args:
+            stats: Statistics gathered by ``update`` and ``merge``
 
         Returns:
             List of identified characters with their characteristics
@@ -59,6 +136,11 @@ class CharacterAnalyzer(ABC):
 class VoiceGenerator(ABC):
     """Abstract base class for voice generators."""
 
+    # Longest text the engine handles well in a single request
+    max_input_chars: int = 2000
+    # Encoding of the returned audio, one of ariel.audio.formats.AUDIO_FORMATS
+    audio_format: str = "mp3"
+
     @abstractmethod
     async def generate_audio(
         self,
@@ -78,6 +160,35 @@ class VoiceGenerator(ABC):
         """
         pass
 
+    async def stream_audio(
+        self,
+        text: str,
+        voice_id: str,
+        voice_characteristics: dict[str, Any] | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Generate audio, yielding encoded chunks as they arrive.
+
+        Engines that receive audio incrementally override this; the default
+        yields the result of ``generate_audio`` in one piece. The pipeline
+        does not use it: the cache, retries and segment store all need whole
+        clips. It is for callers that play or forward audio as it arrives.
+
+        Args:
+            text: Text to convert to speech
+            voice_id: Identifier for the voice to use
+            voice_characteristics: Additional voice parameters
+
+        Yields:
+            Consecutive pieces of the encoded audio
+        """
+        yield await self.generate_audio(text, voice_id, voice_characteristics)
+
+    async def close(self) -> None:
+        """Release pooled connections and other resources.
+
+        Engines that keep nothing open between requests leave this as is.
+        """
+
     @abstractmethod
     async def list_voices(self) -> list[dict[str, Any]]:
         """List available voices.
@@ -88,12 +199,67 @@ class VoiceGenerator(ABC):
         pass
 
 
+class AudioStreamWriter(ABC):
+    """Abstract base class for incremental audio output writers."""
+
+    @abstractmethod
+    async def write(self, segment: AudioSegment) -> None:
+        """Append the next audio segment to the output.
+
+        Args:
+            segment: Audio segment, in final playback order
+        """
+        pass
+
+    @abstractmethod
+    async def close(self) -> str:
+        """Finish the output file.
+
+        Returns:
+            Path to the generated audio file
+        """
+        pass
+
+    async def abort(self) -> None:
+        """Discard a partially written output."""
+        pass
+
+
+class BufferedStreamWriter(AudioStreamWriter):
+    """Stream writer that collects segments and compiles them on close.
+
+    Used for compilers without native streaming support.
+    """
+
+    def __init__(
+        self, compiler: "AudioCompiler", output_path: str, **kwargs: Any
+    ) -> None:
+        self.compiler = compiler
+        self.output_path = output_path
+        self.kwargs = kwargs
+        self.segments: list[AudioSegment] = []
+
+    async def write(self, segment: AudioSegment) -> None:
+        """Buffer the segment until the output is closed."""
+        self.segments.append(segment)
+
+    async def close(self) -> str:
+        """Compile all buffered segments."""
+        return await self.compiler.compile_audio(
+            self.segments, self.output_path, **self.kwargs
+        )
+
+    async def abort(self) -> None:
+        """Drop the buffered segments."""
+        self.segments.clear()
+
+
 class AudioCompiler(ABC):
     """Abstract base class for audio compilers."""
 
     @abstractmethod
     async def compile_audio(
-        self, segments: list[AudioSegment], output_path: str, **kwargs
+        self, segments: list[AudioSegment], output_path: str, **kwargs: Any
     ) -> str:
         """Compile audio segments into final output.
 
@@ -106,3 +272,18 @@ class AudioCompiler(ABC):
             Path to the generated audio file
         """
         pass
+
+    def open_stream(self, output_path: str, **kwargs: Any) -> AudioStreamWriter:
+        """Open a writer that appends segments to the output as they arrive.
+
+        Compilers that can write incrementally override this; the default
+        buffers everything and compiles on close.
+
+        Args:
+            output_path: Path for the output file
+            **kwargs: Additional compilation options
+
+        Returns:
+            Writer accepting segments in playback order
+        """
+        return BufferedStreamWriter(self, output_path, **kwargs)
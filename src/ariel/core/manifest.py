@@ -0,0 +1,171 @@
+"""Persistent job manifest for resumable conversions."""
+
+import hashlib
+import shutil
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any
+
+from ..audio.store import AudioRef, SegmentStore
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+
+def text_hash(text: str) -> str:
+    """Hash segment text for change detection between runs."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class JobManifest:
+    """SQLite-backed record of per-segment synthesis progress.
+
+    The manifest and a segment store holding the synthesized audio live in a
+    job directory next to the output file, so a conversion that dies part
+    way through can pick up where it left off. Finished segments are
+    recorded as references into the store; identical utterances can share
+    one stored clip.
+    """
+
+    def __init__(self, job_dir: str | Path):
+        self.job_dir = Path(job_dir)
+        self.job_dir.mkdir(parents=True, exist_ok=True)
+        self.store = SegmentStore(self.job_dir / "segments.audio")
+
+        # Autocommit so every finished segment survives a crash
+        self._conn = sqlite3.connect(
+            self.job_dir / "manifest.sqlite", isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS segments (
+                idx INTEGER PRIMARY KEY,
+                text_hash TEXT NOT NULL,
+                voice_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                audio_offset INTEGER,
+                audio_length INTEGER,
+                duration_ms INTEGER,
+                error TEXT,
+                updated_at REAL
+            )
+            """
+        )
+
+    @classmethod
+    def for_output(cls, output_file: str | Path) -> "JobManifest":
+        """Open the manifest that belongs to an output file."""
+        output_file = Path(output_file)
+        return cls(output_file.parent / f".{output_file.name}.ariel-job")
+
+    def prepare(self, specs: list[tuple[str, str]], resume: bool = False) -> int:
+        """Register the segments of a run as (text_hash, voice_id) pairs.
+
+        Without ``resume`` all previous progress and stored audio is discarded.
+        With it, finished segments are kept as long as their text and voice
+        are unchanged and their audio is still in the store.
+
+        Returns:
+            Number of segments that are already complete
+        """
+        existing: dict[int, tuple[str, str, str, int]] = {}
+        if resume:
+            for idx, hash_, voice_id, status, offset, length in self._conn.execute(
+                """
+                SELECT idx, text_hash, voice_id, status, audio_offset, audio_length
+                FROM segments
+                """
+            ):
+                end = (offset or 0) + (length or 0)
+                existing[idx] = (hash_, voice_id, status, end)
+        else:
+            self.store.truncate()
+
+        rows = []
+        completed = 0
+        for idx, (hash_, voice_id) in enumerate(specs):
+            previous = existing.get(idx)
+            if (
+                previous
+                and previous[:3] == (hash_, voice_id, DONE)
+                and previous[3] <= self.store.size
+            ):
+                completed += 1
+                continue
+            rows.append((idx, hash_, voice_id, PENDING, time.time()))
+
+        self._conn.execute("BEGIN")
+        self._conn.execute("DELETE FROM segments WHERE idx >= ?", (len(specs),))
+        self._conn.executemany(
+            """
+            INSERT OR REPLACE INTO segments
+                (idx, text_hash, voice_id, status, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+        self._conn.execute("COMMIT")
+
+        return completed
+
+    def completed_segment(self, idx: int) -> tuple[AudioRef, int] | None:
+        """Return (audio_ref, duration_ms) for a finished segment."""
+        row = self._conn.execute(
+            """
+            SELECT audio_offset, audio_length, duration_ms
+            FROM segments WHERE idx = ? AND status = ?
+            """,
+            (idx, DONE),
+        ).fetchone()
+        if not row:
+            return None
+
+        audio_ref = AudioRef(str(self.store.path), row[0], row[1])
+        if not self.store.contains(audio_ref):
+            return None
+        return audio_ref, row[2]
+
+    def store_audio(self, audio_data: bytes) -> AudioRef:
+        """Append synthesized audio to the job's segment store."""
+        return self.store.append(audio_data)
+
+    def mark_done(self, idx: int, audio_ref: AudioRef, duration_ms: int) -> None:
+        """Record a segment as finished with its audio already in the store."""
+        self._conn.execute(
+            """
+            UPDATE segments
+            SET status = ?, audio_offset = ?, audio_length = ?, duration_ms = ?,
+                error = NULL, updated_at = ?
+            WHERE idx = ?
+            """,
+            (DONE, audio_ref.offset, audio_ref.length, duration_ms, time.time(), idx),
+        )
+
+    def mark_failed(self, idx: int, error: str) -> None:
+        """Record a segment whose generation failed."""
+        self._conn.execute(
+            "UPDATE segments SET status = ?, error = ?, updated_at = ? WHERE idx = ?",
+            (FAILED, error, time.time(), idx),
+        )
+
+    def summary(self) -> dict[str, Any]:
+        """Count segments by status."""
+        counts = {PENDING: 0, DONE: 0, FAILED: 0}
+        for status, count in self._conn.execute(
+            "SELECT status, COUNT(*) FROM segments GROUP BY status"
+        ):
+            counts[status] = count
+        return counts
+
+    def close(self) -> None:
+        """Close the underlying database connection and segment store."""
+        self._conn.close()
+        self.store.close()
+
+    def remove(self) -> None:
+        """Close the manifest and delete the job directory."""
+        self.close()
+        shutil.rmtree(self.job_dir, ignore_errors=True)
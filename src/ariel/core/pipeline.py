@@ -1,12 +1,26 @@
 """Enhanced processing pipeline with modular components."""
 
-import io
+import asyncio
+import contextlib
+import functools
+from collections.abc import AsyncIterator, Callable, Iterator
 from pathlib import Path
 from typing import Any
 
-from pydub import AudioSegment as PydubAudioSegment
-
-from ..models import AudioSegment, ProcessingConfig, TextSegment
+from ..audio.formats import audio_duration_ms
+from ..audio.store import AudioRef
+from ..generators.cached import AudioCache, CachedVoiceGenerator
+from ..generators.resilient import ResilientVoiceGenerator
+from ..models import AnalysisStats, AudioSegment, ProcessingConfig, SynthesisBatch
+from ..parsers.blocks import BlockTextParser
+from ..parsers.parallel import PARALLEL_MIN_CHARS, parse_table_parallel
+from ..parsers.stream import read_text_chunks
+from .batching import (
+    UtteranceIndex,
+    plan_batches,
+    source_offsets_ms,
+    utterance_key,
+)
 from .config import ConfigManager
 from .factory import factory
 from .interfaces import (
@@ -16,42 +30,103 @@ from .interfaces import (
     TextParser,
     VoiceGenerator,
 )
+from .manifest import JobManifest, text_hash
+from .table import SegmentTable
 
 
 class ProcessingPipeline:
     """Enhanced processing pipeline with modular components."""
 
+    # Components, set by _initialize_components
+    parser: TextParser
+    analyzer: CharacterAnalyzer
+    generator: VoiceGenerator
+    compiler: AudioCompiler
+
     def __init__(self, config: ProcessingConfig | None = None):
         self.config = config or ProcessingConfig()
         self.config_manager = ConfigManager()
 
         # Initialize components
-        self.parser: TextParser | None = None
-        self.analyzer: CharacterAnalyzer | None = None
-        self.generator: VoiceGenerator | None = None
-        self.compiler: AudioCompiler | None = None
+        self.audio_cache: AudioCache | None = None
+        self.rate_limiter: ResilientVoiceGenerator | None = None
 
         self._initialize_components()
 
-    def _initialize_components(self):
+    def _initialize_components(self) -> None:
         """Initialize pipeline components based on configuration."""
         try:
             self.parser = factory.create_parser(self.config.parser_type)
-            self.analyzer = factory.create_analyzer(self.config.analyzer_type)
-            self.generator = factory.create_generator(self.config.voice_generator_type)
-            self.compiler = factory.create_compiler(self.config.compiler_type)
+            self.analyzer = factory.create_analyzer(
+                self.config.analyzer_type, **self.config.analyzer_options
+            )
+            generator_options = dict(self.config.generator_options)
+            if self.config.voice_generator_type == "openai":
+                # Pool as many connections as requests run at once
+                generator_options.setdefault(
+                    "max_connections", max(1, self.config.max_concurrent_generations)
+                )
+            self.generator = factory.create_generator(
+                self.config.voice_generator_type, **generator_options
+            )
+            self.compiler = factory.create_compiler(
+                self.config.compiler_type, **self.config.compiler_options
+            )
         except ValueError as e:
             raise ValueError(f"Failed to initialize components: {e}")
 
+        # Throttle and retry requests so transient provider errors don't drop audio
+        if self.config.rate_limit_enabled:
+            max_retries = self.config.max_retries
+            self.generator = self.rate_limiter = ResilientVoiceGenerator.for_engine(
+                self.generator,
+                self.config.voice_generator_type,
+                max_concurrency=self.config.max_concurrent_generations,
+                requests_per_second=self.config.requests_per_second,
+                max_attempts=None if max_retries is None else max_retries + 1,
+            )
+        else:
+            self.rate_limiter = None
+
+        # Serve previously synthesized segments from the audio cache
+        if self.config.cache_enabled:
+            if self.audio_cache is None:
+                self.audio_cache = AudioCache(
+                    cache_dir=self.config.cache_dir,
+                    max_size_bytes=self.config.cache_max_size_mb * 1024 * 1024,
+                    memory_items=self.config.cache_memory_items,
+                )
+            self.generator = CachedVoiceGenerator(
+                self.generator, self.audio_cache, self.config.voice_generator_type
+            )
+        else:
+            self.audio_cache = None
+
+    async def close(self) -> None:
+        """Close the generator's pooled connections."""
+        await self.generator.close()
+
+    async def __aenter__(self) -> "ProcessingPipeline":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
     async def process_text_file(
-        self, input_file: Path, output_file: Path | None = None, dry_run: bool = False
+        self,
+        input_file: Path,
+        output_file: Path | None = None,
+        dry_run: bool = False,
+        resume: bool = False,
     ) -> dict[str, Any]:
         """Process a text file through the complete pipeline."""
         # Read input text
         with open(input_file, encoding="utf-8") as f:
             text = f.read()
 
-        return await self.process_text(text, output_file, dry_run, input_file.stem)
+        return await self.process_text(
+            text, output_file, dry_run, input_file.stem, resume=resume
+        )
 
     async def process_text(
         self,
@@ -59,44 +134,39 @@ class ProcessingPipeline:
         output_file: Path | None = None,
         dry_run: bool = False,
         base_name: str = "output",
+        resume: bool = False,
+        resumable: bool = True,
     ) -> dict[str, Any]:
-        """Process text through the complete pipeline."""
+        """Process text through the complete pipeline.
+
+        Progress is recorded in a job manifest next to the output file. With
+        ``resume`` set, segments finished by an earlier interrupted run are
+        reused instead of being synthesized again. Callers that can never
+        resume pass ``resumable=False`` to have the job removed however the
+        run ends.
+        """
         results = {
             "input_length": len(text),
+            "segment_count": 0,
             "segments": [],
             "characters": [],
             "audio_segments": [],
+            "failed_segments": [],
             "output_file": None,
             "processing_time": 0.0,
         }
 
         # Step 1: Parse text into segments
         print("🔍 Parsing text...")
-        segments = await self.parser.parse(text)
-        results["segments"] = [
-            {
-                "text": seg.text[:100] + "..." if len(seg.text) > 100 else seg.text,
-                "speaker_type": seg.speaker_type.value,
-                "speaker_name": seg.speaker_name,
-                "confidence": seg.confidence,
-            }
-            for seg in segments
-        ]
+        segments = await self._parse_table(text)
+        results["segment_count"] = len(segments)
+        results["segments"] = self._segment_summaries(segments)
         print(f"   Found {len(segments)} text segments")
 
         # Step 2: Analyze characters
         print("👥 Analyzing characters...")
         characters = await self.analyzer.analyze(segments)
-        results["characters"] = [
-            {
-                "name": char.name,
-                "type": char.character_type,
-                "dialogue_count": char.dialogue_count,
-                "voice_id": char.voice_id,
-                "sample_dialogue": char.sample_dialogue[:2],  # First 2 samples
-            }
-            for char in characters
-        ]
+        results["characters"] = self._character_summaries(characters)
         print(f"   Identified {len(characters)} characters")
 
         # Display character analysis
@@ -111,76 +181,543 @@ class ProcessingPipeline:
             print("🏃 Dry run complete - skipping audio generation")
             return results
 
+        if output_file is None:
+            output_file = Path(f"{base_name}_audiobook.{self.config.output_format}")
+
         # Step 3: Generate audio for each segment
         print("🎤 Generating audio...")
-        audio_segments = await self._generate_audio_segments(segments, characters)
-        results["audio_segments"] = len(audio_segments)
-        print(f"   Generated {len(audio_segments)} audio segments")
+        batches = self._plan_batches(segments, characters)
+        results["synthesis_requests"] = len(batches)
+        if len(batches) != len(segments):
+            print(f"   Planned {len(batches)} requests for {len(segments)} segments")
+
+        utterances = self._utterance_index(batches)
+        if utterances:
+            results["dedup"] = utterances.stats
+            if utterances.stats["duplicates"]:
+                print(
+                    f"   Deduplicated {utterances.stats['duplicates']} repeated "
+                    f"utterances ({utterances.unique} unique requests)"
+                )
+
+        job = JobManifest.for_output(output_file)
+        try:
+            resumed = job.prepare(
+                [self._job_spec(batch) for batch in batches],
+                resume=resume,
+            )
+            if resumed:
+                print(f"   Resuming: {resumed}/{len(batches)} requests already done")
+            results["resumed_segments"] = resumed
+
+            audio_segments, failures = await self._generate_audio_segments(
+                batches, job, utterances
+            )
+            results["audio_segments"] = len(audio_segments)
+            results["failed_segments"] = failures
+            print(f"   Generated {len(audio_segments)} audio segments")
+            if failures:
+                print(f"   ⚠️  {len(failures)} segments failed and were skipped")
+            if self.audio_cache is not None:
+                cache_stats = results["cache"] = self.audio_cache.stats
+                print(
+                    f"   Cache: {cache_stats['hits']} hits, "
+                    f"{cache_stats['misses']} misses"
+                )
+            if self.rate_limiter is not None:
+                results["rate_limit"] = self.rate_limiter.stats
+                if self.rate_limiter.retries:
+                    print(f"   Retried {self.rate_limiter.retries} requests")
+
+            # Step 4: Compile final audio
+            print("🎵 Compiling final audio...")
+            final_output = await self.compiler.compile_audio(
+                audio_segments, str(output_file), format=self.config.output_format
+            )
+            results["output_file"] = final_output
+            print(f"   Created: {final_output}")
+        except BaseException:
+            if not resumable:
+                job.remove()
+            raise
+        finally:
+            job.close()
+
+        # Keep the job around while there is something left to retry
+        if resumable and failures:
+            print("   Re-run with --resume to retry the failed segments")
+        else:
+            job.remove()
+
+        return results
+
+    async def process_text_stream(
+        self,
+        text: str,
+        output_file: Path | None = None,
+        base_name: str = "output",
+        resume: bool = False,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Process text as a stream, writing audio as soon as it is ready.
+
+        Synthesis batches flow from a bounded work queue through
+        ``max_concurrent_generations`` workers into the compiler's stream
+        writer, which receives them strictly in order. At most a small window
+        of finished audio is held in memory while waiting for an earlier
+        request, so memory stays flat regardless of book length.
+
+        Yields:
+            Progress events: ``analyzed`` once, then ``segment`` or
+            ``segment_failed`` per synthesis batch in order, and finally
+            ``complete``
+        """
+        segments = await self._parse_table(text)
+        characters = await self.analyzer.analyze(segments)
+        summary = {
+            "input_length": len(text),
+            "segment_count": len(segments),
+            "segments": self._segment_summaries(segments),
+        }
+
+        async def tables() -> AsyncIterator[SegmentTable]:
+            yield segments
+
+        async for event in self._stream_batches(
+            tables, characters, summary, output_file, base_name, resume
+        ):
+            yield event
+
+    async def process_file_stream(
+        self,
+        input_file: Path,
+        output_file: Path | None = None,
+        resume: bool = False,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Process a text file as a stream without reading it into memory.
+
+        The file is read through a memory map and parsed block by block with
+        the parser's ``parse_stream``: once to analyze the characters, once
+        to register the synthesis requests with the job manifest and once
+        more while synthesizing them, so only the blocks in flight are held
+        in memory. Synthesis requests never span blocks.
+
+        Yields:
+            The same progress events as ``process_text_stream``, except that
+            ``analyzed`` carries no per-segment summaries
+        """
+        input_length = 0
+
+        def chunks() -> Iterator[str]:
+            nonlocal input_length
+            for chunk in read_text_chunks(input_file):
+                input_length += len(chunk)
+                yield chunk
+
+        stats = AnalysisStats()
+        segment_count = 0
+        async for table in self.parser.parse_stream(chunks()):
+            self.analyzer.update(stats, table)
+            segment_count += len(table)
+        characters = self.analyzer.finalize(stats)
+        summary = {"input_length": input_length, "segment_count": segment_count}
+
+        def tables() -> AsyncIterator[SegmentTable]:
+            return self.parser.parse_stream(read_text_chunks(input_file))
+
+        async for event in self._stream_batches(
+            tables, characters, summary, output_file, input_file.stem, resume
+        ):
+            yield event
+
+    async def _stream_batches(
+        self,
+        tables: Callable[[], AsyncIterator[SegmentTable]],
+        characters: list[Character],
+        summary: dict[str, Any],
+        output_file: Path | None,
+        base_name: str,
+        resume: bool,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Synthesize and write the segments of ``tables`` in order.
+
+        ``tables`` is called twice: the first pass registers every request
+        with the job manifest, the second feeds the workers as it goes.
+        """
+        specs: list[tuple[str, str]] = []
+        keys = []
+        async for batch in self._stream_plan(tables, characters):
+            specs.append(self._job_spec(batch))
+            if self.config.deduplicate_utterances:
+                keys.append(utterance_key(batch))
+        total_batches = len(specs)
+        utterances = (
+            UtteranceIndex(keys) if self.config.deduplicate_utterances else None
+        )
+
+        yield {
+            "event": "analyzed",
+            **summary,
+            "characters": self._character_summaries(characters),
+            "synthesis_requests": total_batches,
+            "dedup": utterances.stats if utterances else None,
+        }
 
-        # Step 4: Compile final audio
         if output_file is None:
             output_file = Path(f"{base_name}_audiobook.{self.config.output_format}")
 
-        print("🎵 Compiling final audio...")
-        final_output = await self.compiler.compile_audio(
-            audio_segments, str(output_file), format=self.config.output_format
+        workers = max(1, self.config.max_concurrent_generations)
+        # Finished-but-unwritten segments allowed ahead of the write position
+        window = asyncio.Semaphore(workers * 4)
+        work_queue: asyncio.Queue[tuple[int, SynthesisBatch] | None] = asyncio.Queue(
+            maxsize=workers
+        )
+        done_queue: asyncio.Queue[
+            tuple[int | None, SynthesisBatch | None, AudioSegment | Exception]
+        ] = asyncio.Queue()
+
+        async def produce() -> None:
+            index = 0
+            try:
+                async for batch in self._stream_plan(tables, characters):
+                    await window.acquire()
+                    await work_queue.put((index, batch))
+                    index += 1
+                if index != total_batches:
+                    raise RuntimeError("Input changed while it was being processed")
+            except Exception as e:
+                await done_queue.put((None, None, e))
+                return
+            for _ in range(workers):
+                await work_queue.put(None)
+
+        async def work() -> None:
+            while (item := await work_queue.get()) is not None:
+                index, batch = item
+                try:
+                    outcome: AudioSegment | Exception = await self._synthesize_batch(
+                        index, batch, job, utterances=utterances
+                    )
+                except Exception as e:
+                    outcome = e
+                await done_queue.put((index, batch, outcome))
+
+        job = JobManifest.for_output(output_file)
+        writer = self.compiler.open_stream(
+            str(output_file), format=self.config.output_format
         )
-        results["output_file"] = final_output
-        print(f"   Created: {final_output}")
+        tasks: list[asyncio.Task] = []
+        failures: list[dict[str, Any]] = []
+        finished = False
+        try:
+            job.prepare(specs, resume=resume)
+            del specs
+
+            tasks.append(asyncio.create_task(produce()))
+            tasks.extend(asyncio.create_task(work()) for _ in range(workers))
+
+            # Write segments in order as soon as the ordered prefix is ready
+            pending: dict[int, tuple[SynthesisBatch, AudioSegment | Exception]] = {}
+            next_index = 0
+            while next_index < total_batches:
+                index, done_batch, outcome = await done_queue.get()
+                if index is None or done_batch is None:
+                    # The producer failed; its exception is the outcome
+                    assert isinstance(outcome, Exception)
+                    raise outcome
+                pending[index] = (done_batch, outcome)
+
+                while next_index in pending:
+                    batch, outcome = pending.pop(next_index)
+                    if isinstance(outcome, Exception):
+                        job.mark_failed(next_index, str(outcome))
+                        failure = {
+                            "index": next_index,
+                            "speaker_name": batch.speaker_name,
+                            "error": str(outcome),
+                        }
+                        failures.append(failure)
+                        yield failure | {
+                            "event": "segment_failed",
+                            "total": total_batches,
+                        }
+                    else:
+                        await writer.write(outcome)
+                        yield {
+                            "event": "segment",
+                            "index": next_index,
+                            "total": total_batches,
+                            "speaker_name": outcome.speaker_name,
+                            "duration_ms": outcome.duration_ms,
+                            "source_segments": outcome.source_segments,
+                        }
+                    window.release()
+                    next_index += 1
+
+            final_output = await writer.close()
+            finished = True
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if not finished:
+                await writer.abort()
+            job.close()
+
+        # Keep the job around while there is something left to retry
+        if not failures:
+            job.remove()
+
+        yield {
+            "event": "complete",
+            "output_file": final_output,
+            "failed_segments": failures,
+        }
 
-        return results
+    async def _stream_plan(
+        self,
+        tables: Callable[[], AsyncIterator[SegmentTable]],
+        characters: list[Character],
+    ) -> AsyncIterator[SynthesisBatch]:
+        """Plan the batches of each table, numbering segments across tables."""
+        first_row = 0
+        async for table in tables():
+            for batch in self._plan_batches(table, characters):
+                if first_row:
+                    batch.source_segments = [
+                        first_row + index for index in batch.source_segments
+                    ]
+                yield batch
+            first_row += len(table)
 
     async def _generate_audio_segments(
-        self, segments: list[TextSegment], characters: list[Character]
-    ) -> list[AudioSegment]:
-        """Generate audio for all text segments."""
-        # Create voice mapping from character analysis
-        voice_mapping = {}
-        for char in characters:
-            if char.voice_id:
-                voice_mapping[char.name] = char.voice_id
-
-        # Add any configured voice mappings
-        for name, voice_profile in self.config.voice_mappings.items():
-            voice_mapping[name] = voice_profile.voice_id
+        self,
+        batches: list[SynthesisBatch],
+        job: JobManifest | None = None,
+        utterances: UtteranceIndex | None = None,
+    ) -> tuple[list[AudioSegment], list[dict[str, Any]]]:
+        """Generate audio for all synthesis batches with bounded concurrency.
+
+        Keeps up to ``max_concurrent_generations`` requests in flight. Audio
+        segments are returned in their original order; batches whose
+        generation failed are left out and reported separately so a single
+        bad request does not abort the whole book. Batches already completed
+        in ``job`` are loaded from disk, and new ones are recorded there.
+        Identical utterances in ``utterances`` are synthesized only once.
+        """
+        semaphore = asyncio.Semaphore(max(1, self.config.max_concurrent_generations))
+        total_batches = len(batches)
+        completed = 0
+
+        async def generate_batch(index: int, batch: SynthesisBatch) -> AudioSegment:
+            nonlocal completed
+
+            audio_segment = await self._synthesize_batch(
+                index, batch, job, semaphore, utterances
+            )
 
-        # Generate audio segments
-        audio_segments = []
-        total_segments = len(segments)
+            completed += 1
+            print(f"   Generated {completed}/{total_batches}: {batch.speaker_name}")
+            return audio_segment
 
-        for i, segment in enumerate(segments, 1):
-            print(f"   Generating {i}/{total_segments}: {segment.speaker_name}")
+        outcomes = await asyncio.gather(
+            *(generate_batch(index, batch) for index, batch in enumerate(batches)),
+            return_exceptions=True,
+        )
 
-            # Get voice for this segment
-            voice_id = voice_mapping.get(
-                segment.speaker_name, voice_mapping.get("narrator", "en-US-AriaNeural")
+        audio_segments: list[AudioSegment] = []
+        failures: list[dict[str, Any]] = []
+        for index, (batch, outcome) in enumerate(zip(batches, outcomes)):
+            if isinstance(outcome, Exception):
+                failures.append(
+                    {
+                        "index": index,
+                        "speaker_name": batch.speaker_name,
+                        "source_segments": batch.source_segments,
+                        "error": str(outcome),
+                    }
+                )
+                print(f"   ⚠️  Request {index + 1} failed: {outcome}")
+                if job:
+                    job.mark_failed(index, str(outcome))
+            elif isinstance(outcome, BaseException):
+                # Cancellation and interrupts stop the run, not just a segment
+                raise outcome
+            else:
+                audio_segments.append(outcome)
+
+        return audio_segments, failures
+
+    async def _synthesize_batch(
+        self,
+        index: int,
+        batch: SynthesisBatch,
+        job: JobManifest | None = None,
+        limiter: asyncio.Semaphore | None = None,
+        utterances: UtteranceIndex | None = None,
+    ) -> AudioSegment:
+        """Generate (or reload from ``job``) the audio for a single batch.
+
+        With a job, the audio is kept in its segment store and the returned
+        segment only references it, so finished audio doesn't accumulate in
+        memory. Repeated utterances share one stored clip.
+        """
+        audio_data = b""
+        audio_ref = None
+        finished = job.completed_segment(index) if job else None
+        if finished:
+            audio_ref, duration_ms = finished
+            if utterances:
+                utterances.release(index)
+        else:
+            generate = functools.partial(
+                self._generate_batch_audio, batch, limiter, job
             )
+            if utterances:
+                audio, duration_ms = await utterances.share(index, generate)
+            else:
+                audio, duration_ms = await generate()
+            if isinstance(audio, AudioRef):
+                audio_ref = audio
+            else:
+                audio_data = audio
+            if job and audio_ref:
+                job.mark_done(index, audio_ref, duration_ms)
+
+        return AudioSegment(
+            audio_data=audio_data,
+            audio_ref=audio_ref,
+            text=batch.text,
+            speaker_type=batch.speaker_type,
+            speaker_name=batch.speaker_name,
+            duration_ms=duration_ms,
+            voice_id=batch.voice_id,
+            audio_format=self.generator.audio_format,
+            source_segments=batch.source_segments,
+            source_offsets_ms=source_offsets_ms(batch, duration_ms),
+            continues_previous=batch.continues_previous,
+            chapter_title=batch.chapter_title,
+        )
 
-            # Generate audio
+    async def _generate_batch_audio(
+        self,
+        batch: SynthesisBatch,
+        limiter: asyncio.Semaphore | None = None,
+        job: JobManifest | None = None,
+    ) -> tuple[bytes | AudioRef, int]:
+        """Synthesize a batch and return (audio, duration_ms).
+
+        The audio is returned as bytes, or as a reference once it has been
+        written to ``job``'s segment store.
+        """
+        async with limiter or contextlib.nullcontext():
             audio_data = await self.generator.generate_audio(
-                segment.text,
-                voice_id,
+                batch.text,
+                batch.voice_id,
                 {},  # voice characteristics
             )
 
-            # Calculate duration
-            audio_io = io.BytesIO(audio_data)
-            audio_segment_pydub = PydubAudioSegment.from_mp3(audio_io)
-            duration_ms = len(audio_segment_pydub)
-
-            # Create audio segment
-            audio_segment = AudioSegment(
-                audio_data=audio_data,
-                text=segment.text,
-                speaker_type=segment.speaker_type,
-                speaker_name=segment.speaker_name,
-                duration_ms=duration_ms,
-                voice_id=voice_id,
+        # Measuring may fall back to decoding the clip; keep it off the loop
+        return await asyncio.to_thread(
+            self._measure_audio, audio_data, self.generator.audio_format, job
+        )
+
+    @staticmethod
+    def _measure_audio(
+        audio_data: bytes, audio_format: str, job: JobManifest | None
+    ) -> tuple[bytes | AudioRef, int]:
+        """Return (audio, duration_ms), storing the audio in ``job`` if given."""
+        duration_ms = audio_duration_ms(audio_data, audio_format)
+        if job:
+            return job.store_audio(audio_data), duration_ms
+        return audio_data, duration_ms
+
+    def _job_spec(self, batch: SynthesisBatch) -> tuple[str, str]:
+        """Identify a batch's audio to the job manifest as (text_hash, voice)."""
+        voice = batch.voice_id
+        audio_format = self.generator.audio_format
+        if audio_format != "mp3":
+            # Clips stored in another format must not be resumed into this one
+            voice = f"{voice}:{audio_format}"
+        return text_hash(batch.text), voice
+
+    async def _parse_table(self, text: str) -> SegmentTable:
+        """Parse text, sharding large texts across ``parse_workers`` processes."""
+        if (
+            self.config.parse_workers != 1
+            and len(text) >= PARALLEL_MIN_CHARS
+            and isinstance(self.parser, BlockTextParser)
+        ):
+            return await parse_table_parallel(
+                self.config.parser_type, text, self.config.parse_workers
             )
+        return await self.parser.parse_table(text)
+
+    def _utterance_index(self, batches: list[SynthesisBatch]) -> UtteranceIndex | None:
+        """Index repeated utterances so each is synthesized once, if enabled."""
+        if not self.config.deduplicate_utterances:
+            return None
+        return UtteranceIndex.from_batches(batches)
+
+    def _plan_batches(
+        self, segments: SegmentTable, characters: list[Character]
+    ) -> list[SynthesisBatch]:
+        """Assign voices and group segments into synthesis requests."""
+        voice_ids = self._assign_voices(segments, characters)
+        max_chars = self.config.max_batch_chars or self.generator.max_input_chars
+        return plan_batches(
+            segments, voice_ids, max_chars, coalesce=self.config.coalesce_segments
+        )
+
+    @staticmethod
+    def _segment_summaries(segments: SegmentTable) -> list[dict[str, Any]]:
+        """Summarize parsed segments for results and progress events."""
+        return [
+            {
+                "text": seg.text[:100] + "..." if len(seg.text) > 100 else seg.text,
+                "speaker_type": seg.speaker_type.value,
+                "speaker_name": seg.speaker_name,
+                "confidence": seg.confidence,
+            }
+            for seg in segments
+        ]
+
+    @staticmethod
+    def _character_summaries(characters: list[Character]) -> list[dict[str, Any]]:
+        """Summarize analyzed characters for results and progress events."""
+        return [
+            {
+                "name": char.name,
+                "type": char.character_type,
+                "dialogue_count": char.dialogue_count,
+                "voice_id": char.voice_id,
+                "sample_dialogue": char.sample_dialogue[:2],  # First 2 samples
+            }
+            for char in characters
+        ]
+
+    def _assign_voices(
+        self, segments: SegmentTable, characters: list[Character]
+    ) -> list[str]:
+        """Pick the voice for every segment."""
+        voice_mapping = self._build_voice_mapping(characters)
+        default_voice = voice_mapping.get("narrator", "en-US-AriaNeural")
+        return [
+            voice_mapping.get(segment.speaker_name, default_voice)
+            for segment in segments
+        ]
+
+    def _build_voice_mapping(self, characters: list[Character]) -> dict[str, str]:
+        """Create voice mapping from character analysis and configuration."""
+        voice_mapping = {}
+        for char in characters:
+            if char.voice_id:
+                voice_mapping[char.name] = char.voice_id
 
-            audio_segments.append(audio_segment)
+        # Add any configured voice mappings
+        for name, voice_profile in self.config.voice_mappings.items():
+            voice_mapping[name] = voice_profile.voice_id
 
-        return audio_segments
+        return voice_mapping
 
     async def preview_audio(self, text: str, max_segments: int = 3) -> list[bytes]:
         """Generate preview audio for the first few segments."""
@@ -221,6 +758,14 @@ class ProcessingPipeline:
             "analyzer_type",
             "voice_generator_type",
             "compiler_type",
+            "compiler_options",
+            "analyzer_options",
+            "generator_options",
+            "max_concurrent_generations",
+            "cache_enabled",
+            "rate_limit_enabled",
+            "requests_per_second",
+            "max_retries",
         }
         if any(key in component_keys for key in kwargs.keys()):
             self._initialize_components()
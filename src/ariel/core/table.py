@@ -0,0 +1,179 @@
+"""Compact, array-backed storage for parsed text segments."""
+
+from array import array
+from collections.abc import Iterator
+
+from ..models import SpeakerType, TextSegment
+
+_SPEAKER_TYPES = list(SpeakerType)
+_SPEAKER_TYPE_IDS = {speaker_type: i for i, speaker_type in enumerate(_SPEAKER_TYPES)}
+
+
+def strip_span(text: str, start: int, end: int) -> tuple[int, int]:
+    """Narrow ``text[start:end]`` to what ``str.strip()`` would keep."""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+class SegmentRow:
+    """Read-only view of one row of a SegmentTable.
+
+    Has the same attributes as ``TextSegment``, so it can be used wherever
+    segments are only read.
+    """
+
+    __slots__ = ("_table", "index")
+
+    def __init__(self, table: "SegmentTable", index: int) -> None:
+        self._table = table
+        self.index = index
+
+    @property
+    def text(self) -> str:
+        return self._table.text_at(self.index)
+
+    @property
+    def speaker_type(self) -> SpeakerType:
+        return _SPEAKER_TYPES[self._table.speaker_types[self.index]]
+
+    @property
+    def speaker_name(self) -> str:
+        return self._table.speakers[self._table.speaker_ids[self.index]]
+
+    @property
+    def confidence(self) -> float:
+        # Undo the float32 rounding of values like 0.95
+        return round(self._table.confidences[self.index], 6)
+
+    @property
+    def chapter_title(self) -> str | None:
+        return self._table.chapter_titles.get(self.index)
+
+    def to_model(self) -> TextSegment:
+        """Materialize the row as a ``TextSegment``."""
+        return TextSegment(
+            text=self.text,
+            speaker_type=self.speaker_type,
+            speaker_name=self.speaker_name,
+            confidence=self.confidence,
+            chapter_title=self.chapter_title,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"SegmentRow({self.index}, {self.speaker_name!r}, "
+            f"{self._table.starts[self.index]}:{self._table.ends[self.index]})"
+        )
+
+
+class SegmentTable:
+    """Parsed segments stored as columns of offsets into the source text.
+
+    Each row is a (start, end) span of ``source`` plus an interned speaker,
+    a speaker type and a float32 confidence; chapter titles are kept only
+    for the rows that start a chapter. No per-segment objects are created
+    until rows are accessed, and ``TextSegment`` models only when
+    ``to_segments`` is called.
+    """
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.starts = array("q")
+        self.ends = array("q")
+        self.speaker_ids = array("I")
+        self.speaker_types = array("B")
+        self.confidences = array("f")
+        self.chapter_titles: dict[int, str] = {}
+
+        self.speakers: list[str] = []
+        self._speaker_index: dict[str, int] = {}
+
+    @classmethod
+    def from_segments(cls, segments: list[TextSegment]) -> "SegmentTable":
+        """Build a table from materialized segments, joining their texts."""
+        table = cls("\n".join(segment.text for segment in segments))
+        start = 0
+        for segment in segments:
+            end = start + len(segment.text)
+            table.append(
+                start,
+                end,
+                segment.speaker_type,
+                segment.speaker_name,
+                segment.confidence,
+                segment.chapter_title,
+            )
+            start = end + 1
+        return table
+
+    def append(
+        self,
+        start: int,
+        end: int,
+        speaker_type: SpeakerType,
+        speaker_name: str = "narrator",
+        confidence: float = 1.0,
+        chapter_title: str | None = None,
+    ) -> int:
+        """Add a segment spanning ``source[start:end]`` and return its index."""
+        index = len(self.starts)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.speaker_ids.append(self._speaker_id(speaker_name))
+        self.speaker_types.append(_SPEAKER_TYPE_IDS[speaker_type])
+        self.confidences.append(confidence)
+        if chapter_title is not None:
+            self.chapter_titles[index] = chapter_title
+        return index
+
+    def extend(self, other: "SegmentTable", offset: int = 0) -> None:
+        """Append the rows of ``other``, whose source starts at ``offset``.
+
+        Only the columns are copied; ``other.source`` must already be part of
+        this table's source at that offset.
+        """
+        first = len(self.starts)
+        if offset:
+            self.starts.extend(array("q", [start + offset for start in other.starts]))
+            self.ends.extend(array("q", [end + offset for end in other.ends]))
+        else:
+            self.starts.extend(other.starts)
+            self.ends.extend(other.ends)
+        speaker_ids = [self._speaker_id(name) for name in other.speakers]
+        self.speaker_ids.extend(array("I", [speaker_ids[i] for i in other.speaker_ids]))
+        self.speaker_types.extend(other.speaker_types)
+        self.confidences.extend(other.confidences)
+        for index, title in other.chapter_titles.items():
+            self.chapter_titles[first + index] = title
+
+    def _speaker_id(self, speaker_name: str) -> int:
+        speaker_id = self._speaker_index.get(speaker_name)
+        if speaker_id is None:
+            speaker_id = self._speaker_index[speaker_name] = len(self.speakers)
+            self.speakers.append(speaker_name)
+        return speaker_id
+
+    def text_at(self, index: int) -> str:
+        """Text of the segment at ``index``."""
+        return self.source[self.starts[index] : self.ends[index]]
+
+    def to_segments(self) -> list[TextSegment]:
+        """Materialize every row as a ``TextSegment``."""
+        return [row.to_model() for row in self]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index: int) -> SegmentRow:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("segment index out of range")
+        return SegmentRow(self, index)
+
+    def __iter__(self) -> Iterator[SegmentRow]:
+        for index in range(len(self)):
+            yield SegmentRow(self, index)
@@ -0,0 +1,248 @@
+"""Content-addressed audio cache that sits in front of any voice generator."""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from ..core.interfaces import VoiceGenerator
+
+
+def default_cache_dir() -> Path:
+    """Return the default on-disk location for cached audio."""
+    base = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "ariel" / "audio"
+
+
+class AudioCache:
+    """Persistent cache of synthesized audio keyed by a content hash.
+
+    Entries live on disk under ``cache_dir`` with a total size cap enforced by
+    least-recently-used eviction. A small in-memory tier keeps the most
+    recently used clips hot so repeated lines never touch the disk.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path | None = None,
+        max_size_bytes: int = 2 * 1024**3,
+        memory_items: int = 256,
+    ) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_size_bytes = max_size_bytes
+        self.memory_items = memory_items
+
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._index: OrderedDict[str, int] = OrderedDict()
+        self._size_bytes = 0
+
+        self.hits = 0
+        self.memory_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Lookups and stores run in worker threads
+        self._lock = threading.Lock()
+        self._load_index()
+
+    @staticmethod
+    def make_key(
+        engine: str,
+        voice_id: str,
+        voice_characteristics: dict[str, Any] | None,
+        text: str,
+    ) -> str:
+        """Build the cache key for a synthesis request.
+
+        Whitespace is collapsed so reflowed text still hits the cache; case and
+        punctuation are kept because they change the spoken result.
+        """
+        payload = json.dumps(
+            [
+                engine,
+                voice_id,
+                voice_characteristics or {},
+                " ".join(text.split()),
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> bytes | None:
+        """Return cached audio for ``key`` or None on a miss."""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self._index.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return data
+            on_disk = key in self._index
+
+        if on_disk:
+            path = self._path_for(key)
+            try:
+                data = path.read_bytes()
+                os.utime(path)
+            except FileNotFoundError:
+                # Evicted by another process sharing the cache directory
+                data = None
+
+            with self._lock:
+                if data is None:
+                    self._forget(key)
+                elif key in self._index:
+                    self._index.move_to_end(key)
+                    self._remember(key, data)
+                    self.hits += 1
+                    return data
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store audio for ``key`` and evict old entries beyond the size cap."""
+        path = self._path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write atomically so a crash never leaves a truncated entry behind
+        fd, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_name, path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+        with self._lock:
+            self._forget(key)
+            self._index[key] = len(data)
+            self._size_bytes += len(data)
+            self._remember(key, data)
+            self._evict()
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            for key in list(self._index):
+                self._path_for(key).unlink(missing_ok=True)
+            self._index.clear()
+            self._memory.clear()
+            self._size_bytes = 0
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters and current cache occupancy."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "memory_hits": self.memory_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._index),
+            "size_bytes": self._size_bytes,
+        }
+
+    def _path_for(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.bin"
+
+    def _load_index(self) -> None:
+        """Rebuild the LRU index from the files already on disk."""
+        if not self.cache_dir.exists():
+            return
+
+        entries = []
+        for path in self.cache_dir.glob("*/*.bin"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+
+        # Least recently used first
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._size_bytes += size
+
+        self._evict()
+
+    def _remember(self, key: str, data: bytes) -> None:
+        if self.memory_items <= 0:
+            return
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _forget(self, key: str) -> None:
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._size_bytes -= size
+        self._memory.pop(key, None)
+
+    def _evict(self) -> None:
+        while self._size_bytes > self.max_size_bytes and self._index:
+            key, _ = next(iter(self._index.items()))
+            self._forget(key)
+            self._path_for(key).unlink(missing_ok=True)
+            self.evictions += 1
+
+
+class CachedVoiceGenerator(VoiceGenerator):
+    """Voice generator wrapper that serves repeated requests from an AudioCache."""
+
+    def __init__(self, generator: VoiceGenerator, cache: AudioCache, engine: str):
+        self.generator = generator
+        self.cache = cache
+        self.engine = engine
+        self.max_input_chars = generator.max_input_chars
+        self.audio_format = generator.audio_format
+        # Clips in other formats are cached apart from the engine's MP3 ones
+        self._key_engine = (
+            engine if self.audio_format == "mp3" else f"{engine}/{self.audio_format}"
+        )
+
+    async def generate_audio(
+        self,
+        text: str,
+        voice_id: str,
+        voice_characteristics: dict[str, Any] | None = None,
+    ) -> bytes:
+        """Return cached audio if available, otherwise generate and store it."""
+        key = self.cache.make_key(
+            self._key_engine, voice_id, voice_characteristics, text
+        )
+
+        audio_data = await asyncio.to_thread(self.cache.get, key)
+        if audio_data is not None:
+            return audio_data
+
+        audio_data = await self.generator.generate_audio(
+            text, voice_id, voice_characteristics
+        )
+        if audio_data:
+            await asyncio.to_thread(self.cache.put, key, audio_data)
+
+        return audio_data
+
+    async def list_voices(self) -> list[dict[str, Any]]:
+        """List available voices from the wrapped generator."""
+        return await self.generator.list_voices()
+
+    async def close(self) -> None:
+        """Close the wrapped generator."""
+        await self.generator.close()
+
+    def __getattr__(self, name: str) -> Any:
+        # Expose generator-specific helpers (voice_map, generate_multiple, ...)
+        return getattr(self.generator, name)
@@ -8,6 +8,7 @@ from typing import Any
 
 from pydub import AudioSegment as PydubAudioSegment
 
+from ..audio.mp3 import mp3_duration_ms
 from ..core.interfaces import VoiceGenerator
 from ..models import AudioSegment, SpeakerType, TextSegment
 
@@ -15,6 +16,9 @@ from ..models import AudioSegment, SpeakerType, TextSegment
 class CoquiTTSVoiceGenerator(VoiceGenerator):
     """Text-to-speech generator using Coqui TTS."""
 
+    # Local models degrade on very long inputs
+    max_input_chars = 1000
+
     def __init__(self, model_name: str | None = None) -> None:
         """Initialize Coqui TTS generator.
 
@@ -113,10 +117,8 @@ class CoquiTTSVoiceGenerator(VoiceGenerator):
 
         audio_data = await self.generate_audio(segment.text, voice)
 
-        # Convert to AudioSegment to get duration
-        audio_io = io.BytesIO(audio_data)
-        audio_segment = PydubAudioSegment.from_mp3(audio_io)
-        duration_ms = len(audio_segment)
+        # Read duration from the MP3 frame headers
+        duration_ms = mp3_duration_ms(audio_data)
 
         return AudioSegment(
             audio_data=audio_data,
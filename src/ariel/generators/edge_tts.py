@@ -1,12 +1,12 @@
 """Edge-TTS based audio generator."""
 
 import asyncio
-import io
+from collections.abc import AsyncIterator
 from typing import Any
 
 import edge_tts
-from pydub import AudioSegment as PydubAudioSegment
 
+from ..audio.mp3 import mp3_duration_ms
 from ..core.interfaces import VoiceGenerator
 from ..models import AudioSegment, SpeakerType, TextSegment
 
@@ -14,6 +14,9 @@ from ..models import AudioSegment, SpeakerType, TextSegment
 class EdgeTTSVoiceGenerator(VoiceGenerator):
     """Text-to-speech generator using Edge-TTS."""
 
+    # Edge-TTS splits longer input into several service requests
+    max_input_chars = 3000
+
     def __init__(self) -> None:
         # Voice mapping for different speaker types
         self.voice_map: dict[SpeakerType, str] = {
@@ -28,16 +31,23 @@ class EdgeTTSVoiceGenerator(VoiceGenerator):
         voice_characteristics: dict[str, Any] | None = None,
     ) -> bytes:
         """Generate audio for given text with specified voice."""
-        # Create TTS communicate object
-        communicate = edge_tts.Communicate(text, voice_id)
+        audio_data = bytearray()
+        async for chunk in self.stream_audio(text, voice_id, voice_characteristics):
+            audio_data += chunk
+
+        return bytes(audio_data)
 
-        # Generate audio data
-        audio_data = b""
+    async def stream_audio(
+        self,
+        text: str,
+        voice_id: str,
+        voice_characteristics: dict[str, Any] | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Yield MP3 audio for the text as the service sends it."""
+        communicate = edge_tts.Communicate(text, voice_id)
         async for chunk in communicate.stream():
             if chunk["type"] == "audio":
-                audio_data += chunk["data"]
-
-        return audio_data
+                yield chunk["data"]
 
     async def generate_audio_for_segment(self, segment: TextSegment) -> AudioSegment:
         """Generate audio for a text segment (backward compatibility)."""
@@ -45,10 +55,8 @@ class EdgeTTSVoiceGenerator(VoiceGenerator):
 
         audio_data = await self.generate_audio(segment.text, voice)
 
-        # Convert to AudioSegment to get duration
-        audio_io = io.BytesIO(audio_data)
-        audio_segment = PydubAudioSegment.from_mp3(audio_io)
-        duration_ms = len(audio_segment)
+        # Read duration from the MP3 frame headers
+        duration_ms = mp3_duration_ms(audio_data)
 
         return AudioSegment(
             audio_data=audio_data,
@@ -1,26 +1,120 @@
 """OpenAI TTS based audio generator."""
 
 import asyncio
-import io
-from typing import Any
+import contextlib
+import os
+from collections.abc import AsyncIterator
+from typing import Any, Literal
 
+import httpx
 from openai import AsyncOpenAI
-from pydub import AudioSegment as PydubAudioSegment
 
+from ..audio.formats import audio_duration_ms, check_audio_format
 from ..core.interfaces import VoiceGenerator
 from ..models import AudioSegment, SpeakerType, TextSegment
 
+# How long idle connections are kept open for the next request
+KEEPALIVE_SECONDS = 60
+# Generous overall limit: long inputs take a while to synthesize
+REQUEST_TIMEOUT = httpx.Timeout(600.0, connect=10.0)
+
+# Encodings Ariel can measure and compile, out of those the API offers
+ResponseFormat = Literal["mp3", "opus", "aac", "pcm"]
+
+# Clients shared by every generator in the process, by (API key, pool size),
+# for the event loop they were created on, with how many generators use each
+_clients: dict[tuple[str | None, int], AsyncOpenAI] = {}
+_client_users: dict[tuple[str | None, int], int] = {}
+_clients_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _acquire_client(
+    api_key: str | None, max_connections: int
+) -> tuple[AsyncOpenAI, list[AsyncOpenAI]]:
+    """Take a use of the process-wide client for the running event loop.
+
+    Returns the client and any clients left open by a previous event loop,
+    which the caller must close.
+    """
+    global _clients_loop
+    loop = asyncio.get_running_loop()
+    stale: list[AsyncOpenAI] = []
+    if _clients_loop is not loop:
+        # Connection pools are tied to the loop they were created on
+        stale = list(_clients.values())
+        _clients.clear()
+        _client_users.clear()
+        _clients_loop = loop
+
+    key = (api_key, max_connections)
+    if key not in _clients:
+        # Keep as many connections alive as requests run at once, so
+        # concurrent segments never wait on a TLS handshake
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=KEEPALIVE_SECONDS,
+        )
+        _clients[key] = AsyncOpenAI(
+            api_key=api_key,
+            http_client=httpx.AsyncClient(
+                limits=limits, timeout=REQUEST_TIMEOUT, follow_redirects=True
+            ),
+        )
+    _client_users[key] = _client_users.get(key, 0) + 1
+    return _clients[key], stale
+
+
+async def _release_client(api_key: str | None, max_connections: int) -> None:
+    """Give back a use of a shared client, closing it after the last one."""
+    key = (api_key, max_connections)
+    if key not in _client_users:
+        return
+    _client_users[key] -= 1
+    if _client_users[key] == 0:
+        del _client_users[key]
+        await _close_client(_clients.pop(key))
+
+
+async def _close_client(client: AsyncOpenAI) -> None:
+    """Close a client's connection pool."""
+    # Sockets are closed before the shutdown fails on a closed event loop
+    with contextlib.suppress(RuntimeError):
+        await client.close()
+
 
 class OpenAITTSVoiceGenerator(VoiceGenerator):
     """Text-to-speech generator using OpenAI TTS API."""
 
-    def __init__(self, api_key: str | None = None) -> None:
+    # API limit on the input text length
+    max_input_chars = 4096
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        response_format: ResponseFormat = "mp3",
+        max_connections: int = 5,
+    ) -> None:
         """Initialize OpenAI TTS generator.
 
         Args:
             api_key: OpenAI API key. If None, will try to get from environment.
+            response_format: Audio encoding to request: mp3, opus, aac or pcm.
+                Raw pcm needs no decoding when the audiobook is compiled.
+            max_connections: Size of the shared connection pool, normally
+                the number of requests run concurrently
         """
-        self.client = AsyncOpenAI(api_key=api_key)
+        if not (api_key or os.getenv("OPENAI_API_KEY")):
+            raise ValueError("OpenAI API key is not set")
+        self.api_key = api_key
+        # Options come from config files, so the format is checked anyway
+        self.audio_format = check_audio_format(response_format)
+        self.response_format = response_format
+        self.max_connections = max(1, max_connections)
+
+        # This generator's use of the shared client, taken on first request
+        self._client: AsyncOpenAI | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
 
         # Available OpenAI TTS voices
         self.available_voices = [
@@ -38,6 +132,18 @@ class OpenAITTSVoiceGenerator(VoiceGenerator):
             SpeakerType.CHARACTER: "echo",    # Male character voice
         }
 
+    async def _shared_client(self) -> AsyncOpenAI:
+        """The shared client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._client
+        if client is None or self._client_loop is not loop:
+            client, stale = _acquire_client(self.api_key, self.max_connections)
+            self._client = client
+            self._client_loop = loop
+            for old_client in stale:
+                await _close_client(old_client)
+        return client
+
     async def generate_audio(
         self,
         text: str,
@@ -45,6 +151,43 @@ class OpenAITTSVoiceGenerator(VoiceGenerator):
         voice_characteristics: dict[str, Any] | None = None,
     ) -> bytes:
         """Generate audio for given text with specified voice."""
+        try:
+            client = await self._shared_client()
+            response = await client.audio.speech.create(
+                **self._speech_options(text, voice_id, voice_characteristics)
+            )
+
+            # Return audio data as bytes
+            return response.content
+
+        except Exception as e:
+            raise RuntimeError(f"OpenAI TTS generation failed: {e}") from e
+
+    async def stream_audio(
+        self,
+        text: str,
+        voice_id: str,
+        voice_characteristics: dict[str, Any] | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Yield audio for the text as the API sends it."""
+        try:
+            client = await self._shared_client()
+            async with client.audio.speech.with_streaming_response.create(
+                **self._speech_options(text, voice_id, voice_characteristics)
+            ) as response:
+                async for chunk in response.iter_bytes():
+                    yield chunk
+
+        except Exception as e:
+            raise RuntimeError(f"OpenAI TTS generation failed: {e}") from e
+
+    def _speech_options(
+        self,
+        text: str,
+        voice_id: str,
+        voice_characteristics: dict[str, Any] | None,
+    ) -> dict[str, Any]:
+        """Arguments for a speech request."""
         # Validate voice_id
         if voice_id not in self.available_voices:
             # Fallback to default voice if invalid
@@ -55,21 +198,21 @@ class OpenAITTSVoiceGenerator(VoiceGenerator):
         model = characteristics.get("model", "tts-1")  # tts-1 or tts-1-hd
         speed = characteristics.get("speed", 1.0)  # 0.25 to 4.0
 
-        try:
-            # Generate audio using OpenAI TTS
-            response = await self.client.audio.speech.create(
-                model=model,
-                voice=voice_id,
-                input=text,
-                response_format="mp3",
-                speed=speed,
-            )
-
-            # Return audio data as bytes
-            return response.content
+        return {
+            "model": model,
+            "voice": voice_id,
+            "input": text,
+            "response_format": self.response_format,
+            "speed": speed,
+        }
 
-        except Exception as e:
-            raise RuntimeError(f"OpenAI TTS generation failed: {e}")
+    async def close(self) -> None:
+        """Stop using the shared connection pool, closing it if unused."""
+        if self._client is None:
+            return
+        self._client = None
+        if self._client_loop is asyncio.get_running_loop():
+            await _release_client(self.api_key, self.max_connections)
 
     async def generate_audio_for_segment(self, segment: TextSegment) -> AudioSegment:
         """Generate audio for a text segment (backward compatibility)."""
@@ -77,10 +220,8 @@ class OpenAITTSVoiceGenerator(VoiceGenerator):
 
         audio_data = await self.generate_audio(segment.text, voice)
 
-        # Convert to AudioSegment to get duration
-        audio_io = io.BytesIO(audio_data)
-        audio_segment = PydubAudioSegment.from_mp3(audio_io)
-        duration_ms = len(audio_segment)
+        # Read duration from the container headers
+        duration_ms = audio_duration_ms(audio_data, self.audio_format)
 
         return AudioSegment(
             audio_data=audio_data,
@@ -89,6 +230,7 @@ class OpenAITTSVoiceGenerator(VoiceGenerator):
             speaker_name=segment.speaker_name,
             duration_ms=duration_ms,
             voice_id=voice,
+            audio_format=self.audio_format,
         )
 
     async def list_voices(self) -> list[dict[str, Any]]:
@@ -0,0 +1,314 @@
+"""Rate limiting, adaptive concurrency and retries for remote voice generators."""
+
+import asyncio
+import contextlib
+import random
+from collections.abc import AsyncIterator
+from typing import Any
+
+import aiohttp
+import openai
+from edge_tts import exceptions as edge_tts_exceptions
+from pydantic import BaseModel
+
+from ..core.interfaces import VoiceGenerator
+
+# HTTP statuses that signal a transient or load-related failure
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+OVERLOAD_STATUSES = {429, 503}
+
+TRANSIENT_ERRORS: tuple[type[BaseException], ...] = (
+    TimeoutError,
+    ConnectionError,
+    aiohttp.ClientConnectionError,
+    aiohttp.ClientPayloadError,
+    openai.APIConnectionError,
+    edge_tts_exceptions.NoAudioReceived,
+    edge_tts_exceptions.WebSocketError,
+)
+
+
+class RateLimitPolicy(BaseModel):
+    """Throughput and retry settings for one TTS engine."""
+
+    requests_per_second: float | None = None  # None disables the token bucket
+    burst: int = 1
+    initial_concurrency: int = 2
+    min_concurrency: int = 1
+    max_concurrency: int | None = None  # None follows the caller's concurrency
+    max_attempts: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    deadline: float = 180.0  # seconds per segment, including retries
+
+
+# Concurrency cap when neither the engine nor the caller sets one
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Defaults per engine; local engines are not rate limited or retried
+ENGINE_POLICIES: dict[str, RateLimitPolicy] = {
+    "edge-tts": RateLimitPolicy(requests_per_second=8.0, burst=8),
+    "openai": RateLimitPolicy(requests_per_second=3.0, burst=3),
+    "coqui": RateLimitPolicy(initial_concurrency=1, max_concurrency=1, max_attempts=1),
+}
+
+
+def _error_chain(exc: BaseException) -> list[BaseException]:
+    """Return an exception followed by everything it was raised from."""
+    chain: list[BaseException] = []
+    current: BaseException | None = exc
+    while current is not None and current not in chain:
+        chain.append(current)
+        current = current.__cause__ or current.__context__
+    return chain
+
+
+def _status_code(exc: BaseException) -> int | None:
+    status = getattr(exc, "status_code", None) or getattr(exc, "status", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether a generation error is transient and worth retrying."""
+    for error in _error_chain(exc):
+        if isinstance(error, TRANSIENT_ERRORS):
+            return True
+        if _status_code(error) in RETRYABLE_STATUSES:
+            return True
+    return False
+
+
+def is_overload(exc: BaseException) -> bool:
+    """Whether an error means the provider wants us to slow down."""
+    for error in _error_chain(exc):
+        if isinstance(error, TimeoutError | openai.APITimeoutError):
+            return True
+        if _status_code(error) in OVERLOAD_STATUSES:
+            return True
+    return False
+
+
+def retry_after(exc: BaseException) -> float | None:
+    """Return the server's Retry-After hint in seconds, if it sent one."""
+    for error in _error_chain(exc):
+        headers = getattr(error, "headers", None)
+        if headers is None:
+            headers = getattr(getattr(error, "response", None), "headers", None)
+        if not headers:
+            continue
+        try:
+            return max(0.0, float(headers.get("retry-after", "")))
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+class TokenBucket:
+    """Token bucket that spaces requests to a sustained rate."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                now = loop.time()
+                if self._updated is not None:
+                    elapsed = now - self._updated
+                    self._tokens = min(
+                        self.capacity, self._tokens + elapsed * self.rate
+                    )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AdaptiveConcurrencyLimiter:
+    """Concurrency limit adjusted by additive increase, multiplicative decrease.
+
+    The limit grows by one after a full window of successful requests and is
+    halved when the provider signals overload. Overload reports from requests
+    that started before the last decrease are ignored, so one burst of
+    failures only halves the limit once.
+    """
+
+    def __init__(self, initial: int = 2, minimum: int = 1, maximum: int = 8):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(max(initial, self.minimum), self.maximum)
+
+        self._in_flight = 0
+        self._successes = 0
+        self._generation = 0
+        self._condition = asyncio.Condition()
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[int]:
+        """Hold one unit of concurrency; yields the current limit generation."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+            generation = self._generation
+        try:
+            yield generation
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def on_success(self) -> None:
+        """Record a successful request, raising the limit after a full window."""
+        self._successes += 1
+        if self._successes >= self.limit and self.limit < self.maximum:
+            self.limit += 1
+            self._successes = 0
+
+    def on_overload(self, generation: int) -> None:
+        """Halve the limit in response to throttling or timeouts."""
+        if generation != self._generation:
+            return
+        self._generation += 1
+        self._successes = 0
+        self.limit = max(self.minimum, self.limit // 2)
+
+
+class ResilientVoiceGenerator(VoiceGenerator):
+    """Voice generator wrapper that rate limits and retries transient failures.
+
+    Requests pass through a per-engine token bucket and an adaptive
+    concurrency limit before reaching the wrapped generator. Transient errors
+    are retried with full-jitter exponential backoff until the attempt budget
+    or the per-segment deadline runs out; other errors surface immediately.
+    """
+
+    def __init__(self, generator: VoiceGenerator, policy: RateLimitPolicy):
+        self.generator = generator
+        self.policy = policy
+        self.max_input_chars = generator.max_input_chars
+        self.audio_format = generator.audio_format
+
+        self.bucket = (
+            TokenBucket(policy.requests_per_second, policy.burst)
+            if policy.requests_per_second
+            else None
+        )
+        max_concurrency = policy.max_concurrency
+        if max_concurrency is None:
+            max_concurrency = DEFAULT_MAX_CONCURRENCY
+        self.limiter = AdaptiveConcurrencyLimiter(
+            policy.initial_concurrency, policy.min_concurrency, max_concurrency
+        )
+
+        self.retries = 0
+        self.throttled = 0
+
+    @classmethod
+    def for_engine(
+        cls,
+        generator: VoiceGenerator,
+        engine: str,
+        max_concurrency: int | None = None,
+        **overrides: Any,
+    ) -> "ResilientVoiceGenerator":
+        """Wrap a generator with the default policy for ``engine``.
+
+        Args:
+            generator: Generator to wrap
+            engine: Engine name, selecting its default policy
+            max_concurrency: How many requests the caller runs at once. The
+                limiter ramps up to it, or to the engine's own cap if lower.
+            **overrides: Policy fields to replace; None values are ignored
+        """
+        policy = ENGINE_POLICIES.get(engine, RateLimitPolicy())
+        overrides = {
+            key: value for key, value in overrides.items() if value is not None
+        }
+        policy = policy.model_copy(update=overrides)
+
+        if max_concurrency is not None:
+            maximum = max(1, max_concurrency)
+            if policy.max_concurrency is not None:
+                maximum = min(maximum, policy.max_concurrency)
+            policy = policy.model_copy(
+                update={
+                    "max_concurrency": maximum,
+                    "initial_concurrency": min(policy.initial_concurrency, maximum),
+                }
+            )
+        return cls(generator, policy)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Retry counters and the current concurrency limit."""
+        return {
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "concurrency_limit": self.limiter.limit,
+        }
+
+    async def generate_audio(
+        self,
+        text: str,
+        voice_id: str,
+        voice_characteristics: dict[str, Any] | None = None,
+    ) -> bytes:
+        """Generate audio, retrying transient failures within the deadline."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.policy.deadline
+
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.bucket:
+                await self.bucket.acquire()
+
+            async with self.limiter.slot() as generation:
+                try:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        raise TimeoutError("Segment deadline exceeded")
+                    async with asyncio.timeout(remaining):
+                        audio_data = await self.generator.generate_audio(
+                            text, voice_id, voice_characteristics
+                        )
+                except Exception as e:
+                    if not is_retryable(e) or attempt >= self.policy.max_attempts:
+                        raise
+                    if is_overload(e):
+                        self.throttled += 1
+                        self.limiter.on_overload(generation)
+                    error = e
+                else:
+                    self.limiter.on_success()
+                    return audio_data
+
+            # Back off outside the concurrency slot so others can proceed
+            backoff = min(
+                self.policy.max_delay, self.policy.base_delay * 2 ** (attempt - 1)
+            )
+            delay = max(random.uniform(0, backoff), retry_after(error) or 0.0)
+            if loop.time() + delay >= deadline:
+                raise error
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+    async def list_voices(self) -> list[dict[str, Any]]:
+        """List available voices from the wrapped generator."""
+        return await self.generator.list_voices()
+
+    async def close(self) -> None:
+        """Close the wrapped generator."""
+        await self.generator.close()
+
+    def __getattr__(self, name: str) -> Any:
+        # Expose generator-specific helpers (voice_map, generate_multiple, ...)
+        return getattr(self.generator, name)
@@ -1,10 +1,12 @@
 """Pydantic models for Ariel."""
 
 from enum import Enum
-from typing import Any
+from typing import Any, Protocol
 
 from pydantic import BaseModel
 
+from .audio.store import AudioRef
+
 
 class SpeakerType(str, Enum):
     """Type of speaker in the text."""
@@ -20,17 +22,82 @@ class TextSegment(BaseModel):
     speaker_type: SpeakerType
     speaker_name: str = "narrator"
     confidence: float = 1.0
+    # Set on the first segment of a chapter
+    chapter_title: str | None = None
+
+
+class SegmentView(Protocol):
+    """Read-only view of a segment, met by ``TextSegment`` and table rows."""
+
+    @property
+    def text(self) -> str: ...
+
+    @property
+    def speaker_type(self) -> SpeakerType: ...
+
+    @property
+    def speaker_name(self) -> str: ...
+
+    @property
+    def confidence(self) -> float: ...
+
+    @property
+    def chapter_title(self) -> str | None: ...
+
+
+class SynthesisBatch(BaseModel):
+    """Consecutive text segments synthesized together in one request."""
+
+    text: str
+    voice_id: str
+    speaker_type: SpeakerType
+    speaker_name: str = "narrator"
+    source_segments: list[int] = []
+    source_lengths: list[int] = []
+    # Piece of a longer segment, joined to the previous batch without a pause
+    continues_previous: bool = False
+    # Chapter started by this batch
+    chapter_title: str | None = None
 
 
 class AudioSegment(BaseModel):
-    """An audio segment with metadata."""
+    """An audio segment with metadata.
+
+    The encoded audio is either held in ``audio_data`` or, for segments
+    spilled to a segment store, referenced by ``audio_ref``; read it through
+    ``audio``.
+    """
 
-    audio_data: bytes
+    audio_data: bytes = b""
+    audio_ref: AudioRef | None = None
     text: str
     speaker_type: SpeakerType
     speaker_name: str
     duration_ms: int
     voice_id: str | None = None
+    # Encoding of the audio, one of ariel.audio.formats.AUDIO_FORMATS
+    audio_format: str = "mp3"
+    # Original text segments covered by this audio and their estimated offsets
+    source_segments: list[int] = []
+    source_offsets_ms: list[int] = []
+    # Joined to the previous segment without the usual pause
+    continues_previous: bool = False
+    # Chapter started by this segment
+    chapter_title: str | None = None
+
+    @property
+    def audio(self) -> bytes:
+        """Encoded audio, read from the segment store if it was spilled."""
+        if self.audio_ref is not None:
+            return self.audio_ref.read()
+        return self.audio_data
+
+    @property
+    def audio_size(self) -> int:
+        """Size of the encoded audio in bytes, without reading it."""
+        if self.audio_ref is not None:
+            return self.audio_ref.length
+        return len(self.audio_data)
 
 
 class VoiceProfile(BaseModel):
@@ -52,6 +119,54 @@ class CharacterProfile(BaseModel):
     confidence: float = 1.0
 
 
+class CharacterStats(BaseModel):
+    """Running statistics about one speaker, gathered by an analyzer."""
+
+    speaker_type: SpeakerType = SpeakerType.CHARACTER
+    dialogue_count: int = 0
+    total_confidence: float = 0.0
+    sample_dialogue: list[str] = []
+    # Words spoken, for analyzers that profile speech
+    speech_count: int = 0
+    word_count: int = 0
+    vocabulary: set[str] = set()
+    # HyperLogLog registers standing in for the vocabulary in sketch mode
+    vocabulary_sketch: list[int] | None = None
+    # Lexicon phrases heard, and the start and end of the lower-cased speech
+    # so that phrases spanning two merged inputs are still found
+    speech_phrases: set[str] = set()
+    speech_head: str | None = None
+    speech_tail: str | None = None
+
+    def merge(self, other: "CharacterStats", sample_limit: int) -> None:
+        """Add the counts of ``other``, gathered from later input."""
+        self.speaker_type = other.speaker_type
+        self.dialogue_count += other.dialogue_count
+        self.total_confidence += other.total_confidence
+        room = max(0, sample_limit - len(self.sample_dialogue))
+        self.sample_dialogue += other.sample_dialogue[:room]
+        self.speech_count += other.speech_count
+        self.word_count += other.word_count
+        self.vocabulary |= other.vocabulary
+
+
+class AnalysisStats(BaseModel):
+    """Per-speaker statistics of an analysis in progress.
+
+    Plain data, so the statistics of separately analyzed parts of a text
+    can be serialized, sent elsewhere and merged there.
+    """
+
+    characters: dict[str, CharacterStats] = {}
+
+    def character(self, name: str) -> CharacterStats:
+        """Statistics for ``name``, added on first use."""
+        stats = self.characters.get(name)
+        if stats is None:
+            stats = self.characters[name] = CharacterStats()
+        return stats
+
+
 class ProcessingConfig(BaseModel):
     """Configuration for the processing pipeline."""
 
@@ -59,5 +174,20 @@ class ProcessingConfig(BaseModel):
     analyzer_type: str = "basic"
     voice_generator_type: str = "edge-tts"
     compiler_type: str = "basic"
+    compiler_options: dict[str, Any] = {}
+    analyzer_options: dict[str, Any] = {}
+    generator_options: dict[str, Any] = {}
     voice_mappings: dict[str, VoiceProfile] = {}
     output_format: str = "mp3"
+    max_concurrent_generations: int = 5
+    coalesce_segments: bool = True
+    deduplicate_utterances: bool = True
+    max_batch_chars: int | None = None
+    parse_workers: int | None = 1
+    rate_limit_enabled: bool = True
+    requests_per_second: float | None = None
+    max_retries: int | None = None
+    cache_enabled: bool = True
+    cache_dir: str | None = None
+    cache_max_size_mb: int = 2048
+    cache_memory_items: int = 256
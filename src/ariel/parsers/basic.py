@@ -2,75 +2,52 @@
 
 import re
 
-from ..core.interfaces import TextParser
-from ..models import SpeakerType, TextSegment
+from ..core.table import SegmentTable, strip_span
+from ..models import SpeakerType
+from .blocks import BlockTextParser
 
 
-class BasicTextParser(TextParser):
+class BasicTextParser(BlockTextParser):
     """Simple parser that uses quotation marks to identify dialogue."""
 
     def __init__(self) -> None:
         # Pattern to match quoted text (dialogue)
         self.dialogue_pattern = re.compile(r'"([^"]*)"')
 
-    async def parse(self, text: str) -> list[TextSegment]:
-        """Parse text into segments with speaker attribution."""
-        segments: list[TextSegment] = []
+    def block_end(self, text: str) -> int:
+        """End of the last complete quotation in ``text``, or 0."""
+        # Quotes pair up from the start, so an odd count leaves one open
+        end = text.rfind('"')
+        if text.count('"') % 2:
+            end = text.rfind('"', 0, end)
+        return end + 1
+
+    def parse_block(self, table: SegmentTable) -> None:
+        """Parse all of ``table.source`` into the table."""
+        text = table.source
         current_pos = 0
 
         # Find all dialogue matches
         for match in self.dialogue_pattern.finditer(text):
             start, end = match.span()
-            dialogue_text = match.group(1).strip()
 
             # Add any narrative text before this dialogue
             if start > current_pos:
-                narrative_text = text[current_pos:start].strip()
-                if narrative_text:
-                    segments.append(
-                        TextSegment(
-                            text=narrative_text,
-                            speaker_type=SpeakerType.NARRATOR,
-                            speaker_name="narrator",
-                            confidence=1.0,
-                        )
-                    )
+                narrative_start, narrative_end = strip_span(text, current_pos, start)
+                if narrative_start < narrative_end:
+                    table.append(narrative_start, narrative_end, SpeakerType.NARRATOR)
 
             # Add the dialogue
-            if dialogue_text:
-                segments.append(
-                    TextSegment(
-                        text=dialogue_text,
-                        speaker_type=SpeakerType.CHARACTER,
-                        speaker_name="character",
-                        confidence=1.0,
-                    )
+            dialogue_start, dialogue_end = strip_span(text, *match.span(1))
+            if dialogue_start < dialogue_end:
+                table.append(
+                    dialogue_start, dialogue_end, SpeakerType.CHARACTER, "character"
                 )
 
             current_pos = end
 
         # Add any remaining narrative text
         if current_pos < len(text):
-            remaining_text = text[current_pos:].strip()
-            if remaining_text:
-                segments.append(
-                    TextSegment(
-                        text=remaining_text,
-                        speaker_type=SpeakerType.NARRATOR,
-                        speaker_name="narrator",
-                        confidence=1.0,
-                    )
-                )
-
-        # If no dialogue was found, treat entire text as narrative
-        if not segments:
-            segments.append(
-                TextSegment(
-                    text=text.strip(),
-                    speaker_type=SpeakerType.NARRATOR,
-                    speaker_name="narrator",
-                    confidence=1.0,
-                )
-            )
-
-        return segments
+            narrative_start, narrative_end = strip_span(text, current_pos, len(text))
+            if narrative_start < narrative_end:
+                table.append(narrative_start, narrative_end, SpeakerType.NARRATOR)
@@ -0,0 +1,230 @@
+"""Parse throughput benchmark for the text parsers.
+
+Run with ``python -m ariel.parsers.benchmark FILE...`` (or ``just
+bench-parsers``). Each file is parsed by the basic and advanced parsers and
+by the advanced parser's previous attribution code, which is kept here as
+the baseline; the advanced parser's results must match the baseline's.
+"""
+
+import argparse
+import asyncio
+import re
+import sys
+import time
+from pathlib import Path
+
+from ..core.interfaces import TextParser
+from ..core.table import SegmentTable, strip_span
+from ..models import SpeakerType
+from .advanced import AdvancedTextParser
+from .basic import BasicTextParser
+
+
+class LegacyAdvancedTextParser(AdvancedTextParser):
+    """Advanced parser with the per-quote regex attribution it replaced.
+
+    Searches every context window with every pattern, slicing the windows
+    and collecting all matches before the dialogue to take the last one.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        # Common dialogue attribution patterns
+        self.attribution_patterns = [
+            # "said X" patterns
+            re.compile(
+                r"(?:said|says|replied|asked|whispered|shouted|exclaimed|muttered|declared)\s+([A-Z][a-zA-Z\s]+?)(?:\.|,|$)",
+                re.IGNORECASE,
+            ),
+            # "X said" patterns
+            re.compile(
+                r"([A-Z][a-zA-Z\s]+?)\s+(?:said|says|replied|asked|whispered|shouted|exclaimed|muttered|declared)(?:\.|,|$)",
+                re.IGNORECASE,
+            ),
+            # Direct attribution: "John: "Hello""
+            re.compile(r'([A-Z][a-zA-Z\s]+?):\s*"', re.IGNORECASE),
+        ]
+
+    def _parse_paragraph(self, table: SegmentTable, start: int, end: int) -> None:
+        """Parse the paragraph ``table.source[start:end]`` into the table."""
+        text = table.source
+        current_pos = start
+
+        # Find all dialogue in this paragraph
+        dialogue_matches = list(self.dialogue_pattern.finditer(text, start, end))
+
+        for i, match in enumerate(dialogue_matches):
+            match_start, match_end = match.span()
+
+            # Add narrative text before this dialogue
+            if match_start > current_pos:
+                narrative = strip_span(text, current_pos, match_start)
+                if narrative[0] < narrative[1]:
+                    table.append(*narrative, SpeakerType.NARRATOR)
+
+            # Try to find speaker attribution for this dialogue
+            dialogue = strip_span(text, *match.span(1))
+            if dialogue[0] < dialogue[1]:
+                speaker_name, confidence = self._find_speaker_attribution(
+                    text, match, start, end
+                )
+                table.append(*dialogue, SpeakerType.CHARACTER, speaker_name, confidence)
+
+            current_pos = match_end
+
+        # Add remaining narrative text
+        if current_pos < end:
+            narrative = strip_span(text, current_pos, end)
+            if narrative[0] < narrative[1]:
+                table.append(*narrative, SpeakerType.NARRATOR)
+
+        # If no dialogue found, treat entire paragraph as narrative
+        if not dialogue_matches:
+            table.append(start, end, SpeakerType.NARRATOR)
+
+    def _find_speaker_attribution(
+        self, text: str, dialogue_match: re.Match, start: int, end: int
+    ) -> tuple[str, float]:
+        """Find speaker attribution for dialogue in the paragraph text[start:end]."""
+        dialogue_start, dialogue_end = dialogue_match.span()
+
+        # Look for attribution patterns around the dialogue
+
+        # Check for direct attribution (Name: "dialogue")
+        colon_match = re.search(
+            r'([A-Z][a-zA-Z\s]+?):\s*"',
+            text[max(start, dialogue_start - 50) : dialogue_end],
+        )
+        if colon_match:
+            name = self._clean_speaker_name(colon_match.group(1))
+            if name:
+                return name, 0.95
+
+        # Look for attribution in surrounding context (before and after)
+        context_before = text[max(start, dialogue_start - 100) : dialogue_start]
+        context_after = text[dialogue_end : min(end, dialogue_end + 100)]
+
+        # Try attribution patterns in context after dialogue
+        for pattern in self.attribution_patterns:
+            match = pattern.search(context_after)
+            if match:
+                name = self._clean_speaker_name(match.group(1))
+                if name:
+                    return name, 0.8
+
+        # Try attribution patterns in context before dialogue
+        for pattern in self.attribution_patterns:
+            matches = list(pattern.finditer(context_before))
+            if matches:
+                # Take the last match (closest to dialogue)
+                match = matches[-1]
+                name = self._clean_speaker_name(match.group(1))
+                if name:
+                    return name, 0.7
+
+        # Fallback: generic character name with low confidence
+        return "character", 0.3
+
+    def _clean_speaker_name(self, raw_name: str) -> str | None:
+        """Clean and validate a potential speaker name."""
+        if not raw_name:
+            return None
+
+        # Remove extra whitespace and normalize
+        name = " ".join(raw_name.strip().split())
+
+        # Skip if too long (likely not a name)
+        if len(name) > 30:
+            return None
+
+        # Skip if contains numbers or strange characters
+        if re.search(r'[0-9@#$%^&*()_+=\[\]{}|\\:";\'<>?,./]', name):
+            return None
+
+        # Remove common titles
+        words = name.lower().split()
+        cleaned_words = [w for w in words if w not in self.titles]
+
+        if not cleaned_words:
+            return None
+
+        # Reconstruct name with proper capitalization
+        cleaned_name = " ".join(word.title() for word in cleaned_words)
+
+        # Must have at least one letter
+        if not re.search(r"[a-zA-Z]", cleaned_name):
+            return None
+
+        return cleaned_name
+
+
+def _rows(table: SegmentTable) -> list[tuple]:
+    return [
+        (
+            row.text,
+            row.speaker_type,
+            row.speaker_name,
+            row.confidence,
+            row.chapter_title,
+        )
+        for row in table
+    ]
+
+
+async def _throughput(
+    parser: TextParser, text: str, rounds: int
+) -> tuple[float, SegmentTable]:
+    """Best parse rate of ``rounds`` runs in MB/s of UTF-8 input."""
+    size_mb = len(text.encode("utf-8")) / 1_000_000
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        table = await parser.parse_table(text)
+        best = min(best, time.perf_counter() - started)
+    return size_mb / best, table
+
+
+async def run(paths: list[Path], min_mb: float, rounds: int) -> bool:
+    """Print parse throughput per file; return whether outputs matched."""
+    parsers = {
+        "advanced (legacy)": LegacyAdvancedTextParser(),
+        "advanced": AdvancedTextParser(),
+        "basic": BasicTextParser(),
+    }
+    identical = True
+    for path in paths:
+        text = path.read_text(encoding="utf-8")
+        # Repeat short samples so timings aren't dominated by noise
+        copies = max(1, round(min_mb * 1_000_000 / max(1, len(text))))
+        text = "\n\n".join([text] * copies)
+        print(f"{path} ({len(text) / 1_000_000:.1f}M chars)")
+
+        baseline = None
+        for name, parser in parsers.items():
+            rate, table = await _throughput(parser, text, rounds)
+            note = ""
+            if name.startswith("advanced"):
+                if baseline is None:
+                    baseline = _rows(table)
+                elif _rows(table) != baseline:
+                    identical = False
+                    note = "  MISMATCH"
+            print(f"  {name:18} {rate:8.2f} MB/s{note}")
+    return identical
+
+
+def main() -> None:
+    arguments = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    arguments.add_argument("files", nargs="+", type=Path)
+    arguments.add_argument(
+        "--min-mb", type=float, default=2.0, help="Repeat inputs up to this size"
+    )
+    arguments.add_argument("--rounds", type=int, default=3, help="Runs per parser")
+    options = arguments.parse_args()
+    if not asyncio.run(run(options.files, options.min_mb, options.rounds)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
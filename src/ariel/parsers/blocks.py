@@ -0,0 +1,57 @@
+"""Base class for parsers that can parse text in independent blocks."""
+
+from abc import abstractmethod
+from collections.abc import AsyncIterator, Iterable
+
+from ..core.interfaces import STREAM_BLOCK_CHARS, TextParser
+from ..core.table import SegmentTable, strip_span
+from ..models import SpeakerType, TextSegment
+from .stream import parse_blocks
+
+
+class BlockTextParser(TextParser):
+    """Parser whose state starts over at places it can find in the text.
+
+    Subclasses say where a block of text may end and how to parse one block;
+    whole-text, streaming and parallel parsing are built on those two
+    methods, so they all produce the same segments.
+    """
+
+    async def parse(self, text: str) -> list[TextSegment]:
+        """Parse text into segments with speaker attribution."""
+        return (await self.parse_table(text)).to_segments()
+
+    async def parse_table(self, text: str) -> SegmentTable:
+        """Parse text into a segment table of offsets into ``text``."""
+        table = SegmentTable(text)
+        self.parse_block(table)
+
+        # If no segments found, treat entire text as narrative
+        if not table:
+            table.append(*strip_span(text, 0, len(text)), SpeakerType.NARRATOR)
+
+        return table
+
+    async def parse_stream(
+        self, chunks: Iterable[str], block_chars: int = STREAM_BLOCK_CHARS
+    ) -> AsyncIterator[SegmentTable]:
+        """Parse text chunks, cutting blocks where ``block_end`` allows."""
+        for table in parse_blocks(
+            chunks, self.block_end, self.parse_block, block_chars
+        ):
+            yield table
+
+    @abstractmethod
+    def block_end(self, text: str) -> int:
+        """Length of the longest prefix of ``text`` that parses on its own.
+
+        Returns:
+            The end of the last place where parsing starts over, or 0
+        """
+
+    @abstractmethod
+    def parse_block(self, table: SegmentTable) -> None:
+        """Parse all of ``table.source`` into the table.
+
+        Unlike ``parse_table``, a block without segments is left empty.
+        """
@@ -0,0 +1,49 @@
+"""Chapter heading detection shared by parsers and compilers."""
+
+import re
+
+_NUMBER_WORDS = (
+    "one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve|thirteen|"
+    "fourteen|fifteen|sixteen|seventeen|eighteen|nineteen|twenty|first|second|"
+    "third|fourth|fifth|sixth|seventh|eighth|ninth|tenth|last"
+)
+
+# "CHAPTER IV.", "Book the First", "Act 2, Scene 1", "PROLOGUE", ...
+HEADING_PATTERN = re.compile(
+    rf"""^(?:
+        (?:chapter|book|part|volume|act|scene|canto|stave)\s+
+        (?:the\s+)?(?:\d+|[ivxlcdm]+|{_NUMBER_WORDS})\b
+        (?:\s*[.:,—–-].*)?  # a title only after punctuation
+        |prologue|epilogue|preface|foreword|introduction|afterword|interlude
+    )\W*$""",
+    re.IGNORECASE | re.VERBOSE,
+)
+
+# Longer first lines are prose, not headings
+MAX_HEADING_CHARS = 100
+MAX_SUBTITLE_CHARS = 80
+
+
+def chapter_heading(text: str) -> str | None:
+    """Return the chapter heading that ``text`` starts with, if any.
+
+    The first line must look like a heading on its own. A short second line
+    standing alone before a blank line (or the end of the text) is taken as
+    the chapter's title, as in "CHAPTER I.\\nDown the Rabbit-Hole".
+
+    Returns:
+        The heading with its title, e.g. "CHAPTER I. Down the Rabbit-Hole"
+    """
+    lines = text.lstrip().split("\n", 2)
+    heading = lines[0].strip()
+    if len(heading) > MAX_HEADING_CHARS or not HEADING_PATTERN.match(heading):
+        return None
+
+    if len(lines) > 1:
+        subtitle = lines[1].strip()
+        standalone = len(lines) == 2 or not lines[2].split("\n", 1)[0].strip()
+        if subtitle and standalone and len(subtitle) <= MAX_SUBTITLE_CHARS:
+            separator = " " if heading[-1] in ".:" else ". "
+            heading = f"{heading}{separator}{subtitle}"
+
+    return heading
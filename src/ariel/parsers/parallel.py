@@ -0,0 +1,111 @@
+"""Parsing of large texts in a process pool."""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from ..core.table import SegmentTable, strip_span
+from ..models import SpeakerType
+from .blocks import BlockTextParser
+from .stream import split_blocks
+
+# Shorter texts are parsed in place; starting workers would cost more
+PARALLEL_MIN_CHARS = 1 << 20
+
+# Smallest piece of text handed to a worker
+MIN_SHARD_CHARS = 1 << 18
+
+
+def _parse_shard(parser_type: str, shard: str, offset: int) -> SegmentTable:
+    """Parse one shard; runs in a worker process.
+
+    Returns the shard's rows as offsets into the whole text, without the
+    shard text itself, which the caller already has.
+    """
+    from ..core.factory import factory
+
+    parser = factory.create_parser(parser_type)
+    if not isinstance(parser, BlockTextParser):
+        raise ValueError(f"Parser '{parser_type}' cannot parse text in shards")
+    table = SegmentTable(shard)
+    parser.parse_block(table)
+    rows = SegmentTable("")
+    rows.extend(table, offset)
+    return rows
+
+
+def shard_text(
+    text: str, parser: BlockTextParser, shard_chars: int
+) -> list[tuple[int, str]]:
+    """Cut text into (offset, shard) pieces that ``parser`` can parse apart."""
+    pieces = (
+        text[start : start + shard_chars] for start in range(0, len(text), shard_chars)
+    )
+    shards = []
+    offset = 0
+    for block in split_blocks(pieces, parser.block_end, shard_chars):
+        if block:
+            shards.append((offset, block))
+            offset += len(block)
+    return shards
+
+
+async def parse_table_parallel(
+    parser_type: str,
+    text: str,
+    workers: int | None = None,
+    shard_chars: int | None = None,
+) -> SegmentTable:
+    """Parse text with a registered block parser across worker processes.
+
+    The text is sharded where the parser starts over (paragraph breaks or
+    closed quotations), the shards are parsed in a process pool and their
+    rows are merged in order, giving the same table as ``parse_table``.
+
+    Args:
+        parser_type: Registered parser to use; must be a ``BlockTextParser``
+        text: Raw input text
+        workers: Worker processes; defaults to the number of CPUs
+        shard_chars: Approximate shard size; defaults to a few shards per
+            worker
+
+    Returns:
+        Segment table of offsets into ``text``
+    """
+    from ..core.factory import factory
+
+    parser = factory.create_parser(parser_type)
+    if not isinstance(parser, BlockTextParser):
+        raise ValueError(f"Parser '{parser_type}' cannot parse text in shards")
+
+    workers = workers or os.cpu_count() or 1
+    if shard_chars is None:
+        shard_chars = max(MIN_SHARD_CHARS, -(-len(text) // (workers * 4)))
+    shards = shard_text(text, parser, shard_chars)
+
+    # Spawned workers avoid forking a process with a running event loop
+    executor = ProcessPoolExecutor(
+        max(1, min(workers, len(shards))),
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    loop = asyncio.get_running_loop()
+    try:
+        shard_tables = await asyncio.gather(
+            *(
+                loop.run_in_executor(executor, _parse_shard, parser_type, shard, offset)
+                for offset, shard in shards
+            )
+        )
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    table = SegmentTable(text)
+    for rows in shard_tables:
+        table.extend(rows)
+
+    # If no segments found, treat entire text as narrative
+    if not table:
+        table.append(*strip_span(text, 0, len(text)), SpeakerType.NARRATOR)
+
+    return table
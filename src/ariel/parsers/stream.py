@@ -0,0 +1,100 @@
+"""Incremental reading and block-wise parsing of large text files."""
+
+import codecs
+import io
+import mmap
+import os
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+
+from ..core.interfaces import STREAM_BLOCK_CHARS
+from ..core.table import SegmentTable, strip_span
+from ..models import SpeakerType
+
+# Bytes decoded per chunk when reading a file
+CHUNK_BYTES = 1 << 20
+
+
+def read_text_chunks(
+    path: str | Path, chunk_bytes: int = CHUNK_BYTES, encoding: str = "utf-8"
+) -> Iterator[str]:
+    """Decode a text file piece by piece through a memory map.
+
+    Newlines are translated like ``open(path, encoding=encoding).read()``
+    would, but only one chunk of the file is decoded at a time.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            decoder = io.IncrementalNewlineDecoder(
+                codecs.getincrementaldecoder(encoding)(), translate=True
+            )
+            for offset in range(0, size, chunk_bytes):
+                if text := decoder.decode(mapped[offset : offset + chunk_bytes]):
+                    yield text
+            if text := decoder.decode(b"", final=True):
+                yield text
+
+
+def split_blocks(
+    chunks: Iterable[str], block_end: Callable[[str], int], block_chars: int
+) -> Iterator[str]:
+    """Regroup text chunks into blocks that end where parsing can resume.
+
+    ``block_end`` returns the length of the longest prefix of its argument
+    that can be parsed on its own, or 0 if there is none yet. The blocks
+    joined together give back the original text; the last one is yielded
+    even when empty.
+    """
+    pieces: list[str] = []
+    size = 0
+    threshold = block_chars
+    for chunk in chunks:
+        pieces.append(chunk)
+        size += len(chunk)
+        if size < threshold:
+            continue
+
+        buffer = "".join(pieces)
+        end = block_end(buffer)
+        if end > 0:
+            yield buffer[:end]
+            buffer = buffer[end:]
+        pieces = [buffer]
+        size = len(buffer)
+        # Text without a cut point keeps growing; look again once it doubles
+        threshold = max(block_chars, 2 * size)
+
+    yield "".join(pieces)
+
+
+def parse_blocks(
+    chunks: Iterable[str],
+    block_end: Callable[[str], int],
+    parse_block: Callable[[SegmentTable], None],
+    block_chars: int = STREAM_BLOCK_CHARS,
+) -> Iterator[SegmentTable]:
+    """Parse text chunks into one segment table per block.
+
+    ``parse_block`` fills a table from its whole source. Blocks that yield
+    no segments are carried into the next one, so if the text as a whole
+    has none it ends up as a single narrative segment, as in a full parse.
+    """
+    carried = ""
+    emitted = False
+    for block in split_blocks(chunks, block_end, block_chars):
+        table = SegmentTable(carried + block if carried else block)
+        parse_block(table)
+        if table:
+            emitted = True
+            carried = ""
+            yield table
+        else:
+            carried = table.source
+
+    if not emitted:
+        table = SegmentTable(carried)
+        table.append(*strip_span(carried, 0, len(carried)), SpeakerType.NARRATOR)
+        yield table
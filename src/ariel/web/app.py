@@ -1,6 +1,8 @@
 """FastAPI web application for Ariel."""
 
 import tempfile
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, File, HTTPException, UploadFile
@@ -10,7 +12,15 @@ from fastapi.staticfiles import StaticFiles
 
 from ..core.pipeline import ProcessingPipeline
 
-app = FastAPI(title="Ariel Audiobook Converter", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Close the pipeline's pooled connections on shutdown."""
+    yield
+    await pipeline.close()
+
+
+app = FastAPI(title="Ariel Audiobook Converter", version="0.1.0", lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -218,13 +228,9 @@ async def generate_audiobook(file: UploadFile = File(...)):
 
     try:
         # Process the text and generate audio
-        result = await pipeline.process_text(text, output_file=temp_path)
-
-        # Return the generated audio file
-        return FileResponse(
-            str(result["output_file"]),
-            media_type="audio/mpeg",
-            filename="audiobook.mp3",
+        # Requests can't be resumed, so don't keep their jobs
+        result = await pipeline.process_text(
+            text, output_file=temp_path, resumable=False
         )
     except Exception as e:
         # Clean up temp file on error
@@ -232,6 +238,22 @@ async def generate_audiobook(file: UploadFile = File(...)):
             temp_path.unlink()
         raise HTTPException(status_code=500, detail=f"Generation failed: {str(e)}")
 
+    # Don't hand out an audiobook with holes in it
+    failed = len(result["failed_segments"])
+    if failed:
+        temp_path.unlink(missing_ok=True)
+        raise HTTPException(
+            status_code=502,
+            detail=f"Generation failed: {failed} segments could not be synthesized",
+        )
+
+    # Return the generated audio file
+    return FileResponse(
+        str(result["output_file"]),
+        media_type="audio/mpeg",
+        filename="audiobook.mp3",
+    )
+
 
 @app.get("/voices")
 async def list_voices():
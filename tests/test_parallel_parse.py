@@ -0,0 +1,47 @@
+"""Parallel parsing must give exactly the serial parser's segments."""
+
+from pathlib import Path
+
+import pytest
+
+from ariel.core.factory import factory
+from ariel.core.table import SegmentTable
+from ariel.parsers.blocks import BlockTextParser
+from ariel.parsers.parallel import parse_table_parallel
+
+SAMPLES = sorted((Path(__file__).parent.parent / "samples").glob("*.txt"))
+BLOCK_PARSERS = [
+    parser_type
+    for parser_type in factory.list_parsers()
+    if isinstance(factory.create_parser(parser_type), BlockTextParser)
+]
+
+# Small shards so even short samples are cut in many places
+SHARD_CHARS = 40
+
+
+def rows(table: SegmentTable) -> list[tuple]:
+    return [
+        (
+            row.text,
+            row.speaker_type,
+            row.speaker_name,
+            row.confidence,
+            row.chapter_title,
+        )
+        for row in table
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("parser_type", BLOCK_PARSERS)
+@pytest.mark.parametrize("path", SAMPLES, ids=lambda path: path.name)
+async def test_parallel_parse_matches_serial(parser_type: str, path: Path) -> None:
+    text = path.read_text(encoding="utf-8")
+
+    serial = await factory.create_parser(parser_type).parse_table(text)
+    parallel = await parse_table_parallel(
+        parser_type, text, workers=2, shard_chars=SHARD_CHARS
+    )
+
+    assert rows(parallel) == rows(serial)